@@ -0,0 +1,4 @@
+from algorithms.binary_search import binary_search
+from algorithms.mergesort import merge, mergesort, kway_merge
+from algorithms.heapsort import heapsort
+from algorithms.selection import nlargest, nsmallest
@@ -0,0 +1,35 @@
+from __future__ import annotations
+from data_structures.referential_array import ArrayR
+from data_structures.heap import MaxHeap
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+def heapsort(my_list: ArrayR[T], key: Callable[[T], Any] = None, reverse: bool = False,
+             d: int = MaxHeap.DEFAULT_ARITY) -> ArrayR[T]:
+    """
+    Sort an ArrayR in place using the heapsort operation.
+
+    The array is turned into a max heap in place (MaxHeap.heapify with in_place=True),
+    then the root is repeatedly taken off and written to the slot the heap just freed
+    at its end, so the largest elements settle at the back of the array.
+    With reverse=True a min heap is used instead, giving descending order.
+
+    The `key` kwarg allows you to define a custom sorting order. Keys are computed once
+    per element and need O(N) extra memory; without a key only O(1) extra memory is
+    used, unlike mergesort, which allocates new halves at every level.
+    Unlike mergesort, heapsort is not stable.
+
+    returns:
+    The same ArrayR, now sorted.
+
+    complexity:
+    Best/Worst Case: O(NlogN * comp(T)) where N is the length of the list and comp is the cost of comparison for the
+    object type T (the elements in the list).
+    """
+    heap = MaxHeap.heapify(my_list, key=key, min_heap=reverse, d=d, in_place=True)
+    for end in range(len(my_list) - 1, 0, -1):
+        # get_max frees slot `end` of my_list, which is where the root belongs
+        my_list[end] = heap.get_max()
+    return my_list
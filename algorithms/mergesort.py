@@ -1,7 +1,8 @@
 from __future__ import annotations
 from data_structures.referential_array import ArrayR
 from data_structures.array_list import ArrayList
-from typing import TypeVar, Union
+from data_structures.heap import MaxHeap
+from typing import Any, Callable, Iterable, Iterator, TypeVar, Union
 
 T = TypeVar("T")
 
@@ -105,4 +106,41 @@ def mergesort(my_list: Union[ArrayList[T], ArrayR], key=lambda x: x) -> Union[Ar
     # Recursively sort the two halves and merge them
     list1 = mergesort(left_half, key)
     list2 = mergesort(right_half, key)
-    return merge(list1, list2, key)
\ No newline at end of file
+    return merge(list1, list2, key)
+
+
+def kway_merge(iterables: Iterable[Iterable[T]], key: Callable[[T], Any] = None) -> Iterator[T]:
+    """
+    Lazily merges several sorted iterables into one sorted stream.
+
+    The `key` kwarg allows you to define a custom sorting order.
+    Only the current head of each stream is held, in a min heap keyed on
+    (key(head), stream index), so the streams are read one element at a time and
+    elements are never compared with each other. Elements with equal keys come out
+    by stream, in the order the streams were given, and in their order within a
+    stream, so the merge is stable.
+
+    pre:
+    Each iterable is sorted by key.
+
+    complexity:
+    Best/Worst Case: O(n * log(k) * comp(T)), n = total number of elements, k = number of iterables
+    and comp is the cost of comparison. Memory is O(k).
+    """
+    streams = ArrayList()
+    heap = MaxHeap(min_heap=True)
+    for iterable in iterables:
+        stream = iter(iterable)
+        for element in stream:
+            heap.add((element if key is None else key(element), len(streams), element))
+            break
+        streams.append(stream)
+
+    while len(heap) > 0:
+        _, index, element = heap.peek()
+        yield element
+        for following in streams[index]:
+            heap.replace((following if key is None else key(following), index, following))
+            break
+        else:
+            heap.get_min()
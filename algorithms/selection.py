@@ -0,0 +1,68 @@
+from __future__ import annotations
+from data_structures.referential_array import ArrayR
+from data_structures.heap import MaxHeap
+from typing import Any, Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+
+
+def nlargest(k: int, iterable: Iterable[T], key: Callable[[T], Any] = None) -> ArrayR[T]:
+    """
+    Returns the k largest elements of the iterable, largest first.
+
+    The `key` kwarg allows you to define a custom sorting order.
+    Elements with equal keys are returned in the order the iterable gave them,
+    so the result matches the first k elements of a stable descending sort.
+
+    The iterable is read once, keeping only the best k elements seen so far in a
+    heap of at most k entries rooted at the worst of them. This makes it suitable for
+    streams far larger than k, e.g. a cave traversal.
+
+    complexity:
+    Best Case: O(n * (key + comp)), when no element after the first k beats the heap root.
+    Worst Case: O(n * log(k) * comp) where n is the number of elements in the iterable and comp is
+    the cost of comparing two keys. Memory is O(min(k, n)).
+    """
+    return _select(k, iterable, key, largest=True)
+
+
+def nsmallest(k: int, iterable: Iterable[T], key: Callable[[T], Any] = None) -> ArrayR[T]:
+    """
+    Returns the k smallest elements of the iterable, smallest first.
+    Elements with equal keys are returned in the order the iterable gave them.
+
+    complexity:
+    See nlargest.
+    """
+    return _select(k, iterable, key, largest=False)
+
+
+def _select(k: int, iterable: Iterable[T], key: Callable[[T], Any] | None, largest: bool) -> ArrayR[T]:
+    """
+    Keeps the best k (key, order, element) entries in a heap whose root is the worst of them.
+    order is the position in the iterable, negated when looking for the largest, so that among
+    equal keys the latest element is the worst, and elements themselves are never compared.
+    """
+    if k <= 0:
+        return ArrayR(0)
+
+    # For the k largest, the worst kept entry is the smallest one, so use a min heap.
+    # It starts small and grows, so a short iterable never costs O(k) memory.
+    heap = MaxHeap(min_heap=largest)
+    sign = -1 if largest else 1
+    position = 0
+    for element in iterable:
+        element_key = element if key is None else key(element)
+        if len(heap) < k:
+            heap.add((element_key, sign * position, element))
+        else:
+            # Skip building an entry unless the element beats the root outright.
+            root_key = heap.peek()[0]
+            if (element_key > root_key) if largest else (element_key < root_key):
+                heap.replace((element_key, sign * position, element))
+        position += 1
+
+    res = ArrayR(len(heap))
+    for i in range(len(heap) - 1, -1, -1):
+        res[i] = heap.get_max()[2]
+    return res
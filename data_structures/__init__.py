@@ -13,3 +13,14 @@ from data_structures.array_sorted_list import ArraySortedList
 from data_structures.node import Node
 from data_structures.bst import BinarySearchTree
 from data_structures.heap import MaxHeap
+from data_structures.indexed_heap import IndexedMaxHeap
+from data_structures.bloom_filter import CountingBloomFilter
+from data_structures.set_expr import SetExpr
+from data_structures.hash_table_robin_hood import RobinHoodProbeTable
+from data_structures.hash_table_stats import HashTableStats
+from data_structures.hash_table_mapped import MappedProbeTable
+from data_structures.hash_table_sharded import ShardedHashTable
+from data_structures.lru_cache import LRUCache
+from data_structures.hash_table_cuckoo import CuckooHashTable
+from data_structures.hash_table_compact import CompactHashTable
+from data_structures.hash_table_perfect import StaticPerfectHashTable
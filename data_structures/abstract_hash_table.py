@@ -1,6 +1,6 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic
+from typing import Iterable, Iterator, TypeVar, Generic
 from data_structures.referential_array import ArrayR
 
 K = TypeVar('K')
@@ -48,3 +48,78 @@ class HashTable(ABC, Generic[K, V]):
     @abstractmethod
     def __str__(self) -> str:
         pass
+
+    def reserve(self, count: int) -> None:
+        """
+        Makes room for count entries in total, so that inserting up to that many
+        does not resize the table. Does nothing by default.
+        """
+        pass
+
+    @classmethod
+    def from_items(cls, items: Iterable[tuple[K, V]], size_hint: int = 0, **kwargs) -> HashTable[K, V]:
+        """
+        Builds a table from (key, value) pairs, sized once for size_hint entries
+        (or for len(items) if larger). kwargs are passed to the constructor.
+        :complexity: O(N) insertions, where N is the number of pairs.
+        """
+        table = cls(**kwargs)
+        if hasattr(items, '__len__'):
+            size_hint = max(size_hint, len(items))
+        table.reserve(size_hint)
+        table.update(items)
+        return table
+
+    def update(self, items: Iterable[tuple[K, V]]) -> None:
+        """
+        Inserts every (key, value) pair, later pairs overwriting earlier ones.
+        If the number of pairs is known, the table is resized at most once.
+        :complexity: O(N) insertions, where N is the number of pairs.
+        """
+        if hasattr(items, '__len__'):
+            self.reserve(len(self) + len(items))
+        for key, data in items:
+            self[key] = data
+
+    def get_many(self, keys: Iterable[K]) -> ArrayR[V]:
+        """
+        Returns the values of the given keys, in order.
+        :complexity: O(N) lookups, where N is the number of keys.
+        :raises KeyError: when one of the keys doesn't exist.
+        """
+        return _to_array([self[key] for key in keys])
+
+    def contains_many(self, keys: Iterable[K]) -> ArrayR[bool]:
+        """
+        Returns, for each of the given keys in order, whether it is in the table.
+        :complexity: O(N) lookups, where N is the number of keys.
+        """
+        return _to_array([key in self for key in keys])
+
+    def items(self, check: bool = True) -> Iterator[tuple[K, V]]:
+        """
+        Yields each (key, value) pair in the table.
+        By default this copies the keys first, implementations yield straight from
+        their storage and, if check is True, raise RuntimeError when the table is
+        modified during iteration.
+        :complexity: O(N) over the whole iteration, where N is the table size.
+        """
+        for key in self.keys():
+            yield key, self[key]
+
+    def iter_keys(self, check: bool = True) -> Iterator[K]:
+        """
+        Yields each key in the table, see items.
+        """
+        return (key for key, _ in self.items(check))
+
+    def iter_values(self, check: bool = True) -> Iterator[V]:
+        """
+        Yields each value in the table, see items.
+        """
+        return (value for _, value in self.items(check))
+
+
+def _to_array(items: list) -> ArrayR:
+    """ Copies a list into an ArrayR, including the empty list. """
+    return ArrayR.from_list(items) if len(items) > 0 else ArrayR(0)
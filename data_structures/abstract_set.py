@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic
+from typing import TypeVar, Generic, Iterator
 from data_structures.referential_array import ArrayR
+from data_structures.set_expr import SetExpr
 
 T = TypeVar('T')
 
@@ -55,6 +56,20 @@ class Set(ABC, Generic[T]):
         """
         pass
 
+    def __iter__(self) -> Iterator[T]:
+        """ Iterates over the items in the set in no particular order. """
+        values = self.values()
+        for i in range(len(values)):
+            yield values[i]
+
+    def lazy(self) -> SetExpr[T]:
+        """
+        Returns a lazy expression wrapping this set.
+        Combining it with |, & and - builds a SetExpr that is only evaluated
+        when iterated, measured or queried, e.g. (a.lazy() | b) & c - d.
+        """
+        return SetExpr.of(self)
+
     @abstractmethod
     def union(self, other: Set[T]) -> Set[T]:
         """ Makes a union of the set with another set. """
@@ -71,14 +86,29 @@ class Set(ABC, Generic[T]):
         pass
 
     def __and__(self, other: Set[T]) -> Set[T]:
-        """ Magic method alias for intersection """
+        """
+        Magic method alias for intersection, which builds the result eagerly.
+        The result is only a lazy SetExpr if other is one; use lazy() to start one.
+        """
+        if isinstance(other, SetExpr):
+            return self.lazy() & other
         return self.intersection(other)
     
     def __or__(self, other: Set[T]) -> Set[T]:
-        """ Magic method alias for union """
+        """
+        Magic method alias for union, which builds the result eagerly.
+        The result is only a lazy SetExpr if other is one; use lazy() to start one.
+        """
+        if isinstance(other, SetExpr):
+            return self.lazy() | other
         return self.union(other)
     
     def __sub__(self, other: Set[T]) -> Set[T]:
-        """ Magic method alias for difference """
+        """
+        Magic method alias for difference, which builds the result eagerly.
+        The result is only a lazy SetExpr if other is one; use lazy() to start one.
+        """
+        if isinstance(other, SetExpr):
+            return self.lazy() - other
         return self.difference(other)
     
\ No newline at end of file
@@ -31,6 +31,11 @@ class ArraySet(Set[T]):
                 return True
         return False
 
+    def __iter__(self):
+        """ Iterates over the items in the set without copying them. """
+        for i in range(self.__length):
+            yield self.__array[i]
+
     def clear(self) -> None:
         """ Makes the set empty. 
         We do this by simply setting the size to 0, which means the next items will
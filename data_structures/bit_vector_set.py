@@ -33,6 +33,16 @@ class BitVectorSet(Set[int]):
                 count += 1
         return res
 
+    def __iter__(self):
+        """ Iterates over the items in the set in increasing order without copying them. """
+        bit_elems = self.__elems
+        item = 1
+        while bit_elems:
+            if bit_elems & 1:
+                yield item
+            bit_elems >>= 1
+            item += 1
+
     def __contains__(self, item: int) -> bool:
         """
         True if the set contains the item. False otherwise.
@@ -0,0 +1,129 @@
+""" Counting Bloom Filter.
+
+Defines a probabilistic set membership structure. Negative answers are always
+correct, positive answers may be false positives. Each slot holds a counter
+rather than a single bit, so items can also be removed.
+"""
+from __future__ import annotations
+
+import math
+from typing import Callable, Generic, TypeVar
+
+from data_structures.hash_functions import key_hash
+from data_structures.referential_array import ArrayR
+
+T = TypeVar('T')
+
+
+class CountingBloomFilter(Generic[T]):
+    """
+    Counting Bloom Filter.
+
+    Items are hashed with key_hash by default, which is stable across processes,
+    so the filter gives the same answers (false positives included) on every run.
+    The `hash_count` slot positions are derived from the hash by double hashing.
+    Pass hash_function=builtin_hash for speed when that does not matter.
+
+    constants:
+        DEFAULT_SIZE: default number of counters
+        DEFAULT_HASH_COUNT: default number of slots set per item
+
+    Unless stated otherwise, all methods have O(k) complexity where k is hash_count.
+    """
+
+    DEFAULT_SIZE = 1024
+    DEFAULT_HASH_COUNT = 3
+
+    def __init__(self, size: int = DEFAULT_SIZE, hash_count: int = DEFAULT_HASH_COUNT,
+                 hash_function: Callable[[T], int] = key_hash) -> None:
+        """
+        :param hash_function: maps an item to a (large) non-negative integer.
+        :complexity: O(size)
+        :raises ValueError: if size is smaller than 2 or hash_count is not positive.
+        """
+        if size < 2:
+            raise ValueError("Filter size should be at least 2.")
+        if hash_count <= 0:
+            raise ValueError("Hash count should be larger than 0.")
+
+        self.hash_count = hash_count
+        self.hash_function = hash_function
+        self.__length = 0
+        self.__counters = ArrayR(size)
+        for i in range(size):
+            self.__counters[i] = 0
+
+    @property
+    def size(self) -> int:
+        return len(self.__counters)
+
+    def __len__(self) -> int:
+        """ Returns the number of items added (and not removed) to the filter. """
+        return self.__length
+
+    def is_empty(self) -> bool:
+        return self.__length == 0
+
+    def __positions(self, item: T) -> ArrayR[int]:
+        """
+        Computes the counter positions used by an item.
+        """
+        value = self.hash_function(item)
+        first = value % self.size
+        step = 1 + (value // self.size) % (self.size - 1)
+        res = ArrayR(self.hash_count)
+        for i in range(self.hash_count):
+            res[i] = (first + i * step) % self.size
+        return res
+
+    def add(self, item: T) -> None:
+        """
+        Adds an item to the filter.
+        """
+        positions = self.__positions(item)
+        for i in range(len(positions)):
+            self.__counters[positions[i]] += 1
+        self.__length += 1
+
+    def remove(self, item: T) -> None:
+        """
+        Removes an item previously added to the filter.
+        Removing an item that was never added corrupts the filter for other items.
+        :raises KeyError: if the item is definitely not in the filter.
+        """
+        positions = self.__positions(item)
+        for i in range(len(positions)):
+            if self.__counters[positions[i]] == 0:
+                raise KeyError(item)
+        for i in range(len(positions)):
+            self.__counters[positions[i]] -= 1
+        self.__length -= 1
+
+    def __contains__(self, item: T) -> bool:
+        """
+        False if the item is definitely not in the filter, True if it might be.
+        """
+        positions = self.__positions(item)
+        for i in range(len(positions)):
+            if self.__counters[positions[i]] == 0:
+                return False
+        return True
+
+    def clear(self) -> None:
+        """
+        Resets all counters.
+        :complexity: O(size)
+        """
+        for i in range(self.size):
+            self.__counters[i] = 0
+        self.__length = 0
+
+    def expected_false_positive_rate(self) -> float:
+        """
+        Theoretical false positive rate for the current number of items,
+        (1 - e^(-kn/m))^k.
+        """
+        return (1 - math.exp(-self.hash_count * self.__length / self.size)) ** self.hash_count
+
+    def __str__(self) -> str:
+        return f"CountingBloomFilter(size={self.size}, hash_count={self.hash_count}, items={self.__length})"
@@ -20,6 +20,9 @@ K = TypeVar('K')
 I = TypeVar('I')
 T = TypeVar('T')
 
+# Default of get() that no item can be, so that __contains__ can tell a missing key apart.
+_MISSING = object()
+
 
 class BSTPreOrderIterator:
     """ Pre-order iterator for the binary search tree.
@@ -149,12 +152,7 @@ class BinarySearchTree(Generic[K, I]):
             Checks to see if the key is in the BST
             :complexity: see __getitem__(self, key: K) -> (K, I)
         """
-        try:
-            _ = self[key]
-        except KeyError:
-            return False
-        else:
-            return True
+        return self.get(key, _MISSING) is not _MISSING
 
     def __iter__(self) -> BSTInOrderIterator:
         """ Create an in-order iterator. """
@@ -169,38 +167,69 @@ class BinarySearchTree(Generic[K, I]):
         """
         return self.get_tree_node_by_key(key).item
 
+    def get(self, key: K, default: I = None) -> I:
+        """
+            Returns the item of the key, or default if the key is not in the tree.
+            :complexity: see __getitem__(self, key: K) -> (K, I)
+        """
+        current = self.root
+        while current is not None:
+            if key == current.key:
+                return current.item
+            elif key < current.key:
+                current = current.left
+            else:  # key > current.key
+                current = current.right
+        return default
+
     def get_tree_node_by_key(self, key: K) -> TreeNode:
         return self.get_tree_node_by_key_aux(self.root, key)
 
     def get_tree_node_by_key_aux(self, current: TreeNode, key: K) -> TreeNode:
-        if current is None:  # base case: empty
-            raise KeyError('Key not found: {0}'.format(key))
-        elif key == current.key:  # base case: found
-            return current
-        elif key < current.key:
-            return self.get_tree_node_by_key_aux(current.left, key)
-        else:  # key > current.key
-            return self.get_tree_node_by_key_aux(current.right, key)
+        """
+            Walks down from current to the node with the key, without recursion.
+            :raises KeyError: if the key is not in the sub-tree.
+        """
+        while current is not None:
+            if key == current.key:
+                return current
+            elif key < current.key:
+                current = current.left
+            else:  # key > current.key
+                current = current.right
+        raise KeyError('Key not found: {0}'.format(key))
 
     def __setitem__(self, key: K, item: I) -> None:
         self.root = self.insert_aux(self.root, key, item, 0)
 
     def insert_aux(self, current: TreeNode, key: K, item: I, current_depth: int) -> TreeNode:
         """
-            Attempts to insert an item into the tree, it uses the Key to insert it
+            Attempts to insert an item into the tree, it uses the Key to insert it.
+            Walks down from current without recursion and returns the root of the sub-tree.
             :complexity best: O(CompK) inserts the item at the root.
             :complexity worst: O(CompK * N) where N is the number of elements in the tree and the tree is unbalanced
             CompK is the complexity of comparing the keys
         """
-        if current is None:  # base case: at the leaf
-            current = TreeNode(key, item, current_depth)
+        if current is None:  # at the leaf
             self.length += 1
-        elif key < current.key:
-            current.left = self.insert_aux(current.left, key, item, current_depth + 1)
-        elif key > current.key:
-            current.right = self.insert_aux(current.right, key, item, current_depth + 1)
-        else:  # key == current.key
-            raise ValueError('Inserting duplicate item')
+            return TreeNode(key, item, current_depth)
+
+        parent = current
+        while True:
+            current_depth += 1
+            if key < parent.key:
+                if parent.left is None:
+                    parent.left = TreeNode(key, item, current_depth)
+                    break
+                parent = parent.left
+            elif key > parent.key:
+                if parent.right is None:
+                    parent.right = TreeNode(key, item, current_depth)
+                    break
+                parent = parent.right
+            else:  # key == parent.key
+                raise ValueError('Inserting duplicate item')
+        self.length += 1
         return current
 
     def __delitem__(self, key: K) -> None:
@@ -210,31 +239,44 @@ class BinarySearchTree(Generic[K, I]):
         """
             Attempts to delete an item from the tree, it uses the Key to
             determine the node to delete.
+            Walks down from current without recursion and returns the root of the sub-tree.
+            :complexity best: O(CompK) deletes the root, which has at most one child.
+            :complexity worst: O(CompK * N) where N is the number of elements in the tree and the tree is unbalanced
+            CompK is the complexity of comparing the keys
         """
-
-        if current is None:  # key not found
+        parent = None
+        node = current
+        while node is not None and key != node.key:
+            parent = node
+            node = node.left if key < node.key else node.right
+        if node is None:  # key not found
             raise ValueError('Deleting non-existent item')
-        elif key < current.key:
-            current.left = self.delete_aux(current.left, key)
-        elif key > current.key:
-            current.right = self.delete_aux(current.right, key)
-        else:  # we found our key => do actual deletion
-            if self.is_leaf(current):
-                self.length -= 1
-                return None
-            elif current.left is None:
-                self.length -= 1
-                return current.right
-            elif current.right is None:
-                self.length -= 1
-                return current.left
-
-            # general case => find a successor
-            succ = self.get_successor(current)
-            current.key = succ.key
-            current.item = succ.item
-            current.right = self.delete_aux(current.right, succ.key)
 
+        self.length -= 1
+        if node.left is not None and node.right is not None:
+            # general case => move the successor's key and item here, then unlink the
+            # successor, which has no left child
+            succ_parent = node
+            succ = node.right
+            while succ.left is not None:
+                succ_parent = succ
+                succ = succ.left
+            node.key = succ.key
+            node.item = succ.item
+            if succ_parent is node:
+                succ_parent.right = succ.right
+            else:
+                succ_parent.left = succ.right
+            return current
+
+        # leaf or a single child => the child (if any) takes the node's place
+        child = node.left if node.left is not None else node.right
+        if parent is None:
+            return child
+        if parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
         return current
 
     def get_successor(self, current: TreeNode) -> TreeNode:
@@ -254,9 +296,9 @@ class BinarySearchTree(Generic[K, I]):
         """
         if current is None:
             return None
-        if current.left is None:
-            return current
-        return self.get_minimal(current.left)
+        while current.left is not None:
+            current = current.left
+        return current
 
     def get_maximal(self, current: TreeNode) -> TreeNode | None:
         """
@@ -264,9 +306,9 @@ class BinarySearchTree(Generic[K, I]):
         """
         if current is None:
             return None
-        if current.right is None:
-            return current
-        return self.get_maximal(current.right)
+        while current.right is not None:
+            current = current.right
+        return current
 
     def is_leaf(self, current: TreeNode) -> bool:
         """ Simple check whether or not the node is a leaf. """
@@ -0,0 +1,135 @@
+""" Hash functions for the hash tables.
+
+A hash function maps a key to a (large) integer that does not depend on the
+table size. Tables reduce it modulo their size to get a position, and store it
+next to each entry so that resizing never needs to hash a key again.
+"""
+from __future__ import annotations
+import numbers
+
+HASH_BASE = 31
+HASH_SEED = 31415
+
+# Mersenne prime 2^61 - 1, used to keep polynomial hashes bounded.
+HASH_MODULUS = (1 << 61) - 1
+
+# Constants of the splitmix64 finaliser, which spreads every input bit over the output.
+MASK_64 = (1 << 64) - 1
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+MIX_MULTIPLIER_1 = 0xBF58476D1CE4E5B9
+MIX_MULTIPLIER_2 = 0x94D049BB133111EB
+
+
+def universal_hash(key: str) -> int:
+    """
+    Polynomial (universal) string hash used by the hash tables of this unit.
+    The same recurrence as the classic table hash, but reduced modulo a fixed
+    large prime instead of the table size, so the result can be cached.
+    It is stable across processes.
+
+    :complexity: O(len(key))
+    """
+    value = 0
+    a = HASH_SEED
+    for char in key:
+        value = (ord(char) + a * value) % HASH_MODULUS
+        a = a * HASH_BASE % (HASH_MODULUS - 1)
+    return value
+
+
+def builtin_hash(key) -> int:
+    """
+    Fast hash based on Python's built-in hash, which strings cache after
+    the first call. Not stable across processes (see PYTHONHASHSEED).
+
+    :complexity: O(len(key)) on first use of a string, O(1) afterwards.
+    """
+    return hash(key)
+
+
+def mix_int(value: int) -> int:
+    """
+    Integer hash using the splitmix64 finaliser (Fibonacci hashing followed by
+    xor-shift-multiply rounds). Consecutive ids land far apart, which linear
+    probing needs: reducing the raw integer modulo the table size would turn a
+    run of ids into one long cluster. Integers are taken modulo 2^64.
+
+    :complexity: O(1) for integers of at most 64 bits.
+    """
+    value = (value + GOLDEN_GAMMA) & MASK_64
+    value = ((value ^ (value >> 30)) * MIX_MULTIPLIER_1) & MASK_64
+    value = ((value ^ (value >> 27)) * MIX_MULTIPLIER_2) & MASK_64
+    return value ^ (value >> 31)
+
+
+def key_hash(key) -> int:
+    """
+    Key-type aware hash, stable across processes for strings, numbers and tuples of them.
+    Keys that compare equal hash equally, as in a dict, subclasses included.
+    - str: universal_hash.
+    - numbers: integral values (1, 1.0, True, Fraction(2, 2), -0.0, ...) hash as the equal
+      int with mix_int. Other values mix Python's numeric hash, which is the same for equal
+      values of every numeric type (0.5 and Fraction(1, 2)) and does not depend on
+      PYTHONHASHSEED.
+    - tuple: the hashes of the elements combined polynomially, then mixed.
+    - anything else: Python's built-in hash, mixed.
+
+    :complexity: O(len(key)) for strings, O(sum of the element hashes) for tuples,
+        O(1) for numbers.
+    """
+    # Exact types first, the common case, then subclasses and other numeric types.
+    key_type = type(key)
+    if key_type is str:
+        return universal_hash(key)
+    elif key_type is int or key_type is bool:
+        return mix_int(key)
+    elif key_type is float:
+        return mix_int(int(key)) if key.is_integer() else mix_int(hash(key))
+    elif key_type is tuple:
+        return _tuple_hash(key)
+    elif isinstance(key, str):
+        return universal_hash(key)
+    elif isinstance(key, tuple):
+        return _tuple_hash(key)
+    elif isinstance(key, numbers.Number):
+        return _number_hash(key)
+    return mix_int(hash(key))
+
+
+def _tuple_hash(key: tuple) -> int:
+    """ Combines the key_hash of each element of a tuple. """
+    value = HASH_SEED
+    for item in key:
+        value = (value * HASH_BASE + key_hash(item)) % HASH_MODULUS
+    return mix_int(value)
+
+
+def _number_hash(key: numbers.Number) -> int:
+    """ Hashes any number like the equal int if it is integral, else by its numeric hash. """
+    try:
+        integral = int(key)
+    except (TypeError, ValueError, OverflowError):
+        # complex, NaN and infinities have no equal int
+        pass
+    else:
+        if integral == key:
+            return mix_int(integral)
+    return mix_int(hash(key))
+
+
+def next_prime(n: int) -> int:
+    """
+    Smallest prime greater than or equal to n, used to grow tables past their
+    precomputed sizes.
+
+    :complexity: O(G * sqrt(n)) where G is the gap to the next prime (O(log n) on average).
+    """
+    candidate = max(n, 2)
+    while True:
+        if candidate == 2 or candidate % 2 == 1:
+            divisor = 3
+            while divisor * divisor <= candidate and candidate % divisor != 0:
+                divisor += 2
+            if candidate == 2 or divisor * divisor > candidate:
+                return candidate
+        candidate += 1
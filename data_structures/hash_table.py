@@ -8,8 +8,9 @@ __author__ = 'Jackson Goerner'
 __since__ = '07/02/2023'
 
 
-from typing import TypeVar
+from typing import Callable, TypeVar
 
+from data_structures.hash_functions import next_prime, universal_hash
 from data_structures.referential_array import ArrayR
 
 K = TypeVar('K')
@@ -26,41 +27,47 @@ class LinearProbeTable:
 
     Type Arguments:
         - K:    Key Type. In most cases should be string.
-                Otherwise `hash` should be overwritten.
+                Otherwise a suitable `hash_function` should be given.
         - V:    Value Type.
 
+    Each slot stores (key, value, key_hash) where key_hash is the full,
+    table-size independent hash of the key, so resizing and moving
+    clusters never hash a key again.
+
     Unless stated otherwise, all methods have O(1) complexity.
     """
 
-    # No test case should exceed 1 million entries.
+    # Precomputed sizes, the table keeps growing through primes of about
+    # twice the size once these run out.
     TABLE_SIZES = [5, 13, 29, 53, 97, 193, 389, 769, 1543, 3079, 6151,
                    12289, 24593, 49157, 98317, 196613, 393241, 786433, 1572869]
 
-    HASH_BASE = 31
-
-    def __init__(self, sizes=None) -> None:
+    def __init__(self, sizes=None, hash_function: Callable[[K], int] = universal_hash,
+                 expected_size: int = 0) -> None:
         """
         Initialise the Hash Table.
+
+        :param hash_function: maps a key to an integer independent of the table size,
+            e.g. universal_hash (default) or builtin_hash (uses the cached str hash).
+        :param expected_size: number of entries the table should hold without resizing.
         """
         if sizes is not None:
             self.TABLE_SIZES = sizes
+        self.hash_function = hash_function
         self.size_index = 0
-        self.array: ArrayR[tuple[K, V]] = ArrayR(self.TABLE_SIZES[self.size_index])
+        size = self.TABLE_SIZES[self.size_index]
+        while expected_size > size / 2:
+            size = self._next_size(size)
+        self.array: ArrayR[tuple[K, V, int]] = ArrayR(size)
         self.count = 0
 
     def hash(self, key: K) -> int:
         """
         Hash a key for insert/retrieve/update into the hashtable.
 
-        :complexity: O(len(key))
+        :complexity: O(hash_function(key))
         """
-
-        value = 0
-        a = 31415
-        for char in key:
-            value = (ord(char) + a * value) % self.table_size
-            a = a * self.HASH_BASE % (self.table_size - 1)
-        return value
+        return self.hash_function(key) % self.table_size
 
     @property
     def table_size(self) -> int:
@@ -72,17 +79,17 @@ class LinearProbeTable:
         """
         return self.count
 
-    def _linear_probe(self, key: K, is_insert: bool) -> int:
+    def _linear_probe(self, key: K, key_hash: int, is_insert: bool) -> int:
         """
         Find the correct position for this key in the hash table using linear probing.
-        :complexity best: O(hash(key)) first position is empty
-        :complexity worst: O(hash(key) + N*comp(K)) when we've searched the entire table
+        :complexity best: O(1) first position is empty
+        :complexity worst: O(N*comp(K)) when we've searched the entire table
                         where N is the tablesize
         :raises KeyError: When the key is not in the table, but is_insert is False.
         :raises FullError: When a table is full and cannot be inserted.
         """
         # Initial position
-        position = self.hash(key)
+        position = key_hash % self.table_size
 
         for _ in range(self.table_size):
             if self.array[position] is None:
@@ -91,7 +98,7 @@ class LinearProbeTable:
                     return position
                 else:
                     raise KeyError(key)
-            elif self.array[position][0] == key:
+            elif self.array[position][2] == key_hash and self.array[position][0] == key:
                 return position
             else:
                 # Taken by something else. Time to linear probe.
@@ -146,7 +153,7 @@ class LinearProbeTable:
         :complexity: See linear probe.
         :raises KeyError: when the key doesn't exist.
         """
-        position = self._linear_probe(key, False)
+        position = self._linear_probe(key, self.hash_function(key), False)
         return self.array[position][1]
 
     def __setitem__(self, key: K, data: V) -> None:
@@ -154,15 +161,14 @@ class LinearProbeTable:
         Set an (key, value) pair in our hash table.
 
         :complexity: See linear probe.
-        :raises FullError: when the table cannot be resized further.
         """
-
-        position = self._linear_probe(key, True)
+        key_hash = self.hash_function(key)
+        position = self._linear_probe(key, key_hash, True)
 
         if self.array[position] is None:
             self.count += 1
 
-        self.array[position] = (key, data)
+        self.array[position] = (key, data, key_hash)
 
         if len(self) > self.table_size / 2:
             self._rehash()
@@ -172,21 +178,22 @@ class LinearProbeTable:
         Deletes a (key, value) pair in our hash table.
 
         :complexity best: O(hash(key)) deleting item is not probed and in correct spot.
-        :complexity worst: O(N*hash(key)+N^2*comp(K)) deleting item is midway through large chain.
+        :complexity worst: O(hash(key)+N^2*comp(K)) deleting item is midway through large chain.
+            Keys moved within the cluster are not hashed again.
         :raises KeyError: when the key doesn't exist.
         """
-        position = self._linear_probe(key, False)
+        position = self._linear_probe(key, self.hash_function(key), False)
         # Remove the element
         self.array[position] = None
         self.count -= 1
         # Start moving over the cluster
         position = (position + 1) % self.table_size
         while self.array[position] is not None:
-            key2, value = self.array[position]
+            entry = self.array[position]
             self.array[position] = None
-            # Reinsert.
-            newpos = self._linear_probe(key2, True)
-            self.array[newpos] = (key2, value)
+            # Reinsert using the cached hash.
+            newpos = self._linear_probe(entry[0], entry[2], True)
+            self.array[newpos] = entry
             position = (position + 1) % self.table_size
 
     def is_empty(self) -> bool:
@@ -195,25 +202,30 @@ class LinearProbeTable:
     def is_full(self) -> bool:
         return self.count == self.table_size
 
+    def _next_size(self, size: int) -> int:
+        """
+        Returns the table size to grow to from the given size.
+        :complexity: O(1) within TABLE_SIZES, see next_prime otherwise.
+        """
+        self.size_index += 1
+        if self.size_index < len(self.TABLE_SIZES):
+            return self.TABLE_SIZES[self.size_index]
+        return next_prime(2 * size + 1)
+
     def _rehash(self) -> None:
         """
         Need to resize table and reinsert all values
 
-        :complexity best: O(N*hash(K)) No probing.
-        :complexity worst: O(N*hash(K) + N^2*comp(K)) Lots of probing.
-        Where N is len(self)
+        :complexity best: O(N) No probing.
+        :complexity worst: O(N^2*comp(K)) Lots of probing.
+        Where N is len(self). Keys are not hashed again.
         """
         old_array = self.array
-        self.size_index += 1
-        if self.size_index >= len(self.TABLE_SIZES):
-            # Cannot be resized further.
-            return
-        self.array = ArrayR(self.TABLE_SIZES[self.size_index])
-        self.count = 0
-        for item in old_array:
-            if item is not None:
-                key, value = item
-                self[key] = value
+        self.array = ArrayR(self._next_size(self.table_size))
+        for entry in old_array:
+            if entry is not None:
+                position = self._linear_probe(entry[0], entry[2], True)
+                self.array[position] = entry
 
     def __str__(self) -> str:
         """
@@ -224,6 +236,6 @@ class LinearProbeTable:
         result = ""
         for item in self.array:
             if item is not None:
-                (key, value) = item
+                (key, value, _) = item
                 result += "(" + str(key) + "," + str(value) + ")\n"
         return result
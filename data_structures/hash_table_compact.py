@@ -0,0 +1,289 @@
+from __future__ import annotations
+from array import array
+from typing import Callable, Iterator, TypeVar
+from data_structures.abstract_hash_table import HashTable
+from data_structures.hash_functions import key_hash
+from data_structures.referential_array import ArrayR
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+# Marks the hole a deleted entry leaves in the dense arrays.
+DELETED = object()
+
+
+class CompactHashTable(HashTable[K, V]):
+    """
+    Compact, insertion ordered Hash Table (in the style of CPython's dict).
+
+    Entries are appended, in insertion order, to dense parallel key, value and
+    key hash arrays. The hash table itself is a sparse index of small integers
+    (1, 2, 4 or 8 bytes each, depending on its size) holding the position of an
+    entry in the dense arrays, EMPTY or DUMMY (deleted). The index is probed with
+    CPython's perturbed probing over a power of two size, so all the bits of the
+    key hash take part.
+
+    Only the index is sized for the load factor: the dense arrays hold 2/3 of
+    the index size, so empty slots cost a few bytes instead of three references.
+    Iteration walks the dense arrays, so it is O(number of entries) and follows
+    insertion order. Updating a key keeps its position, deleting leaves a hole
+    that is squeezed out when the table is next resized.
+
+    Type Arguments:
+        - K:    Key Type.
+        - V:    Value Type.
+
+    Unless stated otherwise, all methods have O(1) expected complexity (plus hashing the key).
+    """
+
+    MIN_SIZE = 8
+    EMPTY = -1
+    DUMMY = -2
+
+    # Number of bits of the hash mixed into each probe step.
+    PERTURB_SHIFT = 5
+
+    def __init__(self, hash_function: Callable[[K], int] = key_hash, expected_size: int = 0) -> None:
+        """
+        :param hash_function: maps a key to an integer independent of the table size.
+        :param expected_size: number of entries the table should hold without resizing.
+        """
+        self.hash_function = hash_function
+        self.__length = 0
+        self.__modifications = 0
+        self.__allocate(self.__index_size_for(expected_size))
+
+    def __index_size_for(self, count: int) -> int:
+        """
+        Returns the smallest power of two index size with room for count entries.
+        """
+        size = self.MIN_SIZE
+        while self.__usable(size) < count:
+            size *= 2
+        return size
+
+    @staticmethod
+    def __usable(size: int) -> int:
+        """
+        Returns the number of entries an index of the given size holds.
+        """
+        return size * 2 // 3
+
+    def __allocate(self, size: int) -> None:
+        """
+        Replaces the index by an empty one of the given size, with dense arrays to match.
+        :complexity: O(size)
+        """
+        if size <= 1 << 7:
+            typecode = 'b'
+        elif size <= 1 << 15:
+            typecode = 'h'
+        elif size <= 1 << 31:
+            typecode = 'i'
+        else:
+            typecode = 'q'
+        self.__index = array(typecode, [self.EMPTY]) * size
+        usable = self.__usable(size)
+        self.__keys: ArrayR[K] = ArrayR(usable)
+        self.__values: ArrayR[V] = ArrayR(usable)
+        self.__hashes: ArrayR[int] = ArrayR(usable)
+        self.__used = 0
+
+    @property
+    def table_size(self) -> int:
+        return len(self.__index)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of elements in the hash table
+        """
+        return self.__length
+
+    def is_empty(self) -> bool:
+        return self.__length == 0
+
+    def __lookup(self, key: K, key_hash: int) -> tuple[int, int]:
+        """
+        Probes the index for the key.
+        Returns the index slot and entry position of the key, or, if it is not in
+        the table, the slot a new entry should take (the first DUMMY on the way,
+        else the EMPTY slot that ended the probe) and -1.
+        :complexity best: O(comp(K)) first slot is empty or holds the key
+        :complexity worst: O(N*comp(K)) where N is the index size
+        """
+        index = self.__index
+        keys = self.__keys
+        hashes = self.__hashes
+        mask = len(index) - 1
+        perturb = key_hash & ((1 << 64) - 1)
+        slot = key_hash & mask
+        free_slot = -1
+
+        while True:
+            position = index[slot]
+            if position == self.EMPTY:
+                return (slot if free_slot == -1 else free_slot), -1
+            elif position == self.DUMMY:
+                if free_slot == -1:
+                    free_slot = slot
+            elif hashes[position] == key_hash and keys[position] == key:
+                return slot, position
+            perturb >>= self.PERTURB_SHIFT
+            slot = (slot * 5 + perturb + 1) & mask
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value at a certain key
+
+        :complexity: See __lookup.
+        :raises KeyError: when the key doesn't exist.
+        """
+        _, position = self.__lookup(key, self.hash_function(key))
+        if position == -1:
+            raise KeyError(key)
+        return self.__values[position]
+
+    def __contains__(self, key: K) -> bool:
+        """
+        Checks to see if the given key is in the Hash Table
+
+        :complexity: See __lookup.
+        """
+        return self.__lookup(key, self.hash_function(key))[1] != -1
+
+    def __setitem__(self, key: K, data: V) -> None:
+        """
+        Set an (key, value) pair in our hash table. A new key goes after every
+        other key in iteration order, an existing key keeps its place.
+
+        :complexity: See __lookup, O(N) when the table is resized.
+        """
+        key_hash = self.hash_function(key)
+        slot, position = self.__lookup(key, key_hash)
+        if position != -1:
+            self.__values[position] = data
+            return
+
+        if self.__used == len(self.__keys):
+            self.__resize(self.__index_size_for(self.__length + 1) * 2)
+            slot, _ = self.__lookup(key, key_hash)
+
+        position = self.__used
+        self.__index[slot] = position
+        self.__keys[position] = key
+        self.__values[position] = data
+        self.__hashes[position] = key_hash
+        self.__used += 1
+        self.__length += 1
+        self.__modifications += 1
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Deletes a (key, value) pair in our hash table, leaving a hole in the dense arrays.
+
+        :complexity: See __lookup.
+        :raises KeyError: when the key doesn't exist.
+        """
+        slot, position = self.__lookup(key, self.hash_function(key))
+        if position == -1:
+            raise KeyError(key)
+        self.__index[slot] = self.DUMMY
+        self.__keys[position] = DELETED
+        self.__values[position] = None
+        self.__hashes[position] = None
+        self.__length -= 1
+        self.__modifications += 1
+
+    def reserve(self, count: int) -> None:
+        """
+        Grows the table once so that it holds count entries without resizing.
+        :complexity: O(1) if the table is large enough, see __resize otherwise.
+        """
+        if count > self.__usable(len(self.__index)):
+            self.__resize(self.__index_size_for(count))
+
+    def __resize(self, size: int) -> None:
+        """
+        Rebuilds the index with the given size and squeezes the holes out of the
+        dense arrays, keeping the insertion order. Keys are not hashed again.
+        :complexity: O(N + M) where N is the number of used entries and M the new index size.
+        """
+        old_keys = self.__keys.to_list()[:self.__used]
+        old_values = self.__values.to_list()[:self.__used]
+        old_hashes = self.__hashes.to_list()[:self.__used]
+        self.__allocate(size)
+        self.__modifications += 1
+
+        index = self.__index
+        mask = size - 1
+        position = 0
+        for key, value, key_hash in zip(old_keys, old_values, old_hashes):
+            if key is DELETED:
+                continue
+            perturb = key_hash & ((1 << 64) - 1)
+            slot = key_hash & mask
+            while index[slot] != self.EMPTY:
+                perturb >>= self.PERTURB_SHIFT
+                slot = (slot * 5 + perturb + 1) & mask
+            index[slot] = position
+            self.__keys[position] = key
+            self.__values[position] = value
+            self.__hashes[position] = key_hash
+            position += 1
+        self.__used = position
+
+    def items(self, check: bool = True) -> Iterator[tuple[K, V]]:
+        """
+        Yields each (key, value) pair in insertion order, straight from the dense arrays.
+
+        :complexity: O(N) over the whole iteration, where N is the number of
+            entries (including holes left by deletions since the last resize).
+        :raises RuntimeError: if check is True and a key is inserted or deleted,
+            or the table resized, during iteration.
+        """
+        modifications = self.__modifications
+        keys, values = self.__keys, self.__values
+        for position in range(self.__used):
+            key = keys[position]
+            if key is not DELETED:
+                yield key, values[position]
+                if check and self.__modifications != modifications:
+                    raise RuntimeError("Hash table modified during iteration")
+
+    def keys(self) -> ArrayR[K]:
+        """
+        Returns all keys in the hash table, in insertion order.
+
+        :complexity: O(N) where N is the number of entries.
+        """
+        res = ArrayR(self.__length)
+        i = 0
+        for key in self.__keys.to_list()[:self.__used]:
+            if key is not DELETED:
+                res[i] = key
+                i += 1
+        return res
+
+    def values(self) -> ArrayR[V]:
+        """
+        Returns all values in the hash table, in insertion order.
+
+        :complexity: O(N) where N is the number of entries.
+        """
+        res = ArrayR(self.__length)
+        i = 0
+        for key, value in zip(self.__keys.to_list()[:self.__used], self.__values.to_list()[:self.__used]):
+            if key is not DELETED:
+                res[i] = value
+                i += 1
+        return res
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table, in insertion order.
+        :complexity: O(N * (str(key) + str(value))) where N is the number of entries
+        """
+        result = ""
+        for key, value in self.items():
+            result += "(" + str(key) + "," + str(value) + ")\n"
+        return result
@@ -0,0 +1,496 @@
+from __future__ import annotations
+import random
+from typing import Callable, Iterator, TypeVar
+from data_structures.abstract_hash_table import HashTable
+from data_structures.hash_functions import MASK_64, key_hash, mix_int
+from data_structures.hash_table_linear_probing import LinearProbeTable
+from data_structures.referential_array import ArrayR
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class CuckooHashTable(HashTable[K, V]):
+    """
+    Bucketised Cuckoo Hash Table.
+
+    Every key has two candidate buckets of BUCKET_SIZE slots, picked by two hash
+    functions derived from its full hash. A key is always stored in one of its
+    two buckets, or in a small stash of at most STASH_SIZE entries, so a lookup
+    reads at most two buckets and the stash, as long as few keys share a hash.
+
+    An insert that finds both buckets full kicks an entry out of one of them and
+    moves it to its other bucket, repeating up to MAX_KICKS times. If an entry is
+    still left without a slot, it goes to the stash; once the stash is full the
+    table is rebuilt with new hash functions, and twice the buckets if that is
+    not enough.
+
+    Keys with the same full hash always share both buckets, so at most
+    2*BUCKET_SIZE of them fit there whatever the table size. Once both buckets
+    hold nothing else, more keys with that hash are appended to an overflow chain
+    for it, instead of rebuilding and growing the table forever. Only lookups of
+    that hash read its chain, in O(C) for C chained keys.
+
+    Slots are stored as parallel key, value and key hash arrays, as in
+    LinearProbeTable. The key hash is computed once per operation and reused
+    when entries are kicked or the table is rebuilt.
+
+    Type Arguments:
+        - K:    Key Type.
+        - V:    Value Type.
+
+    Unless stated otherwise, all methods have O(1) expected complexity (plus hashing the key).
+    """
+
+    BUCKET_SIZE = 4
+    STASH_SIZE = 4
+
+    # Fraction of the slots that may be filled before the table grows.
+    MAX_LOAD = 0.9
+
+    # Number of entries moved by a single insert before giving up on it.
+    MAX_KICKS = 250
+
+    DEFAULT_BUCKET_COUNT = 4
+
+    # Number of seeds a rebuild tries (doubling the buckets once, after the first)
+    # before it lets the entries still left without a slot overflow the stash.
+    MAX_REBUILDS = 8
+
+    def __init__(self, hash_function: Callable[[K], int] = key_hash, expected_size: int = 0) -> None:
+        """
+        :param hash_function: maps a key to an integer independent of the table size.
+        :param expected_size: number of entries the table should hold without resizing.
+        """
+        self.hash_function = hash_function
+        self.__length = 0
+        self.__modifications = 0
+        self.__seed = 0
+        self.__random = random.Random(0)
+        # Keys that do not fit in the buckets of their hash, by hash modulo 2^64
+        self.__chains: LinearProbeTable[int, list[tuple[K, V, int]]] = LinearProbeTable()
+        self.__chained_count = 0
+        bucket_count = self.DEFAULT_BUCKET_COUNT
+        while expected_size > bucket_count * self.BUCKET_SIZE * self.MAX_LOAD:
+            bucket_count *= 2
+        self.__allocate(bucket_count)
+
+    def __allocate(self, bucket_count: int) -> None:
+        """
+        Replaces the slots and stash by empty ones.
+        :complexity: O(bucket_count)
+        """
+        size = bucket_count * self.BUCKET_SIZE
+        self.__keys: ArrayR[K] = ArrayR(size)
+        self.__values: ArrayR[V] = ArrayR(size)
+        self.__hashes: ArrayR[int] = ArrayR(size)
+        self.__stash: ArrayR[tuple[K, V, int]] = ArrayR(self.STASH_SIZE)
+        self.__stash_count = 0
+
+    @property
+    def table_size(self) -> int:
+        return len(self.__keys)
+
+    @property
+    def bucket_count(self) -> int:
+        return len(self.__keys) // self.BUCKET_SIZE
+
+    def __len__(self) -> int:
+        """
+        Returns the number of elements in the hash table
+        """
+        return self.__length
+
+    def is_empty(self) -> bool:
+        return self.__length == 0
+
+    def __buckets(self, key_hash: int) -> tuple[int, int]:
+        """
+        Returns the two candidate buckets of a key hash, which are different
+        whenever there is more than one bucket.
+        """
+        bucket_count = len(self.__keys) // self.BUCKET_SIZE
+        # One mix gives 64 well spread bits, the low and high halves pick the buckets.
+        mixed = mix_int(key_hash + self.__seed)
+        first = (mixed & 0xFFFFFFFF) % bucket_count
+        second = (mixed >> 32) % bucket_count
+        if second == first:
+            second = (first + 1) % bucket_count
+        return first, second
+
+    def __find(self, key: K, key_hash: int) -> int:
+        """
+        Returns the slot holding the key, or -1 if it is not in either of its buckets.
+        :complexity: O(BUCKET_SIZE*comp(K))
+        """
+        keys = self.__keys
+        hashes = self.__hashes
+        for bucket in self.__buckets(key_hash):
+            for position in range(bucket * self.BUCKET_SIZE, (bucket + 1) * self.BUCKET_SIZE):
+                slot_key = keys[position]
+                if slot_key is not None and hashes[position] == key_hash and slot_key == key:
+                    return position
+        return -1
+
+    def __find_stash(self, key: K, key_hash: int) -> int:
+        """
+        Returns the index of the key in the stash, or -1 if it is not there.
+        :complexity: O(STASH_SIZE*comp(K))
+        """
+        for i in range(self.__stash_count):
+            entry = self.__stash[i]
+            if entry[2] == key_hash and entry[0] == key:
+                return i
+        return -1
+
+    def __find_chain(self, key: K, key_hash: int) -> tuple[list[tuple[K, V, int]] | None, int]:
+        """
+        Returns the overflow chain of the key hash (None if there is none) and
+        the index of the key in it, or -1 if it is not there.
+        :complexity: O(hash(key_hash) + C*comp(K)) where C is the length of the chain.
+        """
+        if self.__chained_count == 0:
+            return None, -1
+        try:
+            chain = self.__chains[key_hash & MASK_64]
+        except KeyError:
+            return None, -1
+        for i in range(len(chain)):
+            if chain[i][2] == key_hash and chain[i][0] == key:
+                return chain, i
+        return chain, -1
+
+    def __same_hash_count(self, key_hash: int) -> int:
+        """
+        Returns the number of entries in the buckets of key_hash whose hash equals
+        it modulo 2^64. Kicking can never move them, they all have the same buckets.
+        :complexity: O(BUCKET_SIZE)
+        """
+        key_hash &= MASK_64
+        count = 0
+        for bucket in self.__buckets(key_hash):
+            for position in range(bucket * self.BUCKET_SIZE, (bucket + 1) * self.BUCKET_SIZE):
+                if self.__keys[position] is not None and self.__hashes[position] & MASK_64 == key_hash:
+                    count += 1
+        return count
+
+    def __free_slot(self, bucket: int) -> int:
+        """
+        Returns an empty slot of the bucket, or -1 if it is full.
+        """
+        for position in range(bucket * self.BUCKET_SIZE, (bucket + 1) * self.BUCKET_SIZE):
+            if self.__keys[position] is None:
+                return position
+        return -1
+
+    def __write(self, position: int, entry: tuple[K, V, int]) -> None:
+        self.__keys[position] = entry[0]
+        self.__values[position] = entry[1]
+        self.__hashes[position] = entry[2]
+
+    def __place(self, entry: tuple[K, V, int]) -> tuple[K, V, int] | None:
+        """
+        Stores an entry whose key is not in the table, kicking other entries to
+        their other bucket while both buckets are full.
+        Returns the entry left without a slot after MAX_KICKS moves, or None.
+        :complexity: O(MAX_KICKS)
+        """
+        first, second = self.__buckets(entry[2])
+        for bucket in (first, second):
+            position = self.__free_slot(bucket)
+            if position != -1:
+                self.__write(position, entry)
+                return None
+
+        bucket = first
+        for _ in range(self.MAX_KICKS):
+            position = bucket * self.BUCKET_SIZE + self.__random.randrange(self.BUCKET_SIZE)
+            victim = (self.__keys[position], self.__values[position], self.__hashes[position])
+            self.__write(position, entry)
+            entry = victim
+            first, second = self.__buckets(entry[2])
+            bucket = second if bucket == first else first
+            position = self.__free_slot(bucket)
+            if position != -1:
+                self.__write(position, entry)
+                return None
+        return entry
+
+    def __store(self, entry: tuple[K, V, int]) -> tuple[K, V, int] | None:
+        """
+        Stores an entry whose key is not in the table, using the stash if needed.
+        Returns the entry that could not be stored because the stash is full, or None.
+        :complexity: O(MAX_KICKS)
+        """
+        homeless = self.__place(entry)
+        if homeless is not None and self.__stash_count < self.STASH_SIZE:
+            self.__stash[self.__stash_count] = homeless
+            self.__stash_count += 1
+            return None
+        return homeless
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value at a certain key
+
+        :complexity: O(hash(key) + (2*BUCKET_SIZE + STASH_SIZE + C)*comp(K)),
+            where C is the number of chained keys with the same hash.
+        :raises KeyError: when the key doesn't exist.
+        """
+        key_hash = self.hash_function(key)
+        position = self.__find(key, key_hash)
+        if position != -1:
+            return self.__values[position]
+        i = self.__find_stash(key, key_hash)
+        if i != -1:
+            return self.__stash[i][1]
+        chain, i = self.__find_chain(key, key_hash)
+        if i != -1:
+            return chain[i][1]
+        raise KeyError(key)
+
+    def __contains__(self, key: K) -> bool:
+        """
+        Checks to see if the given key is in the Hash Table
+
+        :complexity: See __getitem__.
+        """
+        try:
+            _ = self[key]
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __setitem__(self, key: K, data: V) -> None:
+        """
+        Set an (key, value) pair in our hash table.
+
+        :complexity: O(hash(key) + MAX_KICKS) plus the lookup, O(N) when the
+            table is rebuilt, where N is the table size.
+            If both buckets of the key are full of keys with the same hash (modulo 2^64),
+            so that no table could place it there, it is chained instead.
+        """
+        key_hash = self.hash_function(key)
+        position = self.__find(key, key_hash)
+        if position != -1:
+            self.__values[position] = data
+            return
+        i = self.__find_stash(key, key_hash)
+        if i != -1:
+            self.__stash[i] = (key, data, key_hash)
+            return
+        chain, i = self.__find_chain(key, key_hash)
+        if i != -1:
+            chain[i] = (key, data, key_hash)
+            return
+
+        self.__length += 1
+        self.__modifications += 1
+        if self.__same_hash_count(key_hash) == 2 * self.BUCKET_SIZE:
+            if chain is None:
+                chain = []
+                self.__chains[key_hash & MASK_64] = chain
+            chain.append((key, data, key_hash))
+            self.__chained_count += 1
+            return
+        if self.__length - self.__chained_count > len(self.__keys) * self.MAX_LOAD:
+            self.__rehash(2 * self.bucket_count)
+        homeless = self.__store((key, data, key_hash))
+        if homeless is not None:
+            if self.__stash_count > self.STASH_SIZE:
+                # A rebuild already failed to place everything, wait for the next resize
+                self.__overflow(homeless)
+            else:
+                # Try new hash functions first, __rehash doubles the buckets if they fail
+                self.__rehash(self.bucket_count, homeless)
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Deletes a (key, value) pair in our hash table, then moves stashed entries
+        back into their buckets if there is room. Chained entries stay chained.
+
+        :complexity: See __getitem__.
+        :raises KeyError: when the key doesn't exist.
+        """
+        key_hash = self.hash_function(key)
+        position = self.__find(key, key_hash)
+        if position != -1:
+            self.__write(position, (None, None, None))
+            self.__unstash()
+        else:
+            i = self.__find_stash(key, key_hash)
+            if i != -1:
+                self.__stash_count -= 1
+                self.__stash[i] = self.__stash[self.__stash_count]
+                self.__stash[self.__stash_count] = None
+            else:
+                chain, i = self.__find_chain(key, key_hash)
+                if i == -1:
+                    raise KeyError(key)
+                chain[i] = chain[-1]
+                chain.pop()
+                if len(chain) == 0:
+                    del self.__chains[key_hash & MASK_64]
+                self.__chained_count -= 1
+        self.__length -= 1
+        self.__modifications += 1
+
+    def __unstash(self) -> None:
+        """
+        Moves stashed entries whose buckets have a free slot out of the stash.
+        :complexity: O(STASH_SIZE*BUCKET_SIZE)
+        """
+        i = 0
+        while i < self.__stash_count:
+            entry = self.__stash[i]
+            for bucket in self.__buckets(entry[2]):
+                position = self.__free_slot(bucket)
+                if position != -1:
+                    self.__write(position, entry)
+                    self.__stash_count -= 1
+                    self.__stash[i] = self.__stash[self.__stash_count]
+                    self.__stash[self.__stash_count] = None
+                    break
+            else:
+                i += 1
+
+    def reserve(self, count: int) -> None:
+        """
+        Grows the table once so that it holds count entries without resizing.
+        :complexity: O(1) if the table is large enough, see __rehash otherwise.
+        """
+        bucket_count = self.bucket_count
+        count -= self.__chained_count
+        while count > bucket_count * self.BUCKET_SIZE * self.MAX_LOAD:
+            bucket_count *= 2
+        if bucket_count != self.bucket_count:
+            self.__rehash(bucket_count)
+
+    def __rehash(self, bucket_count: int, extra: tuple[K, V, int] | None = None) -> None:
+        """
+        Rebuilds the table with the given number of buckets and new hash functions,
+        adding the extra entry if given. If the entries do not fit, the buckets are
+        doubled once, then other seeds are tried, MAX_REBUILDS attempts in all.
+        After that, the entries left without a slot overflow the stash, so nothing
+        is lost and lookups stay correct (if slower). Keys are not hashed again.
+        Chained entries do not depend on the buckets and stay where they are.
+        :complexity: O(N) expected, where N is the table size.
+        """
+        entries = list(self.__entries(chained=False))
+        if extra is not None:
+            entries.append(extra)
+        self.__modifications += 1
+
+        for attempt in range(self.MAX_REBUILDS):
+            self.__seed += 1
+            self.__allocate(bucket_count)
+            for stored in range(len(entries)):
+                homeless = self.__store(entries[stored])
+                if homeless is not None:
+                    break
+            else:
+                return
+            if attempt == 0:
+                bucket_count *= 2
+
+        # Keep the last attempt's table and push what does not fit into the stash.
+        self.__overflow(homeless)
+        for entry in entries[stored + 1:]:
+            homeless = self.__store(entry)
+            if homeless is not None:
+                self.__overflow(homeless)
+
+    def __overflow(self, entry: tuple[K, V, int]) -> None:
+        """
+        Appends the entry to the stash, enlarging it past STASH_SIZE if it is full.
+        :complexity: O(S) where S is the stash size.
+        """
+        if self.__stash_count == len(self.__stash):
+            stash = ArrayR(len(self.__stash) + self.STASH_SIZE)
+            for i in range(self.__stash_count):
+                stash[i] = self.__stash[i]
+            self.__stash = stash
+        self.__stash[self.__stash_count] = entry
+        self.__stash_count += 1
+
+    def __entries(self, chained: bool = True) -> Iterator[tuple[K, V, int]]:
+        """
+        Yields every (key, value, key_hash) entry in the slots and the stash,
+        then in the overflow chains if chained is True.
+        :complexity: O(N) where N is the table size.
+        """
+        for key, value, key_hash in zip(self.__keys.to_list(), self.__values.to_list(), self.__hashes.to_list()):
+            if key is not None:
+                yield key, value, key_hash
+        for i in range(self.__stash_count):
+            yield self.__stash[i]
+        if chained and self.__chained_count > 0:
+            for chain in self.__chains.values():
+                yield from chain
+
+    def items(self, check: bool = True) -> Iterator[tuple[K, V]]:
+        """
+        Yields each (key, value) pair straight from the slot arrays, the stash
+        and the overflow chains, using constant extra memory.
+
+        :complexity: O(N) over the whole iteration, where N is the table size.
+        :raises RuntimeError: if check is True and a key is inserted or deleted,
+            or the table rebuilt, during iteration.
+        """
+        modifications = self.__modifications
+        keys, values = self.__keys, self.__values
+        for position in range(len(keys)):
+            key = keys[position]
+            if key is not None:
+                yield key, values[position]
+                if check and self.__modifications != modifications:
+                    raise RuntimeError("Hash table modified during iteration")
+        stash = self.__stash
+        for i in range(self.__stash_count):
+            yield stash[i][0], stash[i][1]
+            if check and self.__modifications != modifications:
+                raise RuntimeError("Hash table modified during iteration")
+        if self.__chained_count > 0:
+            for _, chain in self.__chains.items(check):
+                for entry in chain:
+                    yield entry[0], entry[1]
+                    if check and self.__modifications != modifications:
+                        raise RuntimeError("Hash table modified during iteration")
+
+    def keys(self) -> ArrayR[K]:
+        """
+        Returns all keys in the hash table.
+
+        :complexity: O(N) where N is the table size.
+        """
+        res = ArrayR(self.__length)
+        i = 0
+        for entry in self.__entries():
+            res[i] = entry[0]
+            i += 1
+        return res
+
+    def values(self) -> ArrayR[V]:
+        """
+        Returns all values in the hash table.
+
+        :complexity: O(N) where N is the table size.
+        """
+        res = ArrayR(self.__length)
+        i = 0
+        for entry in self.__entries():
+            res[i] = entry[1]
+            i += 1
+        return res
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table (no particular
+        order).
+        :complexity: O(N * (str(key) + str(value))) where N is the table size
+        """
+        result = ""
+        for key, value, _ in self.__entries():
+            result += "(" + str(key) + "," + str(value) + ")\n"
+        return result
@@ -1,50 +1,115 @@
 from __future__ import annotations
-from typing import TypeVar
-from data_structures.abstract_hash_table import HashTable
+import time
+from typing import Callable, Iterable, Iterator, TypeVar
+from data_structures.abstract_hash_table import HashTable, _to_array
+from data_structures.hash_functions import key_hash, next_prime
+from data_structures.hash_table_mapped import MappedProbeTable
+from data_structures.hash_table_stats import HashTableStats
 from data_structures.referential_array import ArrayR
 
+K = TypeVar('K')
 V = TypeVar('V')
 
+# Marks a slot whose entry was deleted in tombstone mode.
+DELETED = object()
 
-class LinearProbeTable(HashTable[str, V]):
+
+class LinearProbeTable(HashTable[K, V]):
     """
     Linear Probe Table.
     Defines a Hash Table using Linear Probing for conflict resolution.
-    If you want to use this with a different key type, you should override the hash function.
-    
+    Keys are hashed with key_hash by default, so strings, integers, floats and
+    tuples of them can be used directly (1 and 1.0 are the same key, as in a dict).
+    For other key types, pass a suitable hash_function.
+
+    Slots are stored as three parallel arrays: keys, values and key hashes, so a
+    write allocates no entry object and a probe only touches the keys and hashes.
+    A slot is empty if its key is None and deleted if its key is DELETED.
+    The key hash is the full, table-size independent hash of the key. It is
+    computed once per insert/lookup and reused when resizing or moving clusters,
+    and compared before the keys to reject most collisions cheaply.
+
+    With tombstones=True, deleting marks the slot as DELETED instead of
+    re-inserting the rest of the cluster. Later inserts reuse deleted slots, and
+    the table is rebuilt once the tombstones exceed TOMBSTONE_THRESHOLD of it.
+
+    With incremental=True, resizing does not move every entry at once. The old
+    arrays are kept next to the new ones and each later operation migrates at most
+    MIGRATION_STEP of their slots, so no single operation pays for the whole resize.
+    Until the migration is done, lookups check both.
+
+    items(), iter_keys() and iter_values() read the slots in place. Every insert
+    of a new key, delete and resize counts as a modification, which the iterators
+    detect through a counter.
+
+    stats() reports probe lengths, cluster sizes and the load factor, computed from
+    the cached hashes when it is called, and the number of rehashes. With
+    track_stats=True, the time spent rehashing (and migrating) is measured too.
+
     Type Arguments:
+        - K:    Key Type.
         - V:    Value Type.
 
     Unless stated otherwise, all methods have O(1) complexity.
     """
 
-    # No test case should exceed 1 million entries.
+    # Precomputed sizes, the table keeps growing through primes of about
+    # twice the size once these run out.
     TABLE_SIZES = [5, 13, 29, 53, 97, 193, 389, 769, 1543, 3079, 6151, 12289, 24593, 49157, 98317, 196613, 393241, 786433, 1572869]
-    HASH_BASE = 31
 
-    def __init__(self, sizes = None) -> None:
+    # Fraction of the table that may hold tombstones before it is cleaned up.
+    TOMBSTONE_THRESHOLD = 0.25
+
+    # Number of old slots migrated per operation while resizing incrementally.
+    MIGRATION_STEP = 4
+
+    def __init__(self, sizes = None, hash_function: Callable[[K], int] = key_hash,
+                 tombstones: bool = False, incremental: bool = False, expected_size: int = 0,
+                 track_stats: bool = False) -> None:
+        """
+        :param sizes: table sizes to grow through, defaults to TABLE_SIZES.
+        :param hash_function: maps a key to an integer independent of the table size,
+            e.g. key_hash (default, stable), universal_hash (strings only) or builtin_hash
+            (fast, uses the cached str hash).
+        :param tombstones: delete by marking slots instead of re-inserting the cluster.
+        :param incremental: spread the cost of resizing over later operations.
+        :param expected_size: number of entries the table should hold without resizing.
+        :param track_stats: measure the time spent rehashing, see stats().
+        """
         if sizes is not None:
             self.TABLE_SIZES = sizes
 
+        self.hash_function = hash_function
+        self.tombstones = tombstones
+        self.incremental = incremental
+        self.track_stats = track_stats
         self.__size_index = 0
-        self.__array: ArrayR[tuple[str, V]] = ArrayR(self.TABLE_SIZES[self.__size_index])
+        size = self.TABLE_SIZES[self.__size_index]
+        while expected_size > size / 2:
+            size = self.__grow_size(size)
+        self.__keys: ArrayR[K] = ArrayR(size)
+        self.__values: ArrayR[V] = ArrayR(size)
+        self.__hashes: ArrayR[int] = ArrayR(size)
         self.__length = 0
-
-    def hash(self, key: str) -> int:
+        self.__deleted = 0
+        self.__old_keys: ArrayR[K] | None = None
+        self.__old_values: ArrayR[V] | None = None
+        self.__old_hashes: ArrayR[int] | None = None
+        self.__migrate_index = 0
+        self.__modifications = 0
+        self.__rehash_count = 0
+        self.__rehash_time = 0.0
+
+    def hash(self, key: K) -> int:
         """
         Hash a key for insert/retrieve/update into the hashtable.
-        :complexity: O(len(key))
+        :complexity: O(hash_function(key))
         """
-        value = 0
-        a = 31415
-        for char in key:
-            value = (ord(char) + a * value) % self.table_size
-            a = a * self.HASH_BASE % (self.table_size - 1)
-        return value
+        return self.hash_function(key) % self.table_size
 
     @property
     def table_size(self) -> int:
-        return len(self.__array)
+        return len(self.__keys)
 
     def __len__(self) -> int:
         """
@@ -52,64 +117,277 @@ class LinearProbeTable(HashTable[str, V]):
         """
         return self.__length
 
-    def __linear_probe(self, key: str, is_insert: bool) -> int:
+    def __linear_probe(self, key: K, key_hash: int, is_insert: bool) -> int:
         """
         Find the correct position for this key in the hash table using linear probing.
-        :complexity best: O(hash(key)) first position is empty
-        :complexity worst: O(hash(key) + N*comp(str)) when we've searched the entire table
+        When inserting a new key, the first deleted slot on the way is reused.
+        :complexity best: O(1) first position is empty
+        :complexity worst: O(N*comp(K)) when we've searched the entire table
                         where N is the tablesize
         :raises KeyError: When the key is not in the table, but is_insert is False.
-        :raises FullError: When a table is full and cannot be inserted.
+        :raises RuntimeError: When a table is full and cannot be inserted.
         """
+        keys = self.__keys
+        hashes = self.__hashes
+        size = len(keys)
+
         # Initial position
-        position = self.hash(key)
+        position = key_hash % size
+        first_deleted = -1
 
-        for _ in range(self.table_size):
-            if self.__array[position] is None:
+        for _ in range(size):
+            slot_key = keys[position]
+            if slot_key is None:
                 # Empty spot. Am I upserting or retrieving?
                 if is_insert:
-                    return position
+                    return position if first_deleted == -1 else first_deleted
                 else:
                     raise KeyError(key)
-            elif self.__array[position][0] == key:
+            elif slot_key is DELETED:
+                # Deleted spot. Keep probing, the key may be further on.
+                if first_deleted == -1:
+                    first_deleted = position
+            elif hashes[position] == key_hash and slot_key == key:
                 return position
-            else:
-                # Taken by something else. Time to linear probe.
-                position = (position + 1) % self.table_size
+            # Taken by something else. Time to linear probe.
+            position = (position + 1) % size
 
-        if is_insert:
+        if is_insert and first_deleted != -1:
+            return first_deleted
+        elif is_insert:
             raise RuntimeError("Table is full!")
         else:
             raise KeyError(key)
 
-    def keys(self) -> ArrayR[str]:
+    def __find_old(self, key: K, key_hash: int) -> int:
+        """
+        Find the position of this key in the arrays being migrated, or -1 if it is not there.
+        Migrated and deleted slots are marked DELETED so that probe chains stay intact.
+        :complexity best: O(1) first position is empty
+        :complexity worst: O(N*comp(K)) where N is the size of the old arrays
+        """
+        keys = self.__old_keys
+        hashes = self.__old_hashes
+        size = len(keys)
+        position = key_hash % size
+        for _ in range(size):
+            slot_key = keys[position]
+            if slot_key is None:
+                return -1
+            elif slot_key is not DELETED and hashes[position] == key_hash and slot_key == key:
+                return position
+            position = (position + 1) % size
+        return -1
+
+    def __remove_old(self, position: int) -> None:
+        """
+        Marks a slot of the arrays being migrated as deleted.
+        """
+        self.__old_keys[position] = DELETED
+        self.__old_values[position] = None
+        self.__old_hashes[position] = None
+
+    def __migrate(self, steps: int) -> None:
+        """
+        Move the entries of up to `steps` slots of the old arrays into the current ones.
+        :complexity: O(steps) expected, keys are not hashed again.
+        """
+        if self.track_stats:
+            start = time.perf_counter()
+        old_keys = self.__old_keys
+        end = min(self.__migrate_index + steps, len(old_keys))
+        for x in range(self.__migrate_index, end):
+            key = old_keys[x]
+            if key is not None and key is not DELETED:
+                key_hash = self.__old_hashes[x]
+                position = self.__linear_probe(key, key_hash, True)
+                if self.__keys[position] is DELETED:
+                    self.__deleted -= 1
+                self.__keys[position] = key
+                self.__values[position] = self.__old_values[x]
+                self.__hashes[position] = key_hash
+                self.__remove_old(x)
+        self.__migrate_index = end
+        if end == len(old_keys):
+            self.__old_keys = None
+            self.__old_values = None
+            self.__old_hashes = None
+        if self.track_stats:
+            self.__rehash_time += time.perf_counter() - start
+
+    def __entries(self):
+        """
+        Yields every (key, value, key_hash) entry in the table, including those not yet migrated.
+        :complexity: O(N) where N is the table size.
+        """
+        for key, value, key_hash in zip(self.__keys.to_list(), self.__values.to_list(), self.__hashes.to_list()):
+            if key is not None and key is not DELETED:
+                yield key, value, key_hash
+        if self.__old_keys is not None:
+            for x in range(self.__migrate_index, len(self.__old_keys)):
+                key = self.__old_keys[x]
+                if key is not None and key is not DELETED:
+                    yield key, self.__old_values[x], self.__old_hashes[x]
+
+    def items(self, check: bool = True) -> Iterator[tuple[K, V]]:
+        """
+        Yields each (key, value) pair straight from the slot arrays, using constant
+        extra memory. Any pending migration is finished first, so lookups made while
+        iterating do not move entries.
+
+        :complexity: O(N) over the whole iteration, where N is the table size.
+        :raises RuntimeError: if check is True and a key is inserted or deleted,
+            or the table resized, during iteration.
+        """
+        if self.__old_keys is not None:
+            self.__migrate(len(self.__old_keys))
+        modifications = self.__modifications
+        keys, values = self.__keys, self.__values
+        for x in range(len(keys)):
+            key = keys[x]
+            if key is not None and key is not DELETED:
+                yield key, values[x]
+                if check and self.__modifications != modifications:
+                    raise RuntimeError("Hash table modified during iteration")
+
+    def save(self, path: str, allow_pickle: bool = False) -> None:
+        """
+        Writes the table to path in the MappedProbeTable format, which can be
+        opened read-only in O(1) with MappedProbeTable.open(path).
+        Keys must be strings and values str, bytes or int; other values are
+        pickled with allow_pickle, see MappedProbeTable for the trust that needs.
+        The slots are laid out again with universal_hash, whatever this table's hash function is.
+
+        :complexity: See MappedProbeTable.write.
+        :raises TypeError: if a key is not a string, or a value cannot be encoded.
+        """
+        MappedProbeTable.write(path, self.items(), len(self), allow_pickle)
+
+    def keys(self) -> ArrayR[K]:
         """
         Returns all keys in the hash table.
-        :complexity: O(N) where N is the number of items in the table.
+        The key array is copied in bulk and filtered, without touching values or hashes.
+
+        :complexity: O(N) where N is the table size.
         """
         res = ArrayR(self.__length)
         i = 0
-        for x in range(self.table_size):
-            if self.__array[x] is not None:
-                res[i] = self.__array[x][0]
+        for key in self.__keys.to_list():
+            if key is not None and key is not DELETED:
+                res[i] = key
                 i += 1
+        if self.__old_keys is not None:
+            for x in range(self.__migrate_index, len(self.__old_keys)):
+                key = self.__old_keys[x]
+                if key is not None and key is not DELETED:
+                    res[i] = key
+                    i += 1
         return res
 
     def values(self) -> ArrayR[V]:
         """
         Returns all values in the hash table.
 
-        :complexity: O(N) where N is the number of items in the table.
+        :complexity: O(N) where N is the table size.
         """
         res = ArrayR(self.__length)
         i = 0
-        for x in range(self.table_size):
-            if self.__array[x] is not None:
-                res[i] = self.__array[x][1]
+        for key, value in zip(self.__keys.to_list(), self.__values.to_list()):
+            if key is not None and key is not DELETED:
+                res[i] = value
                 i += 1
+        if self.__old_keys is not None:
+            for x in range(self.__migrate_index, len(self.__old_keys)):
+                key = self.__old_keys[x]
+                if key is not None and key is not DELETED:
+                    res[i] = self.__old_values[x]
+                    i += 1
         return res
 
-    def __contains__(self, key: str) -> bool:
+    def reserve(self, count: int) -> None:
+        """
+        Grows the table once so that it holds count entries without resizing.
+        The resize is done in full, even in incremental mode.
+
+        :complexity: O(1) if the table is large enough, see __resize otherwise.
+        """
+        new_size = self.table_size
+        while count > new_size / 2:
+            new_size = self.__grow_size(new_size)
+        if new_size != self.table_size:
+            self.__resize(new_size, incremental=False)
+
+    def update(self, items: Iterable[tuple[K, V]]) -> None:
+        """
+        Inserts every (key, value) pair, later pairs overwriting earlier ones.
+        The table is sized once if the number of pairs is known, and any growth
+        needed on the way is done in full. The pairs are written directly, without
+        going through __setitem__.
+
+        :complexity: O(N) linear probes, where N is the number of pairs.
+        """
+        if hasattr(items, '__len__'):
+            self.reserve(len(self) + len(items))
+        if self.__old_keys is not None:
+            self.__migrate(len(self.__old_keys))
+
+        hash_function = self.hash_function
+        keys, values, hashes = self.__keys, self.__values, self.__hashes
+        for key, data in items:
+            key_hash = hash_function(key)
+            position = self.__linear_probe(key, key_hash, True)
+            slot_key = keys[position]
+            if slot_key is None or slot_key is DELETED:
+                if slot_key is DELETED:
+                    self.__deleted -= 1
+                self.__length += 1
+                self.__modifications += 1
+                keys[position] = key
+                hashes[position] = key_hash
+            values[position] = data
+
+            if self.__length > len(keys) / 2:
+                self.__resize(self.__grow_size(len(keys)), incremental=False)
+                keys, values, hashes = self.__keys, self.__values, self.__hashes
+
+    def get_many(self, keys: Iterable[K]) -> ArrayR[V]:
+        """
+        Returns the values of the given keys, in order.
+
+        :complexity: O(N) linear probes, where N is the number of keys.
+        :raises KeyError: when one of the keys doesn't exist.
+        """
+        if self.__old_keys is not None:
+            return super().get_many(keys)
+
+        hash_function = self.hash_function
+        values = self.__values
+        res = []
+        for key in keys:
+            res.append(values[self.__linear_probe(key, hash_function(key), False)])
+        return _to_array(res)
+
+    def contains_many(self, keys: Iterable[K]) -> ArrayR[bool]:
+        """
+        Returns, for each of the given keys in order, whether it is in the table.
+
+        :complexity: O(N) linear probes, where N is the number of keys.
+        """
+        if self.__old_keys is not None:
+            return super().contains_many(keys)
+
+        hash_function = self.hash_function
+        res = []
+        for key in keys:
+            try:
+                self.__linear_probe(key, hash_function(key), False)
+            except KeyError:
+                res.append(False)
+            else:
+                res.append(True)
+        return _to_array(res)
+
+    def __contains__(self, key: K) -> bool:
         """
         Checks to see if the given key is in the Hash Table
 
@@ -122,78 +400,228 @@ class LinearProbeTable(HashTable[str, V]):
         else:
             return True
 
-    def __getitem__(self, key: str) -> V:
+    def __getitem__(self, key: K) -> V:
         """
         Get the value at a certain key
 
         :complexity: See linear probe.
         :raises KeyError: when the key doesn't exist.
         """
-        position = self.__linear_probe(key, False)
-        return self.__array[position][1]
-
-    def __setitem__(self, key: str, data: V) -> None:
+        key_hash = self.hash_function(key)
+        if self.__old_keys is not None:
+            self.__migrate(self.MIGRATION_STEP)
+            if self.__old_keys is not None:
+                position = self.__find_old(key, key_hash)
+                if position != -1:
+                    return self.__old_values[position]
+        position = self.__linear_probe(key, key_hash, False)
+        return self.__values[position]
+
+    def __setitem__(self, key: K, data: V) -> None:
         """
         Set an (key, value) pair in our hash table.
 
         :complexity: See linear probe.
-        :raises FullError: when the table cannot be resized further.
         """
-
-        position = self.__linear_probe(key, True)
-
-        if self.__array[position] is None:
+        key_hash = self.hash_function(key)
+        if self.__old_keys is not None:
+            self.__migrate(self.MIGRATION_STEP)
+            if self.__old_keys is not None:
+                position = self.__find_old(key, key_hash)
+                if position != -1:
+                    # Move the key over now, the new arrays take the updated value.
+                    self.__remove_old(position)
+                    self.__length -= 1
+
+        position = self.__linear_probe(key, key_hash, True)
+
+        slot_key = self.__keys[position]
+        if slot_key is None or slot_key is DELETED:
+            if slot_key is DELETED:
+                self.__deleted -= 1
             self.__length += 1
-
-        self.__array[position] = (key, data)
+            self.__modifications += 1
+            self.__keys[position] = key
+            self.__hashes[position] = key_hash
+        self.__values[position] = data
 
         if len(self) > self.table_size / 2:
             self.__rehash()
 
-    def __delitem__(self, key: str) -> None:
+    def __delitem__(self, key: K) -> None:
         """
         Deletes a (key, value) pair in our hash table.
 
         :complexity best: O(hash(key)) deleting item is not probed and in correct spot.
-        :complexity worst: O(N*hash(key)+N^2*comp(str)) deleting item is midway through large chain.
+        :complexity worst: O(hash(key)+N^2*comp(K)) deleting item is midway through large chain.
+            Keys moved within the cluster are not hashed again.
+            In tombstone mode, this is O(hash(key)+N*comp(K)), amortised O(hash(key)) expected.
         :raises KeyError: when the key doesn't exist.
         """
-        position = self.__linear_probe(key, False)
-        # Remove the element
-        self.__array[position] = None
+        key_hash = self.hash_function(key)
+        if self.__old_keys is not None:
+            self.__migrate(self.MIGRATION_STEP)
+            if self.__old_keys is not None:
+                position = self.__find_old(key, key_hash)
+                if position != -1:
+                    self.__remove_old(position)
+                    self.__length -= 1
+                    self.__modifications += 1
+                    return
+
+        position = self.__linear_probe(key, key_hash, False)
+        self.__values[position] = None
+        self.__hashes[position] = None
         self.__length -= 1
+        self.__modifications += 1
+        if self.tombstones:
+            self.__keys[position] = DELETED
+            self.__deleted += 1
+            if self.__deleted > self.table_size * self.TOMBSTONE_THRESHOLD:
+                # Too many tombstones lengthen probes, rebuild at the same size.
+                self.__resize(self.table_size)
+            return
+
+        # Remove the element
+        self.__keys[position] = None
         # Start moving over the cluster
         position = (position + 1) % self.table_size
-        while self.__array[position] is not None:
-            key2, value = self.__array[position]
-            self.__array[position] = None
-            # Reinsert.
-            newpos = self.__linear_probe(key2, True)
-            self.__array[newpos] = (key2, value)
+        while self.__keys[position] is not None:
+            key2 = self.__keys[position]
+            value = self.__values[position]
+            key_hash2 = self.__hashes[position]
+            self.__keys[position] = None
+            # Reinsert using the cached hash.
+            newpos = self.__linear_probe(key2, key_hash2, True)
+            self.__keys[newpos] = key2
+            self.__values[newpos] = value
+            self.__hashes[newpos] = key_hash2
             position = (position + 1) % self.table_size
 
     def is_empty(self) -> bool:
         return self.__length == 0
 
+    def __grow_size(self, size: int) -> int:
+        """
+        Returns the table size to grow to from the given size.
+        :complexity: O(1) within TABLE_SIZES, see next_prime otherwise.
+        """
+        self.__size_index += 1
+        if self.__size_index < len(self.TABLE_SIZES):
+            return self.TABLE_SIZES[self.__size_index]
+        return next_prime(2 * size + 1)
+
     def __rehash(self) -> None:
         """
         Need to resize table and reinsert all values
 
-        :complexity best: O(N*hash(K)) No probing.
-        :complexity worst: O(N*hash(K) + N^2*comp(K)) Lots of probing.
-        Where N is len(self)
+        :complexity: See __resize.
         """
-        old_array = self.__array
-        self.__size_index += 1
-        if self.__size_index == len(self.TABLE_SIZES):
-            # Cannot be resized further.
-            return
-        self.__array = ArrayR(self.TABLE_SIZES[self.__size_index])
-        self.__length = 0
-        for item in old_array:
-            if item is not None:
-                key, value = item
-                self[key] = value
+        self.__resize(self.__grow_size(self.table_size))
+
+    def __resize(self, new_size: int, incremental: bool | None = None) -> None:
+        """
+        Reinsert all values into new arrays of the given size, dropping tombstones.
+        If incremental (defaults to the table's mode), only swaps in the new arrays and
+        leaves the values to __migrate.
+
+        :complexity best: O(N) No probing.
+        :complexity worst: O(N^2*comp(K)) Lots of probing.
+        Where N is the table size. Keys are not hashed again.
+        In incremental mode, O(new_size) to allocate the arrays, plus finishing any
+        previous migration (which the migration step makes unlikely).
+        """
+        if incremental is None:
+            incremental = self.incremental
+        if self.__old_keys is not None:
+            self.__migrate(len(self.__old_keys))
+        if self.track_stats:
+            start = time.perf_counter()
+
+        old_keys = self.__keys
+        old_values = self.__values
+        old_hashes = self.__hashes
+        self.__deleted = 0
+        self.__modifications += 1
+        self.__rehash_count += 1
+
+        if incremental:
+            self.__keys = ArrayR(new_size)
+            self.__values = ArrayR(new_size)
+            self.__hashes = ArrayR(new_size)
+            self.__old_keys = old_keys
+            self.__old_values = old_values
+            self.__old_hashes = old_hashes
+            self.__migrate_index = 0
+        else:
+            # Lay the entries out in plain lists and copy them into the arrays in bulk.
+            # Keys are unique and there are no tombstones yet, so the first free slot is the one.
+            new_keys = [None] * new_size
+            new_values = [None] * new_size
+            new_hashes = [None] * new_size
+            for key, value, key_hash in zip(old_keys.to_list(), old_values.to_list(), old_hashes.to_list()):
+                if key is not None and key is not DELETED:
+                    position = key_hash % new_size
+                    while new_keys[position] is not None:
+                        position = (position + 1) % new_size
+                    new_keys[position] = key
+                    new_values[position] = value
+                    new_hashes[position] = key_hash
+            self.__keys = ArrayR.from_list(new_keys)
+            self.__values = ArrayR.from_list(new_values)
+            self.__hashes = ArrayR.from_list(new_hashes)
+
+        if self.track_stats:
+            self.__rehash_time += time.perf_counter() - start
+
+    def stats(self) -> HashTableStats:
+        """
+        Returns the current probe length histogram, longest cluster and load factor,
+        along with the rehash count (and time, if track_stats is set).
+        The probe length of an entry is its distance from its home position.
+        A cluster is a run of occupied (or deleted) slots, which every probe
+        starting in it has to walk. During an incremental resize, the entries
+        not migrated yet are measured where they are, in the old arrays, and the
+        table is left as it is.
+
+        :complexity: O(N) where N is the table size (plus the old one while migrating).
+        """
+        probe_lengths, max_run = self.__probe_stats(self.__keys, self.__hashes)
+        if self.__old_keys is not None:
+            old_probe_lengths, old_max_run = self.__probe_stats(self.__old_keys, self.__old_hashes)
+            probe_lengths += old_probe_lengths
+            max_run = max(max_run, old_max_run)
+
+        return HashTableStats(self.__length, self.table_size, HashTableStats.histogram(probe_lengths), max_run,
+                              self.__rehash_count, self.__rehash_time if self.track_stats else None)
+
+    @staticmethod
+    def __probe_stats(keys: ArrayR[K], hashes: ArrayR[int]) -> tuple[list[int], int]:
+        """
+        Returns the probe length of every entry in the given slot arrays, and their longest cluster.
+        :complexity: O(N) where N is the size of the arrays.
+        """
+        keys = keys.to_list()
+        size = len(keys)
+        probe_lengths = []
+        for position, (key, key_hash) in enumerate(zip(keys, hashes.to_list())):
+            if key is not None and key is not DELETED:
+                probe_lengths.append((position - key_hash % size) % size)
+
+        max_run = 0
+        run = 0
+        leading_run = -1
+        for key in keys:
+            if key is None:
+                if leading_run == -1:
+                    leading_run = run
+                max_run = max(max_run, run)
+                run = 0
+            else:
+                run += 1
+        # A cluster may wrap around the end of the table.
+        max_run = max(max_run, size if leading_run == -1 else run + leading_run)
+        return probe_lengths, max_run
 
     def __str__(self) -> str:
         """
@@ -202,8 +630,7 @@ class LinearProbeTable(HashTable[str, V]):
         :complexity: O(N * (str(key) + str(value))) where N is the table size
         """
         result = ""
-        for item in self.__array:
-            if item is not None:
-                (key, value) = item
-                result += "(" + str(key) + "," + str(value) + ")\n"
+        for item in self.__entries():
+            (key, value, _) = item
+            result += "(" + str(key) + "," + str(value) + ")\n"
         return result
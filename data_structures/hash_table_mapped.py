@@ -0,0 +1,294 @@
+""" Memory-mapped Probe Table.
+
+Defines a read-only hash table stored in a binary file and read through mmap,
+so opening it costs O(1) and processes that open the same file share its pages.
+
+File layout (all integers little endian):
+    header:  magic b'LPT1', format version (u32), slot count (u64), number of entries (u64)
+    slots:   slot count fixed size slots of key hash (u64), key offset (u64), key length (u32),
+             value offset (u64), value length (u32). Empty slots have key offset EMPTY.
+    heap:    the UTF-8 encoded keys and encoded values the slots point to.
+
+A value is encoded as a one byte tag followed by its payload: b's' and UTF-8 for
+str, b'b' and the raw bytes for bytes, b'i' and signed little endian bytes for int.
+Any other value needs allow_pickle, which stores it under b'p' as a pickle.
+Unpickling runs arbitrary code, so only open files with allow_pickle=True if
+every process that can write them is trusted.
+
+Slots are filled by linear probing on universal_hash, which is stable across
+processes, at a load factor of at most 1/2.
+"""
+from __future__ import annotations
+
+import mmap
+import pickle
+import struct
+from typing import Iterable, Iterator, TypeVar
+
+from data_structures.abstract_hash_table import HashTable
+from data_structures.hash_functions import next_prime, universal_hash
+from data_structures.referential_array import ArrayR
+
+V = TypeVar('V')
+
+
+class MappedProbeTable(HashTable[str, V]):
+    """
+    Memory-mapped Probe Table.
+
+    Write one with LinearProbeTable.save(path) (or MappedProbeTable.write) and
+    open it with MappedProbeTable.open(path). Lookups read the slots and heap
+    straight from the mapping, values are decoded on every access.
+    The table is read-only: setting or deleting raises TypeError.
+
+    Type Arguments:
+        - V:    Value Type. str, bytes or int, or anything picklable with allow_pickle.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    MAGIC = b'LPT1'
+    VERSION = 2
+    HEADER = struct.Struct('<4sIQQ')
+    SLOT = struct.Struct('<QQIQI')
+    EMPTY = (1 << 64) - 1
+
+    STR, BYTES, INT, PICKLE = b's', b'b', b'i', b'p'
+
+    def __init__(self, mapping: mmap.mmap, allow_pickle: bool = False) -> None:
+        """
+        Use open() rather than calling this directly.
+        :raises ValueError: if the mapping does not hold a table in this format.
+        """
+        if len(mapping) < self.HEADER.size:
+            raise ValueError("Not a mapped probe table.")
+        magic, version, slot_count, length = self.HEADER.unpack_from(mapping, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError("Not a mapped probe table, or an unsupported version.")
+
+        self.__mapping = mapping
+        self.__slot_count = slot_count
+        self.__length = length
+        self.__allow_pickle = allow_pickle
+
+    @classmethod
+    def open(cls, path: str, allow_pickle: bool = False) -> MappedProbeTable[V]:
+        """
+        Maps the file at path read-only. Nothing but the header is read.
+        Pickled values can only be read with allow_pickle, and unpickling runs
+        arbitrary code: only allow it for files no untrusted process can write.
+        :raises ValueError: if the file does not hold a table in this format.
+        """
+        with open(path, 'rb') as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapping, allow_pickle)
+
+    @classmethod
+    def encode_value(cls, value: V, allow_pickle: bool = False) -> bytes:
+        """
+        Encodes value as its tag followed by its payload.
+        :raises TypeError: if value is not a str, bytes or int and allow_pickle is not set.
+        """
+        if type(value) is str:
+            return cls.STR + value.encode('utf-8')
+        elif type(value) is bytes:
+            return cls.BYTES + value
+        elif type(value) is int:
+            return cls.INT + value.to_bytes(value.bit_length() // 8 + 1, 'little', signed=True)
+        elif allow_pickle:
+            return cls.PICKLE + pickle.dumps(value)
+        raise TypeError("MappedProbeTable values must be str, bytes or int, unless allow_pickle is set.")
+
+    @classmethod
+    def write(cls, path: str, items: Iterable[tuple[str, V]], length: int, allow_pickle: bool = False) -> None:
+        """
+        Writes the (key, value) pairs in items to the file at path, where length
+        is an upper bound on the number of distinct keys. A repeated key keeps its last value.
+        With allow_pickle, values other than str, bytes and int are pickled.
+        :complexity: O(N*hash(key) + total size of the encoded values) expected,
+            where N is the number of pairs in items.
+        :raises TypeError: if a key is not a string, or a value cannot be encoded.
+        :raises ValueError: if items holds more than length distinct keys.
+        """
+        slot_count = next_prime(2 * length + 1)
+        slots = [None] * slot_count
+        count = 0
+
+        for key, value in items:
+            if type(key) is not str:
+                raise TypeError("MappedProbeTable keys must be strings.")
+            key_bytes = key.encode('utf-8')
+            value_bytes = cls.encode_value(value, allow_pickle)
+            key_hash = universal_hash(key)
+            position = key_hash % slot_count
+            while slots[position] is not None and slots[position][1] != key_bytes:
+                position = (position + 1) % slot_count
+            if slots[position] is None:
+                count += 1
+                if count > length:
+                    raise ValueError("More than " + str(length) + " distinct keys given.")
+            slots[position] = (key_hash, key_bytes, value_bytes)
+
+        heap_start = cls.HEADER.size + slot_count * cls.SLOT.size
+        heap = bytearray()
+        packed = []
+        empty = cls.SLOT.pack(0, cls.EMPTY, 0, 0, 0)
+        for slot in slots:
+            if slot is None:
+                packed.append(empty)
+            else:
+                key_hash, key_bytes, value_bytes = slot
+                key_offset = heap_start + len(heap)
+                value_offset = key_offset + len(key_bytes)
+                packed.append(cls.SLOT.pack(key_hash, key_offset, len(key_bytes), value_offset, len(value_bytes)))
+                heap += key_bytes
+                heap += value_bytes
+
+        with open(path, 'wb') as file:
+            file.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, slot_count, count))
+            file.write(b''.join(packed))
+            file.write(heap)
+
+    def close(self) -> None:
+        """ Unmaps the file. The table cannot be used afterwards. """
+        self.__mapping.close()
+
+    def __enter__(self) -> MappedProbeTable[V]:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def table_size(self) -> int:
+        return self.__slot_count
+
+    def __len__(self) -> int:
+        """
+        Returns the number of elements in the hash table
+        """
+        return self.__length
+
+    def is_empty(self) -> bool:
+        return self.__length == 0
+
+    def __slot(self, position: int) -> tuple[int, int, int, int, int]:
+        """ Reads the slot at position from the mapping. """
+        return self.SLOT.unpack_from(self.__mapping, self.HEADER.size + position * self.SLOT.size)
+
+    def __find(self, key: str) -> tuple[int, int, int, int, int]:
+        """
+        Find the slot of this key by linear probing the mapping.
+        :complexity best: O(hash(key)) first position is empty
+        :complexity worst: O(hash(key) + N*comp(str)) where N is the number of slots
+        :raises KeyError: When the key is not in the table.
+        """
+        key_hash = universal_hash(key)
+        key_bytes = None
+        position = key_hash % self.__slot_count
+        for _ in range(self.__slot_count):
+            slot = self.__slot(position)
+            if slot[1] == self.EMPTY:
+                break
+            elif slot[0] == key_hash:
+                if key_bytes is None:
+                    key_bytes = key.encode('utf-8')
+                if slot[2] == len(key_bytes) and self.__mapping[slot[1]:slot[1] + slot[2]] == key_bytes:
+                    return slot
+            position = (position + 1) % self.__slot_count
+        raise KeyError(key)
+
+    def __value(self, slot: tuple[int, int, int, int, int]) -> V:
+        """
+        Decodes the value this slot points to.
+        :raises ValueError: if the value is pickled and pickles are not allowed,
+            or its tag is unknown.
+        """
+        tag = self.__mapping[slot[3]:slot[3] + 1]
+        payload = self.__mapping[slot[3] + 1:slot[3] + slot[4]]
+        if tag == self.STR:
+            return payload.decode('utf-8')
+        elif tag == self.BYTES:
+            return payload
+        elif tag == self.INT:
+            return int.from_bytes(payload, 'little', signed=True)
+        elif tag == self.PICKLE:
+            if not self.__allow_pickle:
+                raise ValueError("Value is pickled, open the table with allow_pickle=True to read it.")
+            return pickle.loads(payload)
+        raise ValueError("Unknown value tag " + repr(tag) + ".")
+
+    def __getitem__(self, key: str) -> V:
+        """
+        Get the value at a certain key, decoded from the mapping.
+        :complexity: See __find.
+        :raises KeyError: when the key doesn't exist.
+        :raises ValueError: if the value is pickled and the table was not opened with allow_pickle.
+        """
+        return self.__value(self.__find(key))
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Checks to see if the given key is in the Hash Table
+        :complexity: See __find.
+        """
+        try:
+            self.__find(key)
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __setitem__(self, key: str, data: V) -> None:
+        raise TypeError("MappedProbeTable is read-only.")
+
+    def __delitem__(self, key: str) -> None:
+        raise TypeError("MappedProbeTable is read-only.")
+
+    def items(self, check: bool = True) -> Iterator[tuple[str, V]]:
+        """
+        Yields each (key, value) pair in slot order. The file never changes, so check is ignored.
+        :complexity: O(N) over the whole iteration, where N is the number of slots.
+        """
+        for position in range(self.__slot_count):
+            slot = self.__slot(position)
+            if slot[1] != self.EMPTY:
+                key = self.__mapping[slot[1]:slot[1] + slot[2]].decode('utf-8')
+                yield key, self.__value(slot)
+
+    def keys(self) -> ArrayR[str]:
+        """
+        Returns all keys in the hash table, without decoding any value.
+        :complexity: O(N) where N is the number of slots.
+        """
+        res = ArrayR(self.__length)
+        i = 0
+        for position in range(self.__slot_count):
+            slot = self.__slot(position)
+            if slot[1] != self.EMPTY:
+                res[i] = self.__mapping[slot[1]:slot[1] + slot[2]].decode('utf-8')
+                i += 1
+        return res
+
+    def values(self) -> ArrayR[V]:
+        """
+        Returns all values in the hash table.
+        :complexity: O(N) where N is the number of slots.
+        """
+        res = ArrayR(self.__length)
+        i = 0
+        for _, value in self.items():
+            res[i] = value
+            i += 1
+        return res
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table (no particular
+        order).
+        :complexity: O(N * (str(key) + str(value))) where N is the number of slots
+        """
+        result = ""
+        for key, value in self.items():
+            result += "(" + str(key) + "," + str(value) + ")\n"
+        return result
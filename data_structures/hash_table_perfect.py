@@ -0,0 +1,242 @@
+from __future__ import annotations
+from typing import Callable, Iterable, Iterator, TypeVar
+from data_structures.abstract_hash_table import HashTable
+from data_structures.hash_functions import MASK_64, key_hash, mix_int, next_prime
+from data_structures.hash_table_compact import CompactHashTable
+from data_structures.referential_array import ArrayR
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+# Marks a slot that holds no key.
+EMPTY = object()
+
+
+class StaticPerfectHashTable(HashTable[K, V]):
+    """
+    Static Perfect Hash Table, built with CHD (compress, hash and displace).
+
+    Built once from a fixed set of keys with StaticPerfectHashTable.build(items).
+    Every key is first hashed into one of about N / AVERAGE_BUCKET_SIZE buckets.
+    The buckets are then placed, largest first: a bucket gets the first
+    displacement d for which the slots (f1 + d*f2) % M of all its keys are
+    distinct and free, where f1 and f2 are two further values derived from each
+    key hash. Only the displacement of each bucket is stored.
+
+    M is the smallest prime that is at least N / LOAD_FACTOR, so a few slots are
+    left free, and since f2 is never a multiple of M, a single key always finds
+    a free slot. A lookup costs one hash of the key, a few integer operations
+    and exactly one key comparison, with no collisions to probe.
+
+    The table is read-only: setting or deleting raises TypeError.
+
+    Type Arguments:
+        - K:    Key Type.
+        - V:    Value Type.
+
+    Unless stated otherwise, all methods have O(1) complexity (plus hashing the key).
+    """
+
+    # Average number of keys per bucket. Smaller buckets are placed faster but
+    # store more displacements.
+    AVERAGE_BUCKET_SIZE = 4
+
+    # Fraction of the slots that hold a key. Leaving a few slots free keeps the
+    # last buckets from searching the whole table for the remaining holes.
+    LOAD_FACTOR = 0.9
+
+    # Displacements tried per bucket before starting over with another seed.
+    MAX_DISPLACEMENT = 1 << 12
+
+    # Seeds tried before giving up on the build.
+    MAX_SEEDS = 64
+
+    def __init__(self, keys: ArrayR[K], values: ArrayR[V], displacements: ArrayR[int],
+                 seed: int, length: int, hash_function: Callable[[K], int]) -> None:
+        """
+        Use build() rather than calling this directly.
+        """
+        self.hash_function = hash_function
+        self.__keys = keys
+        self.__values = values
+        self.__displacements = displacements
+        self.__seed = seed
+        self.__length = length
+
+    @staticmethod
+    def __derive(key_hash: int, seed: int, bucket_count: int, size: int) -> tuple[int, int, int]:
+        """
+        Returns the bucket, f1 and f2 of a key hash.
+        """
+        mixed = mix_int(key_hash + seed)
+        bucket = (mixed & 0xFFFFFFFF) % bucket_count
+        f1 = (mixed >> 32) % size
+        f2 = mix_int(mixed) % (size - 1) + 1 if size > 1 else 0
+        return bucket, f1, f2
+
+    @classmethod
+    def build(cls, items: Iterable[tuple[K, V]], hash_function: Callable[[K], int] = key_hash) -> StaticPerfectHashTable[K, V]:
+        """
+        Builds a table holding the (key, value) pairs, later pairs overwriting earlier ones.
+
+        :complexity: O(N) expected, where N is the number of distinct keys
+            (plus hashing each key once).
+        :raises ValueError: if two distinct keys have the same hash (modulo 2^64), which no seed can
+            separate, or no seed out of MAX_SEEDS places every key.
+        """
+        # CompactHashTable, unlike LinearProbeTable, also holds None as a key
+        unique = CompactHashTable(hash_function=hash_function)
+        for key, value in items:
+            unique[key] = value
+        entries = list(unique.items())
+        hashes = [hash_function(key) for key, _ in entries]
+        length = len(entries)
+        # Keys are placed from their hash taken modulo 2^64, see __derive.
+        if len(set(key_hash & MASK_64 for key_hash in hashes)) != length:
+            raise ValueError("Distinct keys with the same hash cannot be perfectly hashed.")
+        size = next_prime(max(int(length / cls.LOAD_FACTOR) + 1, 2))
+        bucket_count = max(1, -(-length // cls.AVERAGE_BUCKET_SIZE))
+
+        for seed in range(cls.MAX_SEEDS):
+            placement = cls.__place(hashes, seed, bucket_count, size)
+            if placement is not None:
+                break
+        else:
+            raise ValueError("No perfect hash found in " + str(cls.MAX_SEEDS) + " seeds.")
+        slots, displacements = placement
+
+        keys = ArrayR.from_list([EMPTY] * size)
+        values = ArrayR(size)
+        for i in range(length):
+            keys[slots[i]] = entries[i][0]
+            values[slots[i]] = entries[i][1]
+        return cls(keys, values, ArrayR.from_list(displacements), seed, length, hash_function)
+
+    @classmethod
+    def __place(cls, hashes: list[int], seed: int, bucket_count: int, size: int) -> tuple[list[int], list[int]] | None:
+        """
+        Finds a displacement for every bucket, largest bucket first.
+        Returns the slot of each key and the displacement of each bucket, or None
+        if some bucket cannot be placed with this seed.
+        :complexity: O(N) expected, where N is the number of keys.
+        """
+        derived = [cls.__derive(key_hash, seed, bucket_count, size) for key_hash in hashes]
+        members = [[] for _ in range(bucket_count)]
+        for i in range(len(derived)):
+            members[derived[i][0]].append(i)
+
+        # Order the buckets by decreasing size with a counting sort.
+        by_size = [[] for _ in range(max(len(bucket) for bucket in members) + 1)]
+        for bucket in range(bucket_count):
+            by_size[len(members[bucket])].append(bucket)
+
+        taken = [False] * size
+        slots = [0] * len(hashes)
+        displacements = [0] * bucket_count
+        for bucket_size in range(len(by_size) - 1, 0, -1):
+            for bucket in by_size[bucket_size]:
+                keys = members[bucket]
+                for displacement in range(cls.MAX_DISPLACEMENT):
+                    positions = [(derived[i][1] + displacement * derived[i][2]) % size for i in keys]
+                    if all(not taken[p] for p in positions) and len(set(positions)) == len(positions):
+                        break
+                else:
+                    return None
+                for i, p in zip(keys, positions):
+                    taken[p] = True
+                    slots[i] = p
+                displacements[bucket] = displacement
+        return slots, displacements
+
+    def __position(self, key: K) -> int:
+        """
+        Returns the only slot the key can be in.
+        :complexity: O(hash(key))
+        """
+        bucket, f1, f2 = self.__derive(self.hash_function(key), self.__seed,
+                                       len(self.__displacements), len(self.__keys))
+        return (f1 + self.__displacements[bucket] * f2) % len(self.__keys)
+
+    @property
+    def table_size(self) -> int:
+        return len(self.__keys)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of elements in the hash table
+        """
+        return self.__length
+
+    def is_empty(self) -> bool:
+        return self.__length == 0
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value at a certain key, with a single key comparison.
+        :complexity: O(hash(key) + comp(K))
+        :raises KeyError: when the key doesn't exist.
+        """
+        position = self.__position(key)
+        if self.__keys[position] is EMPTY or self.__keys[position] != key:
+            raise KeyError(key)
+        return self.__values[position]
+
+    def __contains__(self, key: K) -> bool:
+        """
+        Checks to see if the given key is in the Hash Table
+        :complexity: O(hash(key) + comp(K))
+        """
+        position = self.__position(key)
+        return self.__keys[position] is not EMPTY and self.__keys[position] == key
+
+    def __setitem__(self, key: K, data: V) -> None:
+        raise TypeError("StaticPerfectHashTable is read-only.")
+
+    def __delitem__(self, key: K) -> None:
+        raise TypeError("StaticPerfectHashTable is read-only.")
+
+    def items(self, check: bool = True) -> Iterator[tuple[K, V]]:
+        """
+        Yields each (key, value) pair. The table never changes, so check is ignored.
+        :complexity: O(N) over the whole iteration, where N is the table size.
+        """
+        for position in range(len(self.__keys)):
+            if self.__keys[position] is not EMPTY:
+                yield self.__keys[position], self.__values[position]
+
+    def keys(self) -> ArrayR[K]:
+        """
+        Returns all keys in the hash table.
+        :complexity: O(N) where N is the table size.
+        """
+        res = ArrayR(self.__length)
+        i = 0
+        for key in self.__keys.to_list():
+            if key is not EMPTY:
+                res[i] = key
+                i += 1
+        return res
+
+    def values(self) -> ArrayR[V]:
+        """
+        Returns all values in the hash table.
+        :complexity: O(N) where N is the table size.
+        """
+        res = ArrayR(self.__length)
+        i = 0
+        for key, value in zip(self.__keys.to_list(), self.__values.to_list()):
+            if key is not EMPTY:
+                res[i] = value
+                i += 1
+        return res
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table (no particular
+        order).
+        :complexity: O(N * (str(key) + str(value))) where N is the table size
+        """
+        result = ""
+        for key, value in self.items():
+            result += "(" + str(key) + "," + str(value) + ")\n"
+        return result
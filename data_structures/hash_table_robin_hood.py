@@ -0,0 +1,335 @@
+from __future__ import annotations
+from typing import Callable, Iterable, Iterator, TypeVar
+from data_structures.abstract_hash_table import HashTable, _to_array
+from data_structures.hash_functions import next_prime, universal_hash
+from data_structures.referential_array import ArrayR
+
+V = TypeVar('V')
+
+
+class RobinHoodProbeTable(HashTable[str, V]):
+    """
+    Robin Hood Probe Table.
+    Defines a Hash Table using linear probing with Robin Hood displacement.
+
+    Each slot stores (key, value, key_hash) and, in a parallel array, its probe
+    distance (how far it sits from its home position). An insert takes the slot of
+    any entry that is closer to home than itself and carries on with that entry,
+    which evens out probe lengths. Lookups stop as soon as they have probed further
+    than the entry in the current slot, and deletes shift the rest of the cluster
+    back by one instead of leaving holes or re-inserting.
+
+    The even probe lengths allow a higher maximum load than LinearProbeTable.
+
+    items(), iter_keys() and iter_values() read the slots in place. Inserting a new
+    key, deleting and resizing move entries, and the iterators detect them through a
+    modification counter.
+
+    Type Arguments:
+        - V:    Value Type.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    # Precomputed sizes, the table keeps growing through primes of about
+    # twice the size once these run out.
+    TABLE_SIZES = [5, 13, 29, 53, 97, 193, 389, 769, 1543, 3079, 6151, 12289, 24593, 49157, 98317, 196613, 393241, 786433, 1572869]
+
+    # Fraction of the table that may be filled before it grows.
+    MAX_LOAD = 0.75
+
+    def __init__(self, sizes = None, hash_function: Callable[[str], int] = universal_hash,
+                 expected_size: int = 0) -> None:
+        """
+        :param sizes: table sizes to grow through, defaults to TABLE_SIZES.
+        :param hash_function: maps a key to an integer independent of the table size.
+        :param expected_size: number of entries the table should hold without resizing.
+        """
+        if sizes is not None:
+            self.TABLE_SIZES = sizes
+
+        self.hash_function = hash_function
+        self.__size_index = 0
+        size = self.TABLE_SIZES[self.__size_index]
+        while expected_size > size * self.MAX_LOAD:
+            size = self.__grow_size(size)
+        self.__array: ArrayR[tuple[str, V, int]] = ArrayR(size)
+        self.__distances: ArrayR[int] = ArrayR(size)
+        self.__length = 0
+        self.__modifications = 0
+
+    def hash(self, key: str) -> int:
+        """
+        Hash a key for insert/retrieve/update into the hashtable.
+        :complexity: O(hash_function(key))
+        """
+        return self.hash_function(key) % self.table_size
+
+    @property
+    def table_size(self) -> int:
+        return len(self.__array)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of elements in the hash table
+        """
+        return self.__length
+
+    def __find(self, key: str, key_hash: int) -> int:
+        """
+        Find the position of this key in the hash table.
+        :complexity best: O(1) key is in its home position or the home position is empty
+        :complexity worst: O(D*comp(str)) where D is the largest probe distance in the table
+        :raises KeyError: When the key is not in the table.
+        """
+        position = key_hash % self.table_size
+        distance = 0
+
+        while True:
+            entry = self.__array[position]
+            if entry is None or self.__distances[position] < distance:
+                # The key would have displaced this entry, so it cannot be further on.
+                raise KeyError(key)
+            elif entry[2] == key_hash and entry[0] == key:
+                return position
+            position = (position + 1) % self.table_size
+            distance += 1
+
+    def __place(self, entry: tuple[str, V, int], check_key: bool) -> bool:
+        """
+        Insert an entry, displacing entries that are closer to their home position.
+        If check_key is True, an entry with the same key is updated instead.
+        Returns True if a new entry was added.
+
+        :complexity best: O(1) home position is empty
+        :complexity worst: O(N*comp(str)) where N is the table size
+        :raises RuntimeError: When the table is full.
+        """
+        position = entry[2] % self.table_size
+        distance = 0
+
+        for _ in range(self.table_size):
+            current = self.__array[position]
+            if current is None:
+                self.__array[position] = entry
+                self.__distances[position] = distance
+                return True
+            elif check_key and current[2] == entry[2] and current[0] == entry[0]:
+                self.__array[position] = entry
+                return False
+            elif self.__distances[position] < distance:
+                # Rob the richer entry and carry on inserting it instead.
+                # It cannot match any key, so stop comparing keys.
+                self.__array[position] = entry
+                entry = current
+                self.__distances[position], distance = distance, self.__distances[position]
+                check_key = False
+            position = (position + 1) % self.table_size
+            distance += 1
+
+        raise RuntimeError("Table is full!")
+
+    def items(self, check: bool = True) -> Iterator[tuple[str, V]]:
+        """
+        Yields each (key, value) pair straight from the slot array, using constant extra memory.
+
+        :complexity: O(N) over the whole iteration, where N is the table size.
+        :raises RuntimeError: if check is True and a key is inserted or deleted,
+            or the table resized, during iteration.
+        """
+        modifications = self.__modifications
+        array = self.__array
+        for x in range(len(array)):
+            entry = array[x]
+            if entry is not None:
+                yield entry[0], entry[1]
+                if check and self.__modifications != modifications:
+                    raise RuntimeError("Hash table modified during iteration")
+
+    def keys(self) -> ArrayR[str]:
+        """
+        Returns all keys in the hash table.
+
+        :complexity: O(N) where N is the table size.
+        """
+        res = ArrayR(self.__length)
+        i = 0
+        for x in range(self.table_size):
+            if self.__array[x] is not None:
+                res[i] = self.__array[x][0]
+                i += 1
+        return res
+
+    def values(self) -> ArrayR[V]:
+        """
+        Returns all values in the hash table.
+
+        :complexity: O(N) where N is the table size.
+        """
+        res = ArrayR(self.__length)
+        i = 0
+        for x in range(self.table_size):
+            if self.__array[x] is not None:
+                res[i] = self.__array[x][1]
+                i += 1
+        return res
+
+    def reserve(self, count: int) -> None:
+        """
+        Grows the table once so that it holds count entries without resizing.
+        :complexity: O(1) if the table is large enough, see __rehash otherwise.
+        """
+        new_size = self.table_size
+        while count > new_size * self.MAX_LOAD:
+            new_size = self.__grow_size(new_size)
+        if new_size != self.table_size:
+            self.__rehash(new_size)
+
+    def update(self, items: Iterable[tuple[str, V]]) -> None:
+        """
+        Inserts every (key, value) pair, later pairs overwriting earlier ones.
+        The table is sized once if the number of pairs is known, and the pairs
+        are placed directly, without going through __setitem__.
+        :complexity: O(N) calls to __place, where N is the number of pairs.
+        """
+        if hasattr(items, '__len__'):
+            self.reserve(self.__length + len(items))
+
+        hash_function = self.hash_function
+        for key, data in items:
+            if self.__place((key, data, hash_function(key)), True):
+                self.__length += 1
+                self.__modifications += 1
+                if self.__length > self.table_size * self.MAX_LOAD:
+                    self.__rehash()
+
+    def get_many(self, keys: Iterable[str]) -> ArrayR[V]:
+        """
+        Returns the values of the given keys, in order.
+        :complexity: O(N) calls to __find, where N is the number of keys.
+        :raises KeyError: when one of the keys doesn't exist.
+        """
+        hash_function = self.hash_function
+        array = self.__array
+        res = []
+        for key in keys:
+            res.append(array[self.__find(key, hash_function(key))][1])
+        return _to_array(res)
+
+    def contains_many(self, keys: Iterable[str]) -> ArrayR[bool]:
+        """
+        Returns, for each of the given keys in order, whether it is in the table.
+        :complexity: O(N) calls to __find, where N is the number of keys.
+        """
+        hash_function = self.hash_function
+        res = []
+        for key in keys:
+            try:
+                self.__find(key, hash_function(key))
+            except KeyError:
+                res.append(False)
+            else:
+                res.append(True)
+        return _to_array(res)
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Checks to see if the given key is in the Hash Table
+
+        :complexity: See __find.
+        """
+        try:
+            _ = self[key]
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __getitem__(self, key: str) -> V:
+        """
+        Get the value at a certain key
+
+        :complexity: See __find.
+        :raises KeyError: when the key doesn't exist.
+        """
+        position = self.__find(key, self.hash_function(key))
+        return self.__array[position][1]
+
+    def __setitem__(self, key: str, data: V) -> None:
+        """
+        Set an (key, value) pair in our hash table.
+
+        :complexity: See __place.
+        """
+        if self.__place((key, data, self.hash_function(key)), True):
+            self.__length += 1
+            self.__modifications += 1
+
+        if len(self) > self.table_size * self.MAX_LOAD:
+            self.__rehash()
+
+    def __delitem__(self, key: str) -> None:
+        """
+        Deletes a (key, value) pair in our hash table, shifting the rest of the
+        cluster back by one slot.
+
+        :complexity best: O(hash(key)) next slot is empty or at its home position.
+        :complexity worst: O(hash(key) + N*comp(str)) deleting from a long cluster,
+            where N is the table size.
+        :raises KeyError: when the key doesn't exist.
+        """
+        position = self.__find(key, self.hash_function(key))
+        following = (position + 1) % self.table_size
+        while self.__array[following] is not None and self.__distances[following] > 0:
+            self.__array[position] = self.__array[following]
+            self.__distances[position] = self.__distances[following] - 1
+            position = following
+            following = (following + 1) % self.table_size
+
+        self.__array[position] = None
+        self.__distances[position] = None
+        self.__length -= 1
+        self.__modifications += 1
+
+    def is_empty(self) -> bool:
+        return self.__length == 0
+
+    def __grow_size(self, size: int) -> int:
+        """
+        Returns the table size to grow to from the given size.
+        :complexity: O(1) within TABLE_SIZES, see next_prime otherwise.
+        """
+        self.__size_index += 1
+        if self.__size_index < len(self.TABLE_SIZES):
+            return self.TABLE_SIZES[self.__size_index]
+        return next_prime(2 * size + 1)
+
+    def __rehash(self, new_size: int = 0) -> None:
+        """
+        Need to resize table (to new_size if given, else to the next size) and reinsert all values
+
+        :complexity best: O(N) No probing.
+        :complexity worst: O(N^2*comp(K)) Lots of probing.
+        Where N is len(self). Keys are not hashed again.
+        """
+        old_array = self.__array
+        self.__modifications += 1
+        new_size = new_size or self.__grow_size(self.table_size)
+        self.__array = ArrayR(new_size)
+        self.__distances = ArrayR(new_size)
+        for entry in old_array:
+            if entry is not None:
+                self.__place(entry, False)
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table (no particular
+        order).
+        :complexity: O(N * (str(key) + str(value))) where N is the table size
+        """
+        result = ""
+        for item in self.__array:
+            if item is not None:
+                (key, value, _) = item
+                result += "(" + str(key) + "," + str(value) + ")\n"
+        return result
@@ -1,108 +1,174 @@
-from data_structures.abstract_hash_table import HashTable
+from __future__ import annotations
+import time
+from data_structures.abstract_hash_table import HashTable, _to_array
+from data_structures.hash_functions import next_prime, universal_hash
+from data_structures.hash_table_stats import HashTableStats
 from data_structures.referential_array import ArrayR
-from data_structures.linked_list import LinkedList
-from typing import TypeVar
+from typing import Callable, Iterable, Iterator, TypeVar
 
 V = TypeVar('V')
 
 class HashTableSeparateChaining(HashTable[str, V]):
     """
-    Separate Chaining Hash Table Implementation using a Linked List.
-    It currently rehashes the primary cluster to handle deletion.
+    Separate Chaining Hash Table Implementation using compact buckets.
+
+    Each entry is a (key, value, key_hash) tuple, where key_hash is the full,
+    table-size independent hash of the key. A bucket is None, a single entry
+    stored inline in the table, or a small list of the entries that collided
+    there, scanned linearly. A lone entry therefore costs a single tuple and
+    no container. Updates replace the entry in place, and deletes move the last
+    entry of the list into the hole (a list left with one entry goes back to
+    being stored inline).
+    The table grows when the load factor passes MAX_LOAD_FACTOR, so buckets
+    stay O(1) long on average.
+    items(), iter_keys() and iter_values() walk the buckets in place and detect
+    inserts, deletes and resizes made meanwhile through a modification counter.
+    stats() reports bucket lengths and the load factor, computed when it is called,
+    and the number of rehashes. With track_stats=True, the time spent rehashing is
+    measured too.
 
     constants:
         DEFAULT_TABLE_SIZE: default table size used in the __init__
-        DEFAULT_HASH_TABLE: default hash base used for the hash function
+        MAX_LOAD_FACTOR: number of entries per bucket (on average) that triggers a resize
 
     attributes:
         length: number of elements in the hash table
-        array: used to represent our internal array
+        table: used to represent our internal array
     """
 
     DEFAULT_TABLE_SIZE = 17
-    DEFAULT_HASH_BASE = 31
+    MAX_LOAD_FACTOR = 1.0
 
-    def __init__(self, table_size: int = DEFAULT_TABLE_SIZE) -> None:
+    def __init__(self, table_size: int = DEFAULT_TABLE_SIZE,
+                 hash_function: Callable[[str], int] = universal_hash, track_stats: bool = False) -> None:
         """
+        :param hash_function: maps a key to an integer independent of the table size.
+        :param track_stats: measure the time spent rehashing, see stats().
         :complexity: O(N) where N is the table size.
         """
         if table_size <= 0:
             raise ValueError("Table size should be larger than 0.")
-        
+
+        self.hash_function = hash_function
+        self.track_stats = track_stats
         self.__length = 0
+        self.__modifications = 0
+        self.__rehash_count = 0
+        self.__rehash_time = 0.0
         self.__table = ArrayR(table_size)
 
+    @property
+    def table_size(self) -> int:
+        return len(self.__table)
+
     def __len__(self) -> int:
         """
         Returns number of elements in the hash table
         """
         return self.__length
 
+    @staticmethod
+    def __find(bucket, key: str, key_hash: int) -> int:
+        """
+        Returns the index of the key's entry in a list bucket, or -1 if it is not there.
+        :complexity: O(C*comp(str)) where C is the length of the bucket.
+        """
+        for i in range(len(bucket)):
+            entry = bucket[i]
+            if entry[2] == key_hash and entry[0] == key:
+                return i
+        return -1
+
+    def __lookup(self, key: str, key_hash: int):
+        """
+        Returns the key's entry, or None if it is not in the table.
+        :complexity: O(C*comp(str)) where C is the length of the bucket.
+        """
+        bucket = self.__table[key_hash % len(self.__table)]
+        if bucket is None:
+            return None
+        elif type(bucket) is tuple:
+            return bucket if bucket[2] == key_hash and bucket[0] == key else None
+        i = self.__find(bucket, key, key_hash)
+        return bucket[i] if i >= 0 else None
+
     def __delitem__(self, key: str) -> None:
         """
         Deletes an item from our hash table
+        :complexity: O(hash(key) + C*comp(str)) where C is the length of the bucket.
         :raises KeyError: when the key doesn't exist
         """
-        position = self.hash(key)
-        if self.__table[position] is None:
+        key_hash = self.hash_function(key)
+        position = key_hash % len(self.__table)
+        bucket = self.__table[position]
+        if bucket is None:
             raise KeyError(key)
+        elif type(bucket) is tuple:
+            if not (bucket[2] == key_hash and bucket[0] == key):
+                raise KeyError(key)
+            self.__table[position] = None
+        else:
+            i = self.__find(bucket, key, key_hash)
+            if i < 0:
+                raise KeyError(key)
+            bucket[i] = bucket[-1]
+            bucket.pop()
+            if len(bucket) == 1:
+                self.__table[position] = bucket[0]
+        self.__length -= 1
+        self.__modifications += 1
 
-        for index, item in enumerate(self.__table[position]):
-            if item[0] == key:
-                if len(self.__table[position]) <= 1:
-                    self.__table[position] = None
-                else:
-                    self.__table[position].delete_at_index(index)
-
-                self.__length -= 1
-                return
-
-        raise KeyError(key)
+    def __put(self, table: ArrayR, key: str, data: V, key_hash: int) -> bool:
+        """
+        Sets the key's entry in the given table, returning True if the key is new.
+        :complexity: O(C*comp(str)) where C is the length of the bucket.
+        """
+        position = key_hash % len(table)
+        bucket = table[position]
+        if bucket is None:
+            table[position] = (key, data, key_hash)
+        elif type(bucket) is tuple:
+            if bucket[2] == key_hash and bucket[0] == key:
+                table[position] = (key, data, key_hash)
+                return False
+            table[position] = [bucket, (key, data, key_hash)]
+        else:
+            i = self.__find(bucket, key, key_hash)
+            if i >= 0:
+                bucket[i] = (key, data, key_hash)
+                return False
+            bucket.append((key, data, key_hash))
+        return True
 
     def __setitem__(self, key: str, data: V) -> None:
         """
         Set a (key, data) pair in our hash table
+        :complexity: O(hash(key) + C*comp(str)) where C is the length of the bucket,
+            O(N) when the table is resized.
         """
-        position = self.hash(key)
-        if self.__table[position] is None:
-            self.__table[position] = LinkedList()
-
-        # Attempt to find the key in our linked list
-        if len(self.__table[position]) > 0:
-            for index, item in enumerate(self.__table[position]):
-                if item[0] == key:
-                    # If found update the data
-                    self.__table[position][index] = (key, data)
-                    return
-                
-        # Insert at the beginning for better time complexity
-        self.__table[position].insert(0, (key, data))
-        self.__length += 1
+        if self.__put(self.__table, key, data, self.hash_function(key)):
+            self.__length += 1
+            self.__modifications += 1
+            if self.__length > len(self.__table) * self.MAX_LOAD_FACTOR:
+                self.__rehash()
 
     def __contains__(self, key: str) -> bool:
         """
         Checks to see if the given key is in the Hash Table
+        :complexity: O(hash(key) + C*comp(str)) where C is the length of the bucket.
         """
-        try:
-            _ = self[key]
-        except KeyError:
-            return False
-        else:
-            return True
+        return self.__lookup(key, self.hash_function(key)) is not None
 
     def __getitem__(self, key: str) -> V:
         """
         Get the data associated with a key
+        :complexity: O(hash(key) + C*comp(str)) where C is the length of the bucket.
         :raises KeyError: when the key doesn't exist
         """
-        position = self.hash(key)
-        if self.__table[position] is None:
+        entry = self.__lookup(key, self.hash_function(key))
+        if entry is None:
             raise KeyError(key)
-        for item in self.__table[position]:
-            if item[0] == key:
-                return item[1]
-
-        raise KeyError(key)
+        return entry[1]
 
     def is_empty(self):
         """
@@ -113,16 +179,125 @@ class HashTableSeparateChaining(HashTable[str, V]):
 
     def hash(self, key: str) -> int:
         """
-        Universal Hash function
-        :returns: a valid position (0 <= value < table_size) in the hash table
-        :complexity: O(K) where K is the size of the key
+        Hash a key into a valid position (0 <= value < table_size) in the hash table
+        :complexity: O(hash_function(key))
+        """
+        return self.hash_function(key) % len(self.__table)
+
+    def __rehash(self, new_size: int = 0) -> None:
+        """
+        Grow the table to new_size (by default, a prime of about twice the size)
+        and redistribute the entries. Keys are not hashed again, and the old
+        buckets are left intact for any iteration still walking them.
+        :complexity: O(N + M) where N is the number of items and M the new table size.
+        """
+        if self.track_stats:
+            start = time.perf_counter()
+        old_table = self.__table
+        self.__modifications += 1
+        self.__rehash_count += 1
+        table = ArrayR(new_size or next_prime(2 * len(old_table) + 1))
+        for entry in self.__entries(old_table):
+            # Keys are unique, so each entry is simply added to its new bucket
+            position = entry[2] % len(table)
+            bucket = table[position]
+            if bucket is None:
+                table[position] = entry
+            elif type(bucket) is tuple:
+                table[position] = [bucket, entry]
+            else:
+                bucket.append(entry)
+        self.__table = table
+        if self.track_stats:
+            self.__rehash_time += time.perf_counter() - start
+
+    def stats(self) -> HashTableStats:
+        """
+        Returns the current histogram of entry positions within their buckets,
+        longest bucket and load factor, along with the rehash count (and time,
+        if track_stats is set).
+        :complexity: O(N + M) where N is the number of items and M the table size.
+        """
+        probe_lengths = []
+        max_run = 0
+        for bucket in self.__table:
+            if bucket is None:
+                continue
+            bucket_length = 1 if type(bucket) is tuple else len(bucket)
+            probe_lengths.extend(range(bucket_length))
+            max_run = max(max_run, bucket_length)
+
+        return HashTableStats(self.__length, len(self.__table), HashTableStats.histogram(probe_lengths), max_run,
+                              self.__rehash_count, self.__rehash_time if self.track_stats else None)
+
+    @staticmethod
+    def __entries(table: ArrayR):
+        """
+        Yields every (key, value, key_hash) entry stored in the given table.
+        :complexity: O(N + M) where N is the number of items and M the table size.
+        """
+        for bucket in table:
+            if bucket is None:
+                continue
+            elif type(bucket) is tuple:
+                yield bucket
+            else:
+                yield from bucket
+
+    def reserve(self, count: int) -> None:
+        """
+        Grows the table once so that it holds count entries without resizing.
+        :complexity: O(1) if the table is large enough, see __rehash otherwise.
+        """
+        if count > len(self.__table) * self.MAX_LOAD_FACTOR:
+            self.__rehash(next_prime(int(count / self.MAX_LOAD_FACTOR) + 1))
+
+    def update(self, items: Iterable[tuple[str, V]]) -> None:
+        """
+        Inserts every (key, value) pair, later pairs overwriting earlier ones.
+        The table is sized once if the number of pairs is known, and the pairs
+        are put in their buckets directly, without going through __setitem__.
+        :complexity: O(N*(hash(key) + C*comp(str))) where N is the number of pairs
+            and C the length of the buckets.
         """
-        value = 0
-        a = 31415
-        for char in key:
-            value = (ord(char) + a * value) % len(self.__table)
-            a = a * HashTableSeparateChaining.DEFAULT_HASH_BASE % (len(self.__table) - 1)
-        return value
+        if hasattr(items, '__len__'):
+            self.reserve(self.__length + len(items))
+
+        hash_function = self.hash_function
+        for key, data in items:
+            if self.__put(self.__table, key, data, hash_function(key)):
+                self.__length += 1
+                self.__modifications += 1
+                if self.__length > len(self.__table) * self.MAX_LOAD_FACTOR:
+                    self.__rehash()
+
+    def get_many(self, keys: Iterable[str]) -> ArrayR[V]:
+        """
+        Returns the values of the given keys, in order.
+        :complexity: O(N*(hash(key) + C*comp(str))) where N is the number of keys
+            and C the length of the buckets.
+        :raises KeyError: when one of the keys doesn't exist.
+        """
+        hash_function = self.hash_function
+        res = []
+        for key in keys:
+            entry = self.__lookup(key, hash_function(key))
+            if entry is None:
+                raise KeyError(key)
+            res.append(entry[1])
+        return _to_array(res)
+
+    def contains_many(self, keys: Iterable[str]) -> ArrayR[bool]:
+        """
+        Returns, for each of the given keys in order, whether it is in the table.
+        :complexity: O(N*(hash(key) + C*comp(str))) where N is the number of keys
+            and C the length of the buckets.
+        """
+        hash_function = self.hash_function
+        res = []
+        for key in keys:
+            res.append(self.__lookup(key, hash_function(key)) is not None)
+        return _to_array(res)
 
     def insert(self, key: str, data: V) -> None:
         """
@@ -135,10 +310,23 @@ class HashTableSeparateChaining(HashTable[str, V]):
         Returns an iterator for the hash table
         :complexity: O(N) where N n is the number of items in our hash table
         """
-        for list in self.__table:
-            if list is not None:
-                for item in list:
-                    yield item[1]
+        for entry in self.__entries(self.__table):
+            yield entry[1]
+
+    def items(self, check: bool = True) -> Iterator[tuple[str, V]]:
+        """
+        Yields each (key, value) pair straight from the buckets, using constant extra memory.
+        Values updated during iteration are yielded with their new value if not reached yet.
+        :complexity: O(N + M) over the whole iteration, where N is the number of items
+            and M the table size.
+        :raises RuntimeError: if check is True and a key is inserted or deleted,
+            or the table resized, during iteration.
+        """
+        modifications = self.__modifications
+        for entry in self.__entries(self.__table):
+            yield entry[0], entry[1]
+            if check and self.__modifications != modifications:
+                raise RuntimeError("Hash table modified during iteration")
 
     def keys(self) -> ArrayR[str]:
         """
@@ -147,11 +335,9 @@ class HashTableSeparateChaining(HashTable[str, V]):
         """
         res = ArrayR(self.__length)
         i = 0
-        for list in self.__table:
-            if list is not None:
-                for item in list:
-                    res[i] = item[0]
-                    i += 1
+        for entry in self.__entries(self.__table):
+            res[i] = entry[0]
+            i += 1
         return res
 
     def values(self) -> ArrayR[V]:
@@ -161,11 +347,9 @@ class HashTableSeparateChaining(HashTable[str, V]):
         """
         res = ArrayR(self.__length)
         i = 0
-        for list in self.__table:
-            if list is not None:
-                for item in list:
-                    res[i] = item[1]
-                    i += 1
+        for entry in self.__entries(self.__table):
+            res[i] = entry[1]
+            i += 1
         return res
 
     def __str__(self) -> str:
@@ -174,17 +358,12 @@ class HashTableSeparateChaining(HashTable[str, V]):
         :complexity: O(N) where N is the number of items in our hash table
         """
         result = ""
-        for list in self.__table:
-            if list is not None:
-                first = True
-                for item in list:
-                    if not first:
-                        result += ' -> '
-                    (key, value) = item
-                    result += "(" + str(key) + "," + str(value) + ")"
-                    first = False
+        for bucket in self.__table:
+            if bucket is not None:
+                entries = [bucket] if type(bucket) is tuple else bucket
+                result += ' -> '.join("(" + str(entry[0]) + "," + str(entry[1]) + ")" for entry in entries)
                 result += '\n'
         return result
-    
+
     def __repr__(self) -> str:
         return str(self)
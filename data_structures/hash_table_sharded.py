@@ -0,0 +1,252 @@
+""" Sharded Hash Table.
+
+Defines a thread-safe hash table that splits its keys over several
+LinearProbeTable shards, each guarded by its own lock.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Callable, Generic, Iterator, TypeVar
+
+from data_structures.abstract_hash_table import HashTable, _to_array
+from data_structures.hash_functions import key_hash
+from data_structures.hash_table_linear_probing import LinearProbeTable
+from data_structures.referential_array import ArrayR
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class ShardedHashTable(HashTable[K, V]):
+    """
+    Sharded Hash Table.
+
+    Each key belongs to one of shard_count LinearProbeTable shards, chosen from
+    its hash with the high bits folded into the low ones. Every
+    operation locks only the shard of its key, so threads contend only when they
+    hit the same shard, and a shard that resizes blocks no other shard.
+
+    For read-mostly workloads, snapshot() returns a read-only copy that can be
+    queried without any locking. Each shard keeps a version that every write
+    increases, and snapshot() copies again only the shards that changed since
+    the previous snapshot.
+
+    Type Arguments:
+        - K:    Key Type.
+        - V:    Value Type.
+
+    Unless stated otherwise, all methods have the complexity of the same
+    operation on a LinearProbeTable, plus acquiring one lock.
+    """
+
+    DEFAULT_SHARD_COUNT = 16
+
+    # The hash shifted right by this many bits is xor-ed into it to pick the shard.
+    SHARD_SHIFT = 32
+
+    def __init__(self, shard_count: int = DEFAULT_SHARD_COUNT, hash_function: Callable[[K], int] = key_hash,
+                 expected_size: int = 0, **table_kwargs) -> None:
+        """
+        :param shard_count: number of shards (and locks).
+        :param hash_function: maps a key to an integer, used to pick the shard and by the shards.
+        :param expected_size: number of entries the whole table should hold without resizing.
+        :param table_kwargs: further arguments for each LinearProbeTable shard (e.g. incremental=True).
+        :complexity: O(shard_count + expected_size)
+        :raises ValueError: if shard_count is not positive.
+        """
+        if shard_count <= 0:
+            raise ValueError("Shard count should be larger than 0.")
+
+        self.hash_function = hash_function
+        self.__table_kwargs = table_kwargs
+        self.__shards: ArrayR[LinearProbeTable[K, V]] = ArrayR(shard_count)
+        self.__locks: ArrayR[threading.Lock] = ArrayR(shard_count)
+        self.__versions: ArrayR[int] = ArrayR(shard_count)
+        shard_size = (expected_size + shard_count - 1) // shard_count
+        for i in range(shard_count):
+            self.__shards[i] = LinearProbeTable(hash_function=hash_function, expected_size=shard_size,
+                                                **table_kwargs)
+            self.__locks[i] = threading.Lock()
+            self.__versions[i] = 0
+
+        self.__snapshot_lock = threading.Lock()
+        self.__snapshot_shards: ArrayR[LinearProbeTable[K, V]] = ArrayR(shard_count)
+        self.__snapshot_versions: ArrayR[int] = ArrayR(shard_count)
+
+    @property
+    def shard_count(self) -> int:
+        return len(self.__shards)
+
+    def shard_index(self, key: K) -> int:
+        """
+        Returns the index of the shard the key belongs to.
+        :complexity: O(hash_function(key))
+        """
+        key_hash = self.hash_function(key)
+        return (key_hash ^ (key_hash >> self.SHARD_SHIFT)) % len(self.__shards)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of elements in the hash table.
+        :complexity: O(S) where S is the number of shards.
+        """
+        res = 0
+        for i in range(len(self.__shards)):
+            res += len(self.__shards[i])
+        return res
+
+    def is_empty(self) -> bool:
+        return len(self) == 0
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value at a certain key.
+        :raises KeyError: when the key doesn't exist.
+        """
+        i = self.shard_index(key)
+        with self.__locks[i]:
+            return self.__shards[i][key]
+
+    def __contains__(self, key: K) -> bool:
+        """
+        Checks to see if the given key is in the Hash Table
+        """
+        i = self.shard_index(key)
+        with self.__locks[i]:
+            return key in self.__shards[i]
+
+    def __setitem__(self, key: K, data: V) -> None:
+        """
+        Set an (key, value) pair in our hash table.
+        """
+        i = self.shard_index(key)
+        with self.__locks[i]:
+            self.__shards[i][key] = data
+            self.__versions[i] += 1
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Deletes a (key, value) pair in our hash table.
+        :raises KeyError: when the key doesn't exist.
+        """
+        i = self.shard_index(key)
+        with self.__locks[i]:
+            del self.__shards[i][key]
+            self.__versions[i] += 1
+
+    def items(self, check: bool = True) -> Iterator[tuple[K, V]]:
+        """
+        Yields each (key, value) pair, shard by shard. Each shard is copied under
+        its lock before its pairs are yielded, so writers are never blocked by a
+        slow consumer, and check is not needed.
+        :complexity: O(N) over the whole iteration, where N is the total table size.
+        """
+        for i in range(len(self.__shards)):
+            with self.__locks[i]:
+                entries = list(self.__shards[i].items())
+            yield from entries
+
+    def keys(self) -> ArrayR[K]:
+        """
+        Returns all keys in the hash table. Shards are locked one at a time, so
+        the result is consistent per shard, not across shards.
+        :complexity: O(N) where N is the total table size.
+        """
+        return self.__collect(0)
+
+    def values(self) -> ArrayR[V]:
+        """
+        Returns all values in the hash table, see keys.
+        :complexity: O(N) where N is the total table size.
+        """
+        return self.__collect(1)
+
+    def __collect(self, part: int) -> ArrayR:
+        """
+        Returns the keys (part 0) or values (part 1) of every shard.
+        :complexity: O(N) where N is the total table size.
+        """
+        res = []
+        for key_value in self.items():
+            res.append(key_value[part])
+        return _to_array(res)
+
+    def snapshot(self) -> ShardedSnapshot[K, V]:
+        """
+        Returns a read-only copy of the table that needs no locking.
+        Only the shards written since the previous snapshot are copied again,
+        the others are shared with it.
+        :complexity: O(S + C) where S is the number of shards and C the total size
+            of the shards that changed.
+        """
+        with self.__snapshot_lock:
+            for i in range(len(self.__shards)):
+                if self.__snapshot_versions[i] != self.__versions[i]:
+                    with self.__locks[i]:
+                        shard = self.__shards[i]
+                        copy = LinearProbeTable.from_items(shard.items(), len(shard),
+                                                           hash_function=self.hash_function,
+                                                           **self.__table_kwargs)
+                        self.__snapshot_versions[i] = self.__versions[i]
+                    self.__snapshot_shards[i] = copy
+            shards = ArrayR(len(self.__shards))
+            for i in range(len(self.__shards)):
+                shards[i] = self.__snapshot_shards[i]
+        return ShardedSnapshot(shards, self.hash_function, self.SHARD_SHIFT)
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table (no particular
+        order).
+        :complexity: O(N * (str(key) + str(value))) where N is the total table size
+        """
+        result = ""
+        for key, value in self.items():
+            result += "(" + str(key) + "," + str(value) + ")\n"
+        return result
+
+
+class ShardedSnapshot(Generic[K, V]):
+    """
+    Read-only copy of a ShardedHashTable, as returned by ShardedHashTable.snapshot().
+    Its shards are never written, so any number of threads may read it without locks.
+    """
+
+    def __init__(self, shards: ArrayR[LinearProbeTable[K, V]], hash_function: Callable[[K], int],
+                 shard_shift: int) -> None:
+        """
+        :complexity: O(1)
+        """
+        self.__shards = shards
+        self.__hash_function = hash_function
+        self.__shard_shift = shard_shift
+
+    def __shard(self, key: K) -> LinearProbeTable[K, V]:
+        key_hash = self.__hash_function(key)
+        return self.__shards[(key_hash ^ (key_hash >> self.__shard_shift)) % len(self.__shards)]
+
+    def __len__(self) -> int:
+        """
+        :complexity: O(S) where S is the number of shards.
+        """
+        res = 0
+        for i in range(len(self.__shards)):
+            res += len(self.__shards[i])
+        return res
+
+    def __getitem__(self, key: K) -> V:
+        """
+        :raises KeyError: when the key doesn't exist.
+        """
+        return self.__shard(key)[key]
+
+    def __contains__(self, key: K) -> bool:
+        return key in self.__shard(key)
+
+    def items(self) -> Iterator[tuple[K, V]]:
+        """
+        Yields each (key, value) pair, shard by shard.
+        :complexity: O(N) over the whole iteration, where N is the total table size.
+        """
+        for i in range(len(self.__shards)):
+            yield from self.__shards[i].items()
@@ -0,0 +1,75 @@
+""" Hash Table Statistics.
+
+Snapshot of how well a hash table is performing, as returned by stats().
+Everything except the rehash figures is computed from the table's contents
+when the snapshot is taken, so collecting it costs nothing during normal use.
+"""
+from __future__ import annotations
+
+from data_structures.referential_array import ArrayR
+
+
+class HashTableStats:
+    """
+    Hash Table Statistics.
+
+    attributes:
+        length: number of entries in the table
+        table_size: number of slots (or buckets) in the table
+        load_factor: length / table_size
+        probe_histogram: probe_histogram[i] is the number of entries found after
+            i extra probes (linear probing) or i links (separate chaining)
+        max_run: longest cluster of occupied slots, or longest chain
+        rehash_count: number of times the table was rebuilt
+        rehash_time: seconds spent rebuilding, or None if the table does not track it
+    """
+
+    def __init__(self, length: int, table_size: int, probe_histogram: ArrayR[int], max_run: int,
+                 rehash_count: int, rehash_time: float | None) -> None:
+        """
+        :complexity: O(1)
+        """
+        self.length = length
+        self.table_size = table_size
+        self.load_factor = length / table_size
+        self.probe_histogram = probe_histogram
+        self.max_run = max_run
+        self.rehash_count = rehash_count
+        self.rehash_time = rehash_time
+
+    @staticmethod
+    def histogram(probe_lengths: list[int]) -> ArrayR[int]:
+        """
+        Counts how many times each probe length appears.
+        :complexity: O(N + L) where N is the number of lengths and L the largest length.
+        """
+        counts = [0] * (max(probe_lengths, default=0) + 1)
+        for probe_length in probe_lengths:
+            counts[probe_length] += 1
+        return ArrayR.from_list(counts)
+
+    def average_probe_length(self) -> float:
+        """
+        Average number of extra probes (or links) needed to find an entry.
+        :complexity: O(L) where L is the largest probe length.
+        """
+        if self.length == 0:
+            return 0.0
+        total = 0
+        for i in range(len(self.probe_histogram)):
+            total += i * self.probe_histogram[i]
+        return total / self.length
+
+    def __str__(self) -> str:
+        result = "length: " + str(self.length) + ", table size: " + str(self.table_size)
+        result += ", load factor: " + format(self.load_factor, ".3f") + "\n"
+        result += "probe histogram: " + str(self.probe_histogram)
+        result += ", average: " + format(self.average_probe_length(), ".3f")
+        result += ", max run: " + str(self.max_run) + "\n"
+        result += "rehashes: " + str(self.rehash_count)
+        if self.rehash_time is not None:
+            result += ", rehash time: " + format(self.rehash_time, ".6f") + "s"
+        return result
+
+    def __repr__(self) -> str:
+        return str(self)
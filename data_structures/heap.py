@@ -4,7 +4,8 @@ from __future__ import annotations
 __author__ = "Brendon Taylor, modified by Jackson Goerner"
 __docformat__ = 'reStructuredText'
 
-from typing import Generic
+import operator
+from typing import Any, Callable, Generic
 
 from data_structures import ArrayList
 from data_structures.abstract_list import List
@@ -12,43 +13,108 @@ from data_structures.referential_array import ArrayR, T
 
 
 class MaxHeap(Generic[T]):
+    """
+    Array based d-ary heap, rooted at index 0.
+
+    The children of index k are d*k + 1 to d*k + d, and its parent is (k - 1) // d.
+    A wider heap (d=4 by default) has about half the levels of a binary one, so
+    add does fewer moves, and the children compared by sink sit next to each other.
+
+    By default the largest element is at the root. With min_heap=True the
+    smallest one is. With a key function, elements are ordered by key(element)
+    instead of by the elements themselves. Each key is computed once, when its
+    element is added, and kept in the_keys, parallel to the_array, so
+    elements with equal keys are never compared with each other.
+
+    The heap grows (doubling its capacity) when an element is added to a full heap.
+    """
     MIN_CAPACITY = 1
+    DEFAULT_ARITY = 4
 
-    def __init__(self, max_size: int) -> None:
+    def __init__(self, max_size: int = MIN_CAPACITY, key: Callable[[T], Any] | None = None,
+                 min_heap: bool = False, d: int = DEFAULT_ARITY) -> None:
         """
         Args:
-            max_size(int): The capacity of the heap
+            max_size(int): The initial capacity of the heap
+            key: Maps an element to the value it is ordered by, defaults to the element itself
+            min_heap(bool): Put the smallest element (or key) at the root instead of the largest
+            d(int): The number of children of each node
+
+        Raises:
+            ValueError: if d is smaller than 2
 
         Complexity:
             Best case complexity: O(n) where n is the size of the heap.
             Worst case complexity: O(n) where n is the size of the heap.
         """
+        if d < 2:
+            raise ValueError("A heap node should have at least 2 children.")
         self.length: int = 0
-        self.the_array: ArrayR[T] = ArrayR(max(self.MIN_CAPACITY, max_size) + 1)
+        self.d = d
+        self.key = key
+        self.min_heap = min_heap
+        # above(a, b) is True when a key a belongs closer to the root than a key b
+        self.above: Callable[[Any, Any], bool] = operator.lt if min_heap else operator.gt
+        self.the_array: ArrayR[T] = ArrayR(max(self.MIN_CAPACITY, max_size))
+        self.the_keys: ArrayR | None = None
+        if key is not None:
+            self.the_keys = ArrayR(len(self.the_array))
 
     def __len__(self) -> int:
         return self.length
 
     def is_full(self) -> bool:
-        return self.length + 1 == len(self.the_array)
+        """
+        Returns True if the current capacity is used up, so the next add grows the heap.
+        """
+        return self.length == len(self.the_array)
+
+    def __grow(self) -> None:
+        """
+        Doubles the capacity of the heap, copying the elements (and keys).
+
+        Complexity:
+            Best/Worst case complexity: O(n) where n is the number of elements in the heap
+        """
+        new_array = ArrayR(max(self.MIN_CAPACITY, 2 * len(self.the_array)))
+        for i in range(self.length):
+            new_array[i] = self.the_array[i]
+        self.the_array = new_array
+        if self.the_keys is not None:
+            new_keys = ArrayR(len(new_array))
+            for i in range(self.length):
+                new_keys[i] = self.the_keys[i]
+            self.the_keys = new_keys
 
     def rise(self, k: int) -> None:
         """
         Rise element at index k to its correct position
 
         Pre-condition:
-            1 <= k <= self.length
+            0 <= k < self.length
 
         Complexity:
             Best case complexity: O(1) - Rising the root element
-            Worst case complexity: O(logn) - Rising a leaf element
+            Worst case complexity: O(log_d(n)) - Rising a leaf element
             n is the number of elements currently in the heap
         """
-        item: T = self.the_array[k]
-        while k > 1 and item > self.the_array[k // 2]:
-            self.the_array[k] = self.the_array[k // 2]
-            k = k // 2
-        self.the_array[k] = item
+        array, keys, above, d = self.the_array, self.the_keys, self.above, self.d
+        item: T = array[k]
+        if keys is None:
+            while k > 0 and above(item, array[(k - 1) // d]):
+                parent = (k - 1) // d
+                array[k] = array[parent]
+                k = parent
+            array[k] = item
+        else:
+            item_key = keys[k]
+            while k > 0 and above(item_key, keys[(k - 1) // d]):
+                parent = (k - 1) // d
+                array[k] = array[parent]
+                keys[k] = keys[parent]
+                k = parent
+            array[k] = item
+            keys[k] = item_key
 
     def add(self, element: T) -> None:
         """
@@ -56,87 +122,192 @@ class MaxHeap(Generic[T]):
 
         Complexity:
             Best case complexity: O(1) - No rising required
-            Worst case complexity: O(logn) - New largest element (rises to the root)
+            Worst case complexity: O(log_d(n)) - New largest element (rises to the root),
+                or O(n) when the heap has to grow (O(log_d(n)) amortised)
             n is the number of elements currently in the heap
         """
         if self.is_full():
-            raise IndexError
+            self.__grow()
 
-        self.length += 1
         self.the_array[self.length] = element
-        self.rise(self.length)
+        if self.the_keys is not None:
+            self.the_keys[self.length] = self.key(element)
+        self.length += 1
+        self.rise(self.length - 1)
 
     def largest_child(self, k: int) -> int:
         """
-        Returns the index of k's child with greatest value.
+        Returns the index of k's child that belongs closest to the root
+        (the largest one, or the smallest one in a min heap).
 
         Pre-condition:
-            1 <= k <= self.length // 2
+            0 <= k and d*k + 1 < self.length
 
         Complexity:
-            O(comp) where comp is the cost of comparing two elements in the heap
+            O(d * comp) where comp is the cost of comparing two elements in the heap
         """
-        if 2 * k == self.length or \
-                self.the_array[2 * k] > self.the_array[2 * k + 1]:
-            return 2 * k
-        else:
-            return 2 * k + 1
+        keys = self.the_array if self.the_keys is None else self.the_keys
+        best = self.d * k + 1
+        best_key = keys[best]
+        for child in range(best + 1, min(best + self.d, self.length)):
+            if self.above(keys[child], best_key):
+                best, best_key = child, keys[child]
+        return best
 
     def sink(self, k: int) -> None:
         """
         Make the element at index k sink to the correct position.
 
         Pre-condition:
-            1 <= k <= self.length
+            0 <= k < self.length
 
         Complexity:
-            Best case complexity: O(1) - No sinking required
-            Worst case complexity: O(logn) - Sinking the root node to the bottom
+            Best case complexity: O(d) - No sinking required
+            Worst case complexity: O(d * log_d(n)) - Sinking the root node to the bottom
             n is the number of elements currently in the heap
         """
-        item: T = self.the_array[k]
+        array, keys, above, d = self.the_array, self.the_keys, self.above, self.d
+        item: T = array[k]
+        if keys is None:
+            while d * k + 1 < self.length:
+                max_child: int = self.largest_child(k)
+                if not above(array[max_child], item):
+                    break
+                array[k] = array[max_child]
+                k = max_child
+            array[k] = item
+        else:
+            item_key = keys[k]
+            while d * k + 1 < self.length:
+                max_child: int = self.largest_child(k)
+                if not above(keys[max_child], item_key):
+                    break
+                array[k] = array[max_child]
+                keys[k] = keys[max_child]
+                k = max_child
+            array[k] = item
+            keys[k] = item_key
 
-        while 2 * k <= self.length:
-            max_child: int = self.largest_child(k)
-            if self.the_array[max_child] <= item:
-                break
-            self.the_array[k] = self.the_array[max_child]
-            k = max_child
+    def peek(self) -> T:
+        """
+        Returns the element at the root without removing it.
 
-        self.the_array[k] = item
+        Complexity:
+            Best/Worst case complexity: O(1)
+        """
+        if self.length == 0:
+            raise IndexError
+        return self.the_array[0]
 
     def get_max(self) -> T:
         """
-            Remove (and return) the maximum element from the heap.
+            Remove (and return) the element at the root: the maximum element, or
+            the minimum one in a min heap. The slot freed at the end of the_array is
+            cleared.
 
             Complexity:
                 Best case complexity: O(1)
-                Worst case complexity: O(logn)
+                Worst case complexity: O(d * log_d(n))
                 n is the number of elements currently in the heap
         """
         if self.length == 0:
             raise IndexError
 
-        max_elt = self.the_array[1]
+        max_elt = self.the_array[0]
         self.length -= 1
         if self.length > 0:
-            self.the_array[1] = self.the_array[self.length + 1]
-            self.sink(1)
+            self.the_array[0] = self.the_array[self.length]
+            if self.the_keys is not None:
+                self.the_keys[0] = self.the_keys[self.length]
+            self.sink(0)
+        self.the_array[self.length] = None
+        if self.the_keys is not None:
+            self.the_keys[self.length] = None
         return max_elt
 
+    # Reads better on a min heap, where the root is the minimum.
+    get_min = get_max
+
+    def pushpop(self, element: T) -> T:
+        """
+            Add the element, then remove (and return) the element at the root,
+            in a single sink. If the element belongs at the root anyway, the heap is
+            left untouched and the element is returned straight away.
+
+            Complexity:
+                Best case complexity: O(comp) - The element would be the root
+                Worst case complexity: O(d * log_d(n))
+                n is the number of elements currently in the heap
+        """
+        if self.length == 0:
+            return element
+        element_key = element if self.the_keys is None else self.key(element)
+        root_key = self.the_array[0] if self.the_keys is None else self.the_keys[0]
+        if not self.above(root_key, element_key):
+            return element
+        return self.__replace_root(element, element_key)
+
+    def replace(self, element: T) -> T:
+        """
+            Remove (and return) the element at the root, then add the element,
+            in a single sink. Unlike pushpop, the result may be larger than the element.
+
+            Complexity:
+                Best case complexity: O(d)
+                Worst case complexity: O(d * log_d(n))
+                n is the number of elements currently in the heap
+        """
+        if self.length == 0:
+            raise IndexError
+        return self.__replace_root(element, element if self.the_keys is None else self.key(element))
+
+    def __replace_root(self, element: T, element_key) -> T:
+        """
+        Puts the element (with its key) at the root, sinks it and returns the old root.
+        """
+        root = self.the_array[0]
+        self.the_array[0] = element
+        if self.the_keys is not None:
+            self.the_keys[0] = element_key
+        self.sink(0)
+        return root
+
     @staticmethod
-    def heapify(points: ArrayR[T] | ArrayList[T], overwrite_size: int = 0) -> MaxHeap[T]:
+    def heapify(points: ArrayR[T] | ArrayList[T], overwrite_size: int = 0,
+                key: Callable[[T], Any] | None = None, min_heap: bool = False,
+                d: int = DEFAULT_ARITY, in_place: bool = False) -> MaxHeap[T]:
         """
+        Builds a heap of the points.
+
+        With in_place=True, points must be an ArrayR, which becomes the heap's
+        the_array: its elements are rearranged into heap order and nothing is
+        copied (only the keys need O(n) memory, if a key is given). The heap is then
+        full, so adding to it grows it into a new array, after which points is no
+        longer used.
+
+        Raises:
+            TypeError: if in_place is True and points is not an ArrayR
+
         Complexity:
             Best case complexity: O(n)
             Worst case complexity: O(n)
             n is the number of elements inside points.
         """
-        new_heap = MaxHeap(overwrite_size or (2 * len(points) + 2))
+        new_heap = MaxHeap(1, key, min_heap, d)
+        if in_place:
+            if not isinstance(points, ArrayR):
+                raise TypeError("Only an ArrayR can be heapified in place.")
+            new_heap.the_array = points
+        else:
+            new_heap.the_array = ArrayR(max(MaxHeap.MIN_CAPACITY, overwrite_size or (2 * len(points) + 1)))
+            for i in range(len(points)):
+                new_heap.the_array[i] = points[i]
+        if key is not None:
+            new_heap.the_keys = ArrayR(len(new_heap.the_array))
+            for i in range(len(points)):
+                new_heap.the_keys[i] = key(new_heap.the_array[i])
         new_heap.length = len(points)
-        for i in range(len(points)):
-            new_heap.the_array[i + 1] = points[i]
-        for k in range(len(points), 0, -1):
+        for k in range((len(points) - 2) // d, -1, -1):
             new_heap.sink(k)
         return new_heap
 
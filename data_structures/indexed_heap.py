@@ -0,0 +1,319 @@
+"""Indexed Max Heap (priority queue with handles) implemented using arrays"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from typing import Any, Generic
+
+from data_structures.heap import MaxHeap
+from data_structures.referential_array import ArrayR, T
+
+
+class IndexedMaxHeap(Generic[T]):
+    """
+    Max heap of elements with separate, changeable priorities.
+
+    It uses the same layout as MaxHeap: a d-ary heap rooted at index 0, where the
+    children of index k are d*k + 1 to d*k + d.
+
+    add returns a handle (a small integer) for the element. The handle can later be
+    used to change the element's priority, or to remove it from anywhere in the heap.
+    This works because the heap keeps a position index from each handle to
+    its slot in the_array. Elements with equal priorities come out in the
+    order they were added.
+
+    The handle of a removed element is recycled through a free list, so the
+    index only grows to the largest number of elements held at once. A handle
+    must not be used after its element is removed: it may already belong to
+    another element.
+    """
+    MIN_CAPACITY = 1
+    REMOVED = -1
+
+    def __init__(self, max_size: int = MIN_CAPACITY, d: int = MaxHeap.DEFAULT_ARITY) -> None:
+        """
+        Args:
+            max_size(int): The initial capacity of the heap, which grows as needed
+            d(int): The number of children of each node
+
+        Raises:
+            ValueError: if d is smaller than 2
+
+        Complexity:
+            Best/Worst case complexity: O(n) where n is max_size.
+        """
+        if d < 2:
+            raise ValueError("A heap node should have at least 2 children.")
+        capacity = max(self.MIN_CAPACITY, max_size)
+        self.length: int = 0
+        self.d = d
+        # Handles in heap order, rooted at index 0
+        self.the_array: ArrayR[int] = ArrayR(capacity)
+        # Per handle: element, priority, position in the_array (REMOVED once out of the heap)
+        # and the number of adds before it, which breaks ties between equal priorities
+        self.elements: ArrayR[T] = ArrayR(capacity)
+        self.priorities: ArrayR[Any] = ArrayR(capacity)
+        self.positions: ArrayR[int] = ArrayR(capacity)
+        self.sequence: ArrayR[int] = ArrayR(capacity)
+        # Number of handles ever issued, the first free_count of free_handles are free again
+        self.handle_count: int = 0
+        self.free_handles: ArrayR[int] = ArrayR(capacity)
+        self.free_count: int = 0
+        self.add_count: int = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def is_empty(self) -> bool:
+        return self.length == 0
+
+    def __grow_handles(self) -> None:
+        """
+        Doubles the room for handles.
+
+        Only called when every handle issued is in use, so there are no free handles to copy.
+
+        Complexity:
+            Best/Worst case complexity: O(h) where h is the number of handles issued.
+        """
+        capacity = 2 * len(self.elements)
+        elements, priorities = ArrayR(capacity), ArrayR(capacity)
+        positions, sequence = ArrayR(capacity), ArrayR(capacity)
+        for handle in range(self.handle_count):
+            elements[handle] = self.elements[handle]
+            priorities[handle] = self.priorities[handle]
+            positions[handle] = self.positions[handle]
+            sequence[handle] = self.sequence[handle]
+        self.elements, self.priorities, self.positions, self.sequence = elements, priorities, positions, sequence
+        self.free_handles = ArrayR(capacity)
+
+    def __grow_heap(self) -> None:
+        """
+        Doubles the capacity of the_array.
+
+        Complexity:
+            Best/Worst case complexity: O(n) where n is the number of elements in the heap.
+        """
+        new_array = ArrayR(2 * len(self.the_array))
+        for k in range(self.length):
+            new_array[k] = self.the_array[k]
+        self.the_array = new_array
+
+    def __above(self, handle1: int, handle2: int) -> bool:
+        """
+        Returns True if handle1 belongs closer to the root than handle2:
+        it has a higher priority, or the same priority and was added first.
+
+        Complexity:
+            O(comp) where comp is the cost of comparing two priorities
+        """
+        priority1, priority2 = self.priorities[handle1], self.priorities[handle2]
+        return priority1 > priority2 or (priority1 == priority2 and self.sequence[handle1] < self.sequence[handle2])
+
+    def __place(self, k: int, handle: int) -> None:
+        self.the_array[k] = handle
+        self.positions[handle] = k
+
+    def rise(self, k: int) -> None:
+        """
+        Rise the handle at index k to its correct position.
+
+        Pre-condition:
+            0 <= k < self.length
+
+        Complexity:
+            Best case complexity: O(1) - Rising the root element
+            Worst case complexity: O(log_d(n) * comp) - Rising a leaf element
+            n is the number of elements currently in the heap
+        """
+        handle = self.the_array[k]
+        while k > 0 and self.__above(handle, self.the_array[(k - 1) // self.d]):
+            parent = (k - 1) // self.d
+            self.__place(k, self.the_array[parent])
+            k = parent
+        self.__place(k, handle)
+
+    def largest_child(self, k: int) -> int:
+        """
+        Returns the index of k's child that belongs closest to the root.
+
+        Pre-condition:
+            0 <= k and d*k + 1 < self.length
+
+        Complexity:
+            O(d * comp) where comp is the cost of comparing two priorities
+        """
+        best = self.d * k + 1
+        for child in range(best + 1, min(best + self.d, self.length)):
+            if self.__above(self.the_array[child], self.the_array[best]):
+                best = child
+        return best
+
+    def sink(self, k: int) -> None:
+        """
+        Make the handle at index k sink to the correct position.
+
+        Pre-condition:
+            0 <= k < self.length
+
+        Complexity:
+            Best case complexity: O(d * comp) - No sinking required
+            Worst case complexity: O(d * log_d(n) * comp) - Sinking the root node to the bottom
+            n is the number of elements currently in the heap
+        """
+        handle = self.the_array[k]
+        while self.d * k + 1 < self.length:
+            max_child = self.largest_child(k)
+            if not self.__above(self.the_array[max_child], handle):
+                break
+            self.__place(k, self.the_array[max_child])
+            k = max_child
+        self.__place(k, handle)
+
+    def add(self, element: T, priority: Any) -> int:
+        """
+        Adds the element with the given priority and returns its handle, reusing
+        the handle of a removed element if there is one.
+
+        Complexity:
+            Best case complexity: O(1) - No rising required
+            Worst case complexity: O(log_d(n) * comp) - New largest priority (rises to the root),
+                plus O(n) when the heap has to grow (O(1) amortised)
+            n is the number of elements currently in the heap
+        """
+        if self.free_count > 0:
+            self.free_count -= 1
+            handle = self.free_handles[self.free_count]
+        else:
+            if self.handle_count == len(self.elements):
+                self.__grow_handles()
+            handle = self.handle_count
+            self.handle_count += 1
+        if self.length == len(self.the_array):
+            self.__grow_heap()
+
+        self.elements[handle] = element
+        self.priorities[handle] = priority
+        self.sequence[handle] = self.add_count
+        self.add_count += 1
+        self.__place(self.length, handle)
+        self.length += 1
+        self.rise(self.length - 1)
+        return handle
+
+    def contains(self, handle: int) -> bool:
+        """
+        Returns True if the element of the handle is still in the heap.
+
+        Complexity:
+            Best/Worst case complexity: O(1)
+        """
+        return 0 <= handle < self.handle_count and self.positions[handle] != self.REMOVED
+
+    def __contains__(self, handle: int) -> bool:
+        return self.contains(handle)
+
+    def __check(self, handle: int) -> None:
+        if not self.contains(handle):
+            raise KeyError(handle)
+
+    def __getitem__(self, handle: int) -> T:
+        """
+        Returns the element of the handle.
+
+        :raises KeyError: if the handle is not in the heap.
+        """
+        self.__check(handle)
+        return self.elements[handle]
+
+    def priority(self, handle: int) -> Any:
+        """
+        Returns the current priority of the handle.
+
+        :raises KeyError: if the handle is not in the heap.
+        """
+        self.__check(handle)
+        return self.priorities[handle]
+
+    def update(self, handle: int, priority: Any) -> None:
+        """
+        Changes the priority of the handle's element, moving it up or down as needed.
+
+        :raises KeyError: if the handle is not in the heap.
+
+        Complexity:
+            Best case complexity: O(1) - The element stays where it is
+            Worst case complexity: O(d * log_d(n) * comp)
+            n is the number of elements currently in the heap
+        """
+        self.__check(handle)
+        self.priorities[handle] = priority
+        k = self.positions[handle]
+        self.rise(k)
+        if self.positions[handle] == k:
+            self.sink(k)
+
+    def remove(self, handle: int) -> T:
+        """
+        Removes (and returns) the handle's element, wherever it is in the heap.
+        The handle is freed for a later add to reuse.
+
+        :raises KeyError: if the handle is not in the heap.
+
+        Complexity:
+            Best case complexity: O(1) - The last element is removed
+            Worst case complexity: O(d * log_d(n) * comp)
+            n is the number of elements currently in the heap
+        """
+        self.__check(handle)
+        k = self.positions[handle]
+        self.length -= 1
+        last = self.the_array[self.length]
+        self.the_array[self.length] = None
+        self.positions[handle] = self.REMOVED
+        if k < self.length:
+            self.__place(k, last)
+            self.rise(k)
+            if self.positions[last] == k:
+                self.sink(k)
+
+        element = self.elements[handle]
+        self.elements[handle] = None
+        self.priorities[handle] = None
+        self.free_handles[self.free_count] = handle
+        self.free_count += 1
+        return element
+
+    def peek_handle(self) -> int:
+        """
+        Returns the handle with the highest priority, without removing it.
+
+        :raises IndexError: if the heap is empty.
+
+        Complexity:
+            Best/Worst case complexity: O(1)
+        """
+        if self.length == 0:
+            raise IndexError
+        return self.the_array[0]
+
+    def peek(self) -> T:
+        """
+        Returns the element with the highest priority, without removing it.
+
+        :raises IndexError: if the heap is empty.
+        """
+        return self.elements[self.peek_handle()]
+
+    def get_max(self) -> T:
+        """
+        Remove (and return) the element with the highest priority.
+
+        :raises IndexError: if the heap is empty.
+
+        Complexity:
+            Best case complexity: O(1)
+            Worst case complexity: O(d * log_d(n) * comp)
+            n is the number of elements currently in the heap
+        """
+        return self.remove(self.peek_handle())
@@ -0,0 +1,212 @@
+""" Bounded LRU/LFU Cache.
+
+Defines a cache holding at most `capacity` entries, built from a LinearProbeTable
+index over the nodes of intrusive doubly linked lists.
+"""
+from __future__ import annotations
+
+from typing import Callable, Generic, TypeVar
+
+from data_structures.hash_table_linear_probing import LinearProbeTable
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class CacheNode(Generic[K, V]):
+    """ Doubly linked node holding a cache entry and how often it was used. """
+
+    def __init__(self, key: K = None, value: V = None) -> None:
+        """
+        Creates an unlinked node, or a list sentinel if no key is given.
+        :complexity: O(1)
+        """
+        self.key = key
+        self.value = value
+        self.frequency = 1
+        self.previous = self
+        self.next = self
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Bounded LRU/LFU Cache.
+
+    The index maps each key to its node. Nodes live in circular doubly linked
+    lists with a sentinel, most recently used first, one list per use count.
+    In LRU mode every node keeps a use count of 1, so there is a single list and
+    the least recently used entry is evicted. With lfu=True, each hit moves the
+    node to the list of its new count and the least recently used entry among
+    the least frequently used ones is evicted.
+
+    Keys must be hashable by the index (see key_hash), e.g. strings, numbers
+    and tuples of them.
+
+    attributes:
+        capacity: maximum number of entries
+        hits: number of lookups that found their key
+        misses: number of lookups that did not
+        evictions: number of entries dropped to make room
+
+    Unless stated otherwise, all methods have O(1) expected complexity,
+    plus hashing the key.
+    """
+
+    def __init__(self, capacity: int, lfu: bool = False) -> None:
+        """
+        :param capacity: maximum number of entries.
+        :param lfu: evict the least frequently used entry instead of the least recently used.
+        :raises ValueError: if capacity is not positive.
+        """
+        if capacity <= 0:
+            raise ValueError("Capacity should be larger than 0.")
+
+        self.capacity = capacity
+        self.lfu = lfu
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__index: LinearProbeTable[K, CacheNode[K, V]] = LinearProbeTable(expected_size=capacity)
+        self.__lists: LinearProbeTable[int, CacheNode[K, V]] = LinearProbeTable()
+        self.__min_frequency = 1
+
+    def __len__(self) -> int:
+        return len(self.__index)
+
+    def is_empty(self) -> bool:
+        return len(self.__index) == 0
+
+    def __contains__(self, key: K) -> bool:
+        """
+        Checks whether the key is cached, without counting as a use, hit or miss.
+        """
+        return key in self.__index
+
+    def __link(self, node: CacheNode[K, V]) -> None:
+        """
+        Links the node at the front of the list of its use count.
+        """
+        if node.frequency in self.__lists:
+            sentinel = self.__lists[node.frequency]
+        else:
+            sentinel = CacheNode()
+            self.__lists[node.frequency] = sentinel
+        node.previous = sentinel
+        node.next = sentinel.next
+        sentinel.next.previous = node
+        sentinel.next = node
+
+    def __unlink(self, node: CacheNode[K, V]) -> bool:
+        """
+        Unlinks the node from its list, dropping the list if it becomes empty.
+        Returns True if it did.
+        """
+        node.previous.next = node.next
+        node.next.previous = node.previous
+        if node.next is node.previous:
+            # Only the sentinel is left.
+            del self.__lists[node.frequency]
+            return True
+        return False
+
+    def __touch(self, node: CacheNode[K, V]) -> None:
+        """
+        Records a use of the node, moving it to the front of its (new) list.
+        """
+        emptied = self.__unlink(node)
+        if self.lfu:
+            if emptied and self.__min_frequency == node.frequency:
+                self.__min_frequency += 1
+            node.frequency += 1
+        self.__link(node)
+
+    def get(self, key: K, default: V = None) -> V:
+        """
+        Returns the value cached for key (recording a hit and a use), or default
+        (recording a miss).
+        """
+        try:
+            node = self.__index[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.__touch(node)
+        return node.value
+
+    def put(self, key: K, value: V) -> None:
+        """
+        Caches value under key, evicting an entry if the cache is full.
+        Updating a cached key counts as a use of it.
+        """
+        if key in self.__index:
+            node = self.__index[key]
+            node.value = value
+            self.__touch(node)
+            return
+
+        if len(self.__index) >= self.capacity:
+            self.__evict()
+        node = CacheNode(key, value)
+        self.__index[key] = node
+        self.__min_frequency = 1
+        self.__link(node)
+
+    def __evict(self) -> None:
+        """
+        Drops the least recently used entry of the lowest use count.
+        """
+        victim = self.__lists[self.__min_frequency].previous
+        self.__unlink(victim)
+        del self.__index[victim.key]
+        self.evictions += 1
+
+    def cached(self, key: K, compute: Callable[[], V]) -> V:
+        """
+        Returns the value cached for key, computing and caching it on a miss.
+        :complexity: O(1) on a hit, O(compute) on a miss.
+        """
+        try:
+            node = self.__index[key]
+        except KeyError:
+            self.misses += 1
+            value = compute()
+            self.put(key, value)
+            return value
+        self.hits += 1
+        self.__touch(node)
+        return node.value
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Removes the entry for key.
+        :complexity: O(1) expected, O(F) if it was the last entry of the lowest
+            use count, where F is the number of distinct use counts.
+        :raises KeyError: when the key is not cached.
+        """
+        node = self.__index[key]
+        if self.__unlink(node) and self.__min_frequency == node.frequency and not self.__lists.is_empty():
+            self.__min_frequency = min(self.__lists.iter_keys())
+        del self.__index[key]
+
+    def clear(self) -> None:
+        """
+        Removes every entry, keeping the statistics.
+        :complexity: O(capacity) to allocate a new index.
+        """
+        self.__index = LinearProbeTable(expected_size=self.capacity)
+        self.__lists = LinearProbeTable()
+        self.__min_frequency = 1
+
+    def hit_rate(self) -> float:
+        """
+        Returns the fraction of lookups that were hits.
+        """
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+    def __str__(self) -> str:
+        return "LRUCache(" + str(len(self)) + "/" + str(self.capacity) + ", hits: " + str(self.hits) + \
+            ", misses: " + str(self.misses) + ", evictions: " + str(self.evictions) + ")"
@@ -36,7 +36,7 @@ class ArrayR(Generic[T]):
         if length < 0:
             raise ValueError("Array length cannot be negative.")
         self.array = (length * py_object)()  # initialises the space
-        self.array[:] = [None for _ in range(length)]
+        self.array[:] = [None] * length
 
     def __len__(self) -> int:
         """ Returns the length of the array
@@ -65,7 +65,9 @@ class ArrayR(Generic[T]):
         """
         if len(lst) == 0:
             return None
-        new_array = cls(len(lst))
+        # Skip initialising to None, every reference is overwritten by the list.
+        new_array = cls.__new__(cls)
+        new_array.array = (len(lst) * py_object)()
         new_array.array[:] = lst
         return new_array
 
@@ -73,7 +75,7 @@ class ArrayR(Generic[T]):
         """ Returns a list representation of the array
         :complexity: O(n) where n is the length of the array
         """
-        return [self.array[i] for i in range(len(self))]
+        return self.array[:]
 
     def __str__(self) -> str:
         """ Returns a string representation of the array
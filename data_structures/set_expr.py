@@ -0,0 +1,166 @@
+""" Lazy Set Expressions.
+
+Defines SetExpr, a tree of union, intersection and difference operations over
+sets that is evaluated element by element when it is read, instead of building
+a new set for every operator.
+"""
+from __future__ import annotations
+from typing import Generic, Iterator, TypeVar
+
+from data_structures.referential_array import ArrayR
+
+T = TypeVar('T')
+
+
+class SetExpr(Generic[T]):
+    """
+    Lazy expression over sets.
+
+    Combining expressions with |, & and - builds a tree of operations instead of
+    materialising intermediate sets. The tree is evaluated in a single pass when the
+    expression is iterated, measured with len or queried with `in`.
+    Any object supporting `in`, `len` and iteration (e.g. ArraySet or BitVectorSet)
+    can be used as an operand.
+
+    Create one with Set.lazy() or SetExpr.of(a_set).
+
+    Each node records an upper bound on its size when it is built. The bound only
+    picks which operand drives an intersection, so operands changing afterwards
+    may make evaluation slower, but never change its result.
+    """
+
+    LEAF = 0
+    UNION = 1
+    INTERSECTION = 2
+    DIFFERENCE = 3
+
+    def __init__(self, op: int, left, right=None) -> None:
+        """
+        :complexity: O(1)
+        """
+        self.op = op
+        self.left = left
+        self.right = right
+        if op == SetExpr.LEAF:
+            self.__size_bound = len(left)
+        elif op == SetExpr.UNION:
+            self.__size_bound = left.size_bound() + right.size_bound()
+        elif op == SetExpr.INTERSECTION:
+            self.__size_bound = min(left.size_bound(), right.size_bound())
+        else:
+            self.__size_bound = left.size_bound()
+
+    @staticmethod
+    def of(operand) -> SetExpr[T]:
+        """ Wraps a set (or returns an expression unchanged). """
+        if isinstance(operand, SetExpr):
+            return operand
+        return SetExpr(SetExpr.LEAF, operand)
+
+    def __contains__(self, item: T) -> bool:
+        """
+        True if the item is in the result of the expression.
+        Short-circuits as soon as the answer is known.
+        :complexity: O(sum of membership tests of the operands) in the worst case.
+        """
+        if self.op == SetExpr.LEAF:
+            return item in self.left
+        elif self.op == SetExpr.UNION:
+            return item in self.left or item in self.right
+        elif self.op == SetExpr.INTERSECTION:
+            return item in self.left and item in self.right
+        else:
+            return item in self.left and item not in self.right
+
+    def size_bound(self) -> int:
+        """
+        Upper bound on the number of elements in the result when the node was built,
+        used to pick which operand drives iteration of an intersection.
+        :complexity: O(1), the bound is computed once per node by __init__.
+        """
+        return self.__size_bound
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        Yields each element of the result exactly once, without building intermediate sets.
+        Intersections are driven by the operand with the smallest size bound.
+        """
+        if self.op == SetExpr.LEAF:
+            yield from self.left
+        elif self.op == SetExpr.UNION:
+            yield from self.left
+            for item in self.right:
+                if item not in self.left:
+                    yield item
+        elif self.op == SetExpr.INTERSECTION:
+            if self.left.size_bound() <= self.right.size_bound():
+                driver, other = self.left, self.right
+            else:
+                driver, other = self.right, self.left
+            for item in driver:
+                if item in other:
+                    yield item
+        else:
+            for item in self.left:
+                if item not in self.right:
+                    yield item
+
+    def __len__(self) -> int:
+        """
+        Number of elements in the result.
+        :complexity: O(cost of one full iteration)
+        """
+        res = 0
+        for _ in self:
+            res += 1
+        return res
+
+    def is_empty(self) -> bool:
+        """ True if the result is empty. Stops at the first element found. """
+        for _ in self:
+            return False
+        return True
+
+    def values(self) -> ArrayR[T]:
+        """
+        Returns the elements of the result as an array.
+        :complexity: O(cost of one full iteration)
+        """
+        items = list(iter(self))
+        res = ArrayR(len(items))
+        for i in range(len(items)):
+            res[i] = items[i]
+        return res
+
+    def materialise(self, target):
+        """
+        Adds every element of the result to the given (empty) set and returns it.
+        :complexity: O(cost of one full iteration + N*add) where N is the result size.
+        """
+        for item in self:
+            target.add(item)
+        return target
+
+    def __or__(self, other) -> SetExpr[T]:
+        return SetExpr(SetExpr.UNION, self, SetExpr.of(other))
+
+    def __and__(self, other) -> SetExpr[T]:
+        return SetExpr(SetExpr.INTERSECTION, self, SetExpr.of(other))
+
+    def __sub__(self, other) -> SetExpr[T]:
+        return SetExpr(SetExpr.DIFFERENCE, self, SetExpr.of(other))
+
+    def __ror__(self, other) -> SetExpr[T]:
+        return SetExpr(SetExpr.UNION, SetExpr.of(other), self)
+
+    def __rand__(self, other) -> SetExpr[T]:
+        return SetExpr(SetExpr.INTERSECTION, SetExpr.of(other), self)
+
+    def __rsub__(self, other) -> SetExpr[T]:
+        return SetExpr(SetExpr.DIFFERENCE, SetExpr.of(other), self)
+
+    def __str__(self) -> str:
+        elems = []
+        for item in self:
+            elems.append(str(item) if type(item) != str else f"'{item}'")
+        return '{' + ', '.join(elems) + '}'
@@ -5,16 +5,24 @@ from betterbst import BetterBST
 
 
 class MinecraftChecklist:
-    def __init__(self, blocks: ArrayR[MinecraftBlock]) -> None:
+    def __init__(self, blocks: ArrayR[MinecraftBlock], bloom_size: int = 0, cache_size: int = 0) -> None:
         """
         Initializes the MinecraftChecklist instance with a list of blocks.
 
+        Args:
+            blocks: The blocks to put on the checklist.
+            bloom_size: Number of counters in the optional Bloom filter used to answer
+                negative membership queries without touching the tree. 0 disables it.
+            cache_size: Number of query results (sorted and optimal blocks) memoised in an
+                LRU cache, which is cleared whenever a block is added or removed. 0 disables it.
+
         Complexity:
             Best Case Complexity: O(nlogn)
             Worst Case Complexity: O(nlogn)
 
         Justification:
             Creating and populating BetterBST requires O(nlogn) time complexity.
+            Filling the Bloom filter costs O(k) per block, where k is the number of hashes.
         """
         # Convert blocks to tuple form, for BetterBST
         elements = ArrayList(len(blocks))
@@ -27,17 +35,36 @@ class MinecraftChecklist:
         self.checklist = BetterBST(elements)
         self.blocks_count = len(blocks)
 
+        # Optional counting Bloom filter over block names, kept in sync by add/remove
+        self.bloom = None
+        self.bloom_rejections = 0
+        self.bloom_false_positives = 0
+        if bloom_size > 0:
+            self.bloom = CountingBloomFilter(bloom_size)
+            for i in range(len(blocks)):
+                self.bloom.add(blocks[i].name)
+
+        # Optional cache of query results, invalidated by add/remove
+        self.cache = None
+        if cache_size > 0:
+            self.cache = LRUCache(cache_size)
+
     def __contains__(self, block: MinecraftBlock) -> bool:
         """
         Checks if the item is in the checklist.
 
         Complexity:
-            Best Case Complexity: O(1)，If the first comparison is found.
+            Best Case Complexity: O(1)，If the first comparison is found, or the Bloom filter rejects the block.
             Worst Case Complexity: O(n)，All nodes need to be compared.
 
         Justification:
             Traverse the tree to find the corresponding block, as the value/hardness ratio is used as the key.
+            With a Bloom filter, blocks that are definitely absent are rejected after O(k) hashes.
         """
+        if self.bloom is not None and block.name not in self.bloom:
+            self.bloom_rejections += 1
+            return False
+
         ratio = block.item.value / block.hardness
 
         # Use the filter function to find all nodes at a specific key value
@@ -51,6 +78,8 @@ class MinecraftChecklist:
             if b == block:
                 return True
 
+        if self.bloom is not None:
+            self.bloom_false_positives += 1
         return False
 
     def __len__(self) -> int:
@@ -84,6 +113,11 @@ class MinecraftChecklist:
         self.checklist[ratio] = block
         self.blocks_count += 1
 
+        if self.bloom is not None:
+            self.bloom.add(block.name)
+        if self.cache is not None:
+            self.cache.clear()
+
     def remove_block(self, block: MinecraftBlock) -> None:
         """
         Removes a block from the checklist.
@@ -94,7 +128,12 @@ class MinecraftChecklist:
 
         Justification:
             The complexity of searching and deleting nodes in the balanced BST is O(logn).
+            With a Bloom filter, blocks that are definitely absent are rejected after O(k) hashes.
         """
+        if self.bloom is not None and block.name not in self.bloom:
+            self.bloom_rejections += 1
+            raise ValueError(f"Block {block} not in the checklist")
+
         # Calculate the value/hardness ratio
         ratio = block.item.value / block.hardness
 
@@ -110,11 +149,35 @@ class MinecraftChecklist:
                 # Remove the block from the tree
                 del self.checklist[k]
                 self.blocks_count -= 1
+                if self.bloom is not None:
+                    self.bloom.remove(block.name)
+                if self.cache is not None:
+                    self.cache.clear()
                 return
 
+        if self.bloom is not None:
+            self.bloom_false_positives += 1
+
         # If the block is not in the list, an exception is thrown
         raise ValueError(f"Block {block} not in the checklist")
 
+    def bloom_false_positive_rate(self) -> float:
+        """
+        Returns the measured false positive rate of the Bloom filter, i.e. the fraction of
+        queries for absent blocks that the filter failed to reject.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+
+        Justification:
+            Only the stored counters are read.
+        """
+        negatives = self.bloom_rejections + self.bloom_false_positives
+        if negatives == 0:
+            return 0.0
+        return self.bloom_false_positives / negatives
+
     def get_sorted_blocks(self) -> ArrayR[MinecraftBlock]:
         """
         Returns the sorted blocks in the checklist.
@@ -125,6 +188,26 @@ class MinecraftChecklist:
 
         Justification:
             The complexity of the medium-order traversal BST is O(n).
+            With a cache, repeated calls copy the memoised array in O(n) without traversing
+            the tree. Callers get their own copy and may modify it.
+        """
+        if self.cache is not None:
+            return self.__copy(self.cache.cached(("sorted",), self.__get_sorted_blocks))
+        return self.__get_sorted_blocks()
+
+    @staticmethod
+    def __copy(blocks: ArrayR[MinecraftBlock]) -> ArrayR[MinecraftBlock]:
+        """
+        Copies a memoised result, so that callers never modify the cached array.
+        :complexity: O(n) where n is the length of blocks.
+        """
+        if len(blocks) == 0:
+            return ArrayR(0)
+        return ArrayR.from_list(blocks.to_list())
+
+    def __get_sorted_blocks(self) -> ArrayR[MinecraftBlock]:
+        """
+        Traverses the tree in order, see get_sorted_blocks.
         """
         # Use medium-order traversal to get sorted elements
         result = ArrayR(len(self))
@@ -153,11 +236,22 @@ class MinecraftChecklist:
 
         Justification:
             With filter_keys approach, most of the subtrees can be skipped in the best case.
+            With a cache, repeated calls for the same pair of ratios copy the memoised
+            array in O(k) for k results. Callers get their own copy and may modify it.
         """
         # Calculate the value/hardness ratio of two squares
         ratio1 = block1.item.value / block1.hardness
         ratio2 = block2.item.value / block2.hardness
 
+        if self.cache is not None:
+            return self.__copy(self.cache.cached(("optimal", ratio1, ratio2),
+                                                 lambda: self.__get_optimal_blocks(ratio1, ratio2)))
+        return self.__get_optimal_blocks(ratio1, ratio2)
+
+    def __get_optimal_blocks(self, ratio1: float, ratio2: float) -> ArrayR[MinecraftBlock]:
+        """
+        Collects the blocks whose ratio is strictly between ratio1 and ratio2, see get_optimal_blocks.
+        """
         # Use filter_keys to filter for squares whose ratios are within range
         filtered_blocks = self.checklist.filter_keys(
             lambda x: x > ratio1,  # The ratio is greater than block1
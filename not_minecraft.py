@@ -8,13 +8,16 @@ from miner import Miner
 
 
 class NotMinecraft:
-    def __init__(self, cave_system: CaveSystem, checklist: MinecraftChecklist) -> None:
+    def __init__(self, cave_system: CaveSystem, checklist: MinecraftChecklist, cache_size: int = 0) -> None:
         """
         Initialize the NotMinecraft class, set up the miner, cave system, and manifest.
 
         Args:
             cave_system: An object that represents a cave system.
             checklist: Represents an object that is a list of miners.
+            cache_size: Number of filtered cave explorations memoised in an LRU cache,
+                keyed on the reference ratios. 0 disables it. Call invalidate_cache()
+                after changing the cave system.
 
         Complexity:
             Best Case Complexity: O(1)
@@ -27,6 +30,23 @@ class NotMinecraft:
         self.miner = Miner("Steve")
         self.cave_system = cave_system
         self.checklist = checklist
+        self.cache = None
+        if cache_size > 0:
+            self.cache = LRUCache(cache_size)
+
+    def invalidate_cache(self) -> None:
+        """
+        Forgets every memoised result, e.g. after the cave system changed.
+
+        Complexity:
+            Best Case Complexity: O(c)
+            Worst Case Complexity: O(c)
+
+        Justification:
+            A new cache index of the cache capacity c is allocated.
+        """
+        if self.cache is not None:
+            self.cache.clear()
 
     def get_inventory_items(self) -> ArrayList:
         """
@@ -107,19 +127,32 @@ class NotMinecraft:
         Justification:
             The method calls dfs_explore_cave() and objective_mining_filter(), the former with a complexity that is not taken into account, and the latter which has a complexity of O(n).
             In objective_mining_filter(), all the squares need to be traversed to check their value/hardness ratio, which requires the time complexity of O(n), where n is the length of the list of blocks.
+            With a cache, exploring and filtering the cave again for the same reference ratios is skipped,
+            only the cached filtered blocks are copied in O(n).
         """
-        # If no list of blocks is provided, DFS is performed to explore the cave
-        if blocks is None:
-            blocks = self.dfs_explore_cave()
-
         # If no reference block is provided, the default value is used
         if block1 is None:
             block1 = MinecraftBlock("Stone", 1.5, "Stone Item", 1)
         if block2 is None:
             block2 = MinecraftBlock("Diamond", 3, "Diamond Item", 100)
 
-        # Filter blocks
-        filtered_blocks = self.objective_mining_filter(blocks, block1, block2)
+        if blocks is None and self.cache is not None:
+            # Exploring the cave gives the same blocks every time, so the filtered
+            # blocks only depend on the reference ratios
+            key = ("cave", block1.item.value / block1.hardness, block2.item.value / block2.hardness)
+            cached_blocks = self.cache.cached(
+                key, lambda: self.objective_mining_filter(self.dfs_explore_cave(), block1, block2))
+            # Mine a copy, so that the cached list is never handed out
+            filtered_blocks = ArrayList(len(cached_blocks))
+            for i in range(len(cached_blocks)):
+                filtered_blocks.append(cached_blocks[i])
+        else:
+            # If no list of blocks is provided, DFS is performed to explore the cave
+            if blocks is None:
+                blocks = self.dfs_explore_cave()
+
+            # Filter blocks
+            filtered_blocks = self.objective_mining_filter(blocks, block1, block2)
 
         # Dig through filtered blocks
         self.objective_mining(filtered_blocks)
@@ -229,7 +262,13 @@ class NotMinecraft:
             time_limit: Time limit for mining in seconds
 
         Complexity:
-            Not required
+            Best Case Complexity: O(n log n)
+            Worst Case Complexity: O(n log n)
+
+        Justification:
+            Every block is added to a max heap once, and taken out of it once, either to be mined or
+            because it no longer fits in the time left, each costing O(log n), where n is the length of blocks.
+            Previously, every mined block needed a scan of all the remaining blocks, which is O(n^2).
         """
 
         # Create an indexable stack to replace the original stack
@@ -255,58 +294,35 @@ class NotMinecraft:
         # Empty miner inventory
         self.miner.inventory.clear()
 
-        # Convert blocks into lists for multiple operations
-        remaining_blocks = ArrayList(len(blocks))
+        # Positions in blocks ordered by value/hardness ratio, and those of the blocks whose ratio
+        # is no more than -1, which are only mined (least hard first) when no other block fits in
+        # the time left. Ties go to the block found first.
+        by_ratio = MaxHeap(len(blocks), key=lambda i: (blocks[i].item.value / blocks[i].hardness, -i))
+        by_hardness = MaxHeap(key=lambda i: (-blocks[i].hardness, -i))
         for i in range(len(blocks)):
-            remaining_blocks.append(blocks[i])
+            block = blocks[i]
+            if block.item.value / block.hardness > -1:
+                by_ratio.add(i)
+            else:
+                by_hardness.add(i)
 
         # Keep a record of the time remaining
         remaining_time = time_limit
 
         # Mining by value/hardness ratio
-        while remaining_time > 0 and len(remaining_blocks) > 0:
-            # Find the best block at the moment
-            best_ratio = -1
-            best_index = -1
-
-            for i in range(len(remaining_blocks)):
-                block = remaining_blocks[i]
-                ratio = block.item.value / block.hardness
-
-                # If you find a block with a higher ratio that can be mined
-                if ratio > best_ratio and block.hardness <= remaining_time:
-                    best_ratio = ratio
-                    best_index = i
-
-            # If a suitable block is found, mine it
-            if best_index != -1:
-                best_block = remaining_blocks[best_index]
-                self.miner.mine(best_block)
-                remaining_time -= best_block.hardness
-
-                # Removes mined blocks from the remaining blocks
-                remaining_blocks[best_index] = remaining_blocks[len(remaining_blocks) - 1]
-                remaining_blocks.delete_at_index(len(remaining_blocks) - 1)
-            else:
+        while remaining_time > 0 and len(by_ratio) + len(by_hardness) > 0:
+            # The time left only decreases, so a block that does not fit now never will
+            while len(by_ratio) > 0 and blocks[by_ratio.peek()].hardness > remaining_time:
+                by_ratio.get_max()
+
+            if len(by_ratio) > 0:
+                best_block = blocks[by_ratio.get_max()]
+            elif len(by_hardness) > 0 and blocks[by_hardness.peek()].hardness <= remaining_time:
                 # If you don't find a block to mine, try to mine the block with the lowest hardness
-                min_hardness = float('inf')
-                min_index = -1
-
-                for i in range(len(remaining_blocks)):
-                    block = remaining_blocks[i]
-                    if block.hardness < min_hardness and block.hardness <= remaining_time:
-                        min_hardness = block.hardness
-                        min_index = i
-
-                # If a suitable block is found, mine it
-                if min_index != -1:
-                    min_block = remaining_blocks[min_index]
-                    self.miner.mine(min_block)
-                    remaining_time -= min_block.hardness
-
-                    # Removes mined blocks from the remaining blocks
-                    remaining_blocks[min_index] = remaining_blocks[len(remaining_blocks) - 1]
-                    remaining_blocks.delete_at_index(len(remaining_blocks) - 1)
-                else:
-                    # Unable to mine any blocks, exit the loop
-                    break
\ No newline at end of file
+                best_block = blocks[by_hardness.get_max()]
+            else:
+                # Unable to mine any blocks, exit the loop
+                break
+
+            self.miner.mine(best_block)
+            remaining_time -= best_block.hardness
@@ -0,0 +1,113 @@
+import itertools
+import random
+from operator import itemgetter
+from unittest import TestCase
+
+from algorithms import heapsort, kway_merge, nlargest, nsmallest
+from data_structures.referential_array import ArrayR
+
+
+class TestSelection(TestCase):
+    def test_matches_sorted(self):
+        """
+        #name(nlargest and nsmallest match a stable sort)
+        """
+        rng = random.Random(0)
+        items = [(rng.randrange(10), i) for i in range(300)]
+        first = itemgetter(0)
+        for k in (0, 1, 5, 299, 300, 1000):
+            with self.subTest(k=k):
+                self.assertEqual(nlargest(k, items, key=first).to_list(), sorted(items, key=first, reverse=True)[:k])
+                self.assertEqual(nsmallest(k, items, key=first).to_list(), sorted(items, key=first)[:k])
+                self.assertEqual(nlargest(k, items).to_list(), sorted(items, reverse=True)[:k])
+
+    def test_stream(self):
+        """
+        #name(nlargest reads a generator once and never compares elements)
+        """
+        # dicts cannot be compared, so ties must be broken without them
+        stream = ({"weight": i % 7} for i in range(10000))
+        res = nlargest(3, stream, key=lambda item: item["weight"])
+        self.assertEqual([item["weight"] for item in res], [6, 6, 6])
+        self.assertEqual(len(nsmallest(-1, [])), 0)
+        self.assertEqual(len(nlargest(5, [])), 0)
+
+
+class TestHeapsort(TestCase):
+    def test_matches_sorted(self):
+        """
+        #name(heapsort sorts an ArrayR in place like sorted)
+        """
+        rng = random.Random(1)
+        for length in (0, 1, 2, 10, 500):
+            items = [rng.randrange(50) for _ in range(length)]
+            for d in (2, 4, 5):
+                with self.subTest(length=length, d=d):
+                    array = ArrayR.from_list(items) if items else ArrayR(0)
+                    self.assertIs(heapsort(array, d=d), array)
+                    self.assertEqual(array.to_list(), sorted(items))
+                    heapsort(array, reverse=True, d=d)
+                    self.assertEqual(array.to_list(), sorted(items, reverse=True))
+
+    def test_key(self):
+        """
+        #name(heapsort orders by key)
+        """
+        words = ["pear", "fig", "banana", "kiwi", "apple", "plum"]
+        array = ArrayR.from_list(words)
+        heapsort(array, key=len)
+        self.assertEqual([len(word) for word in array], sorted(len(word) for word in words))
+        self.assertEqual(sorted(array.to_list()), sorted(words))
+        heapsort(array, key=lambda word: word[-1], reverse=True)
+        self.assertEqual([word[-1] for word in array], sorted((word[-1] for word in words), reverse=True))
+
+
+class TestKwayMerge(TestCase):
+    def test_matches_sorted(self):
+        """
+        #name(kway_merge matches sorting the concatenated streams)
+        """
+        rng = random.Random(2)
+        streams = [sorted(rng.randrange(30) for _ in range(rng.randrange(40))) for _ in range(7)]
+        streams.append([])
+        self.assertEqual(list(kway_merge(streams)), sorted(value for stream in streams for value in stream))
+
+    def test_stable(self):
+        """
+        #name(kway_merge keeps equal keys in stream order, then in order within a stream)
+        """
+        rng = random.Random(3)
+        # (key, stream, position) records, sorted by key within each stream
+        streams = []
+        for stream in range(5):
+            keys = sorted(rng.randrange(6) for _ in range(20))
+            streams.append([(key, stream, position) for position, key in enumerate(keys)])
+        merged = list(kway_merge(streams, key=itemgetter(0)))
+        # sorted is stable, so equal keys keep their stream and position order
+        self.assertEqual(merged, sorted((record for stream in streams for record in stream), key=itemgetter(0)))
+
+    def test_never_compares_elements(self):
+        """
+        #name(kway_merge with a key never compares the elements)
+        """
+        streams = [[{"k": 1}, {"k": 3}], [{"k": 1}, {"k": 2}], [{"k": 3}]]
+        merged = list(kway_merge(streams, key=lambda item: item["k"]))
+        self.assertEqual([item["k"] for item in merged], [1, 1, 2, 3, 3])
+        self.assertIs(merged[0], streams[0][0])
+        self.assertIs(merged[1], streams[1][0])
+
+    def test_lazy(self):
+        """
+        #name(kway_merge reads infinite streams lazily)
+        """
+        evens = (2 * i for i in itertools.count())
+        odds = (2 * i + 1 for i in itertools.count())
+        self.assertEqual(list(itertools.islice(kway_merge([evens, odds]), 1000)), list(range(1000)))
+
+    def test_empty(self):
+        """
+        #name(kway_merge of no streams or empty streams is empty)
+        """
+        self.assertEqual(list(kway_merge([])), [])
+        self.assertEqual(list(kway_merge([[], [], []])), [])
+        self.assertEqual(list(kway_merge([[], [1, 2], []])), [1, 2])
@@ -0,0 +1,131 @@
+import random
+from unittest import TestCase
+
+from data_structures.bst import BinarySearchTree
+
+
+class TestBinarySearchTree(TestCase):
+    def assertSameContents(self, tree: BinarySearchTree, reference: dict) -> None:
+        self.assertEqual(len(tree), len(reference))
+        self.assertEqual(tree.is_empty(), len(reference) == 0)
+        self.assertEqual([(node.key, node.item) for node in tree], sorted(reference.items()))
+
+    def test_round_trip(self):
+        """
+        #name(BST matches a dict under random inserts, deletes and lookups)
+        """
+        rng = random.Random(0)
+        tree = BinarySearchTree()
+        reference = {}
+        for step in range(3000):
+            key = rng.randrange(200)
+            action = rng.random()
+            if action < 0.45:
+                if key in reference:
+                    with self.assertRaises(ValueError):
+                        tree[key] = step
+                else:
+                    tree[key] = step
+                    reference[key] = step
+            elif action < 0.75:
+                if key in reference:
+                    del tree[key]
+                    del reference[key]
+                else:
+                    with self.assertRaises(ValueError):
+                        del tree[key]
+            else:
+                self.assertEqual(key in tree, key in reference)
+                self.assertEqual(tree.get(key, "absent"), reference.get(key, "absent"))
+                if key in reference:
+                    self.assertEqual(tree[key], reference[key])
+                else:
+                    with self.assertRaises(KeyError):
+                        _ = tree[key]
+        self.assertSameContents(tree, reference)
+
+    def test_delete_paths(self):
+        """
+        #name(BST deletes leaves, nodes with one child and nodes with two children)
+        """
+        keys = [50, 30, 70, 20, 40, 60, 80, 35, 45, 65]
+        for key in keys + [50]:
+            with self.subTest(deleted=key):
+                tree = BinarySearchTree()
+                for k in keys:
+                    tree[k] = str(k)
+                reference = {k: str(k) for k in keys}
+                del tree[key]
+                del reference[key]
+                self.assertSameContents(tree, reference)
+        # 20 is a leaf, 60 has one child, 30 has two (its successor 35 is a leaf),
+        # 70 has two and its successor 80 is its right child.
+        tree = BinarySearchTree()
+        for k in keys:
+            tree[k] = str(k)
+        for key in (20, 60, 30, 70, 50):
+            del tree[key]
+        self.assertEqual([node.key for node in tree], [35, 40, 45, 65, 80])
+        self.assertEqual(tree.root.key, 65)
+
+    def test_delete_root(self):
+        """
+        #name(BST deletes its root until it is empty)
+        """
+        tree = BinarySearchTree()
+        for key in (2, 1, 3):
+            tree[key] = key
+        for _ in range(3):
+            del tree[tree.root.key]
+        self.assertTrue(tree.is_empty())
+        self.assertIsNone(tree.root)
+
+    def test_none_items(self):
+        """
+        #name(BST contains keys whose item is None)
+        """
+        tree = BinarySearchTree()
+        tree[1] = None
+        self.assertIn(1, tree)
+        self.assertNotIn(2, tree)
+        self.assertIsNone(tree.get(1, "default"))
+        self.assertEqual(tree.get(2, "default"), "default")
+        self.assertIsNone(tree.get(2))
+
+    def test_minimal_and_maximal(self):
+        """
+        #name(get_minimal and get_maximal find the extreme keys of a sub-tree)
+        """
+        tree = BinarySearchTree()
+        self.assertIsNone(tree.get_minimal(tree.root))
+        self.assertIsNone(tree.get_maximal(tree.root))
+        for key in (50, 30, 70, 20, 40, 60, 80):
+            tree[key] = key
+        self.assertEqual(tree.get_minimal(tree.root).key, 20)
+        self.assertEqual(tree.get_maximal(tree.root).key, 80)
+        self.assertEqual(tree.get_maximal(tree.root.left).key, 40)
+        self.assertEqual(tree.get_successor(tree.root).key, 60)
+
+    def test_sorted_inserts(self):
+        """
+        #name(BST handles 20k sorted keys without recursion)
+        """
+        count = 20000
+        tree = BinarySearchTree()
+        for key in range(count):
+            tree[key] = key
+        self.assertEqual(len(tree), count)
+        self.assertEqual(tree.get_maximal(tree.root).depth, count - 1)
+        self.assertEqual(tree[count - 1], count - 1)
+        self.assertIn(count // 2, tree)
+        self.assertNotIn(count, tree)
+        with self.assertRaises(ValueError):
+            tree[count - 1] = 0
+        # Deleting from the shallow end keeps the test quick on the degenerate tree
+        for key in range(0, count, 2):
+            del tree[key]
+        self.assertEqual(len(tree), count // 2)
+        self.assertEqual(tree.get_minimal(tree.root).key, 1)
+        self.assertEqual(tree.get_maximal(tree.root).key, count - 1)
+        with self.assertRaises(KeyError):
+            _ = tree[count - 2]
@@ -0,0 +1,975 @@
+import os
+import random
+import tempfile
+import threading
+from decimal import Decimal
+from fractions import Fraction
+from unittest import TestCase
+
+from data_structures.hash_functions import HASH_MODULUS, builtin_hash, key_hash, next_prime, universal_hash
+from data_structures.hash_table import LinearProbeTable as LegacyLinearProbeTable
+from data_structures.hash_table_compact import CompactHashTable
+from data_structures.hash_table_cuckoo import CuckooHashTable
+from data_structures.hash_table_linear_probing import LinearProbeTable
+from data_structures.hash_table_mapped import MappedProbeTable
+from data_structures.hash_table_perfect import StaticPerfectHashTable
+from data_structures.hash_table_robin_hood import RobinHoodProbeTable
+from data_structures.hash_table_separate_chaining import HashTableSeparateChaining
+from data_structures.hash_table_sharded import ShardedHashTable
+
+
+class HashTableTestCase(TestCase):
+    """ Shared checks comparing a hash table against a dict. """
+
+    def assertSameContents(self, table, reference: dict) -> None:
+        self.assertEqual(len(table), len(reference), "Table and reference sizes differ")
+        self.assertEqual(table.is_empty(), len(reference) == 0)
+        self.assertEqual(dict(table.items()), reference, "Table and reference pairs differ")
+        self.assertEqual(sorted(table.keys().to_list(), key=repr), sorted(reference, key=repr))
+        self.assertEqual(sorted(table.values().to_list(), key=repr), sorted(reference.values(), key=repr))
+        for key, value in reference.items():
+            self.assertIn(key, table)
+            self.assertEqual(table[key], value)
+
+    def check_round_trip(self, table, keys: list, steps: int = 2000, seed: int = 0,
+                         deletes: bool = True) -> dict:
+        """
+        Applies random inserts, updates, deletes and lookups of the given keys to the
+        table and to a dict, checking every answer, and returns the dict.
+        """
+        rng = random.Random(seed)
+        reference = {}
+        for step in range(steps):
+            key = rng.choice(keys)
+            action = rng.random()
+            if action < 0.5 or not deletes:
+                table[key] = step
+                reference[key] = step
+            elif action < 0.75:
+                if key in reference:
+                    del table[key]
+                    del reference[key]
+                else:
+                    with self.assertRaises(KeyError):
+                        del table[key]
+            else:
+                self.assertEqual(key in table, key in reference)
+                if key in reference:
+                    self.assertEqual(table[key], reference[key])
+                else:
+                    with self.assertRaises(KeyError):
+                        _ = table[key]
+        self.assertSameContents(table, reference)
+        return reference
+
+
+class CountingHash:
+    """ Hash function that counts its calls, optionally folding hashes onto a few values. """
+
+    def __init__(self, modulus: int = 0) -> None:
+        self.modulus = modulus
+        self.calls = 0
+
+    def __call__(self, key) -> int:
+        self.calls += 1
+        return key_hash(key) % self.modulus if self.modulus else key_hash(key)
+
+
+class TestHashFunctions(HashTableTestCase):
+    def test_universal_hash(self):
+        """
+        #name(universal_hash is a bounded, order sensitive string hash)
+        """
+        self.assertEqual(universal_hash(""), 0)
+        self.assertEqual(universal_hash("minecraft"), universal_hash("mine" + "craft"))
+        self.assertNotEqual(universal_hash("ab"), universal_hash("ba"))
+        for key in ("a", "key" * 100, "\u00e9t\u00e9"):
+            self.assertTrue(0 <= universal_hash(key) < HASH_MODULUS)
+
+    def test_builtin_hash(self):
+        """
+        #name(builtin_hash agrees with the built-in hash)
+        """
+        for key in ("a", 12, (1, "b")):
+            self.assertEqual(builtin_hash(key), hash(key))
+
+    def test_pluggable_hash_function(self):
+        """
+        #name(Every table works with each of the hash functions)
+        """
+        keys = ["key" + str(i) for i in range(200)]
+        for table_type in (LegacyLinearProbeTable, LinearProbeTable, RobinHoodProbeTable,
+                           HashTableSeparateChaining, CompactHashTable, CuckooHashTable):
+            for hash_function in (universal_hash, builtin_hash, key_hash, len):
+                with self.subTest(table=table_type.__name__, hash_function=hash_function):
+                    table = table_type(hash_function=hash_function)
+                    self.assertIs(table.hash_function, hash_function)
+                    for i in range(len(keys)):
+                        table[keys[i]] = i
+                    for i in range(len(keys)):
+                        self.assertEqual(table[keys[i]], i)
+                    self.assertNotIn("missing", table)
+
+    def test_legacy_table(self):
+        """
+        #name(The original LinearProbeTable matches a dict with a pluggable hash)
+        """
+        table = LegacyLinearProbeTable(hash_function=lambda key: len(key) % 5)
+        reference = {}
+        rng = random.Random(0)
+        for step in range(2000):
+            key = "k" * rng.randrange(1, 60)
+            if rng.random() < 0.6:
+                table[key] = step
+                reference[key] = step
+            elif key in reference:
+                del table[key]
+                del reference[key]
+        self.assertEqual(len(table), len(reference))
+        self.assertEqual(sorted(table.keys()), sorted(reference))
+        for key, value in reference.items():
+            self.assertEqual(table[key], value)
+
+    def test_hashes_are_cached(self):
+        """
+        #name(Resizes and cluster re-inserts reuse the cached key hashes)
+        """
+        for table_type in (LegacyLinearProbeTable, LinearProbeTable, RobinHoodProbeTable,
+                           HashTableSeparateChaining, CompactHashTable, CuckooHashTable):
+            with self.subTest(table=table_type.__name__):
+                # Few distinct hashes make long clusters for the probing tables to re-insert
+                hash_function = CountingHash(7)
+                table = table_type(hash_function=hash_function)
+                size = table.table_size
+                for i in range(300):
+                    table[str(i)] = i
+                self.assertGreater(table.table_size, size, "Expected the table to resize")
+                self.assertEqual(hash_function.calls, 300)
+                for i in range(0, 300, 3):
+                    del table[str(i)]
+                self.assertEqual(hash_function.calls, 400)
+                for i in range(1, 300, 3):
+                    self.assertEqual(table[str(i)], i)
+                self.assertEqual(hash_function.calls, 500)
+
+
+class TestRobinHoodProbeTable(HashTableTestCase):
+    def test_round_trip(self):
+        """
+        #name(Robin Hood table matches a dict under random operations)
+        """
+        keys = ["key" + str(i) for i in range(300)]
+        self.check_round_trip(RobinHoodProbeTable(), keys)
+
+    def test_colliding_keys_and_backward_shift(self):
+        """
+        #name(Robin Hood table keeps clusters searchable after deletes)
+        """
+        # Few distinct hashes make long clusters, so deletes shift many entries back.
+        table = RobinHoodProbeTable(hash_function=lambda key: len(key) % 3)
+        keys = ["k" * i for i in range(1, 60)]
+        self.check_round_trip(table, keys, seed=1)
+
+    def test_growth(self):
+        """
+        #name(Robin Hood table grows past its precomputed sizes)
+        """
+        table = RobinHoodProbeTable(sizes=[3, 7])
+        for i in range(1000):
+            table[str(i)] = i
+        self.assertEqual(len(table), 1000)
+        self.assertGreaterEqual(table.table_size, 1000)
+        for i in range(1000):
+            self.assertEqual(table[str(i)], i)
+
+
+class TestLinearProbeTable(HashTableTestCase):
+    def test_round_trip(self):
+        """
+        #name(Linear probe table matches a dict under random operations)
+        """
+        keys = ["key" + str(i) for i in range(300)]
+        self.check_round_trip(LinearProbeTable(), keys)
+
+    def test_clustered_deletes(self):
+        """
+        #name(Linear probe table re-inserts the rest of a cluster on delete)
+        """
+        table = LinearProbeTable(hash_function=lambda key: key % 3)
+        self.check_round_trip(table, list(range(100)), seed=3)
+
+    def test_growth(self):
+        """
+        #name(Linear probe table grows past its precomputed sizes)
+        """
+        table = LinearProbeTable(sizes=[3, 7])
+        for i in range(1000):
+            table[i] = str(i)
+        self.assertGreaterEqual(table.table_size, 2 * len(table))
+        self.assertSameContents(table, {i: str(i) for i in range(1000)})
+
+
+class TestTableSizing(HashTableTestCase):
+    def test_next_prime(self):
+        """
+        #name(next_prime returns the smallest prime at least n)
+        """
+        primes = [n for n in range(2, 200) if all(n % d for d in range(2, n))]
+        for n in range(-3, 198):
+            self.assertEqual(next_prime(n), min(p for p in primes if p >= n))
+        self.assertEqual(next_prime(LinearProbeTable.TABLE_SIZES[-1]), LinearProbeTable.TABLE_SIZES[-1])
+        self.assertEqual(next_prime(2 ** 31 - 2), 2 ** 31 - 1)
+
+    def test_expected_size(self):
+        """
+        #name(A table sized with expected_size loads that many keys without rehashing)
+        """
+        for count in (1, 100, 5000):
+            for incremental in (False, True):
+                with self.subTest(count=count, incremental=incremental):
+                    table = LinearProbeTable(expected_size=count, incremental=incremental)
+                    size = table.table_size
+                    for i in range(count):
+                        table[i] = i
+                    self.assertEqual(table.stats().rehash_count, 0)
+                    self.assertEqual(table.table_size, size)
+        # Without it, the same keys rehash several times
+        table = LinearProbeTable()
+        for i in range(5000):
+            table[i] = i
+        self.assertGreater(table.stats().rehash_count, 0)
+
+    def test_growth_past_table_sizes(self):
+        """
+        #name(A table keeps growing through primes once TABLE_SIZES run out)
+        """
+        last = LinearProbeTable.TABLE_SIZES[-1]
+        table = LinearProbeTable(sizes=[last])
+        table["a"] = 1
+        table.reserve(last)
+        self.assertGreater(table.table_size, last)
+        self.assertEqual(next_prime(table.table_size), table.table_size)
+        self.assertEqual(table["a"], 1)
+        self.assertGreater(LinearProbeTable(expected_size=last).table_size, 2 * last - 1)
+
+        # The same growth path with a short list of sizes, driven by inserts
+        table = LinearProbeTable(sizes=[5, 13])
+        sizes = [table.table_size]
+        for i in range(5000):
+            table[i] = i
+            if table.table_size != sizes[-1]:
+                sizes.append(table.table_size)
+        self.assertGreater(len(sizes), 5)
+        for size in sizes:
+            self.assertEqual(next_prime(size), size)
+        self.assertSameContents(table, {i: i for i in range(5000)})
+
+
+class TestLinearProbeTableModes(HashTableTestCase):
+    def test_tombstones(self):
+        """
+        #name(Tombstone deletes keep clusters searchable and get cleaned up)
+        """
+        table = LinearProbeTable(hash_function=lambda key: key % 7, tombstones=True)
+        self.check_round_trip(table, list(range(200)), steps=3000)
+        # Deleting most keys must not leave the table more than TOMBSTONE_THRESHOLD tombstones,
+        # which keeps every remaining key reachable.
+        for key in list(table.keys().to_list())[:-3]:
+            del table[key]
+        self.assertEqual(len(table), 3)
+        self.assertSameContents(table, dict(table.items()))
+
+    def test_incremental(self):
+        """
+        #name(Incremental resizing answers lookups during the migration)
+        """
+        table = LinearProbeTable(incremental=True)
+        reference = {}
+        for i in range(500):
+            table[i] = str(i)
+            reference[i] = str(i)
+            # Every key inserted so far, migrated or not, is found after each insert.
+            self.assertEqual(table[i // 2], reference[i // 2])
+            self.assertIn(0, table)
+        self.assertSameContents(table, reference)
+
+    def test_incremental_round_trip(self):
+        """
+        #name(Incremental resizing matches a dict under random operations)
+        """
+        for tombstones in (False, True):
+            with self.subTest(tombstones=tombstones):
+                table = LinearProbeTable(sizes=[3], incremental=True, tombstones=tombstones)
+                self.check_round_trip(table, list(range(400)), steps=4000, seed=2)
+
+
+class TestHashTableSeparateChaining(HashTableTestCase):
+    def test_round_trip(self):
+        """
+        #name(Separate chaining table matches a dict under random operations)
+        """
+        keys = ["key" + str(i) for i in range(300)]
+        self.check_round_trip(HashTableSeparateChaining(table_size=3), keys)
+
+    def test_growth(self):
+        """
+        #name(Separate chaining table grows to keep its load factor)
+        """
+        table = HashTableSeparateChaining(table_size=1)
+        for i in range(1000):
+            table[str(i)] = i
+        self.assertLessEqual(len(table), table.table_size * table.MAX_LOAD_FACTOR)
+        self.assertSameContents(table, {str(i): i for i in range(1000)})
+
+    def test_long_bucket(self):
+        """
+        #name(Updating and deleting in a very long bucket works in place)
+        """
+        # Every key lands in the same bucket, far longer than the recursion limit.
+        table = HashTableSeparateChaining(hash_function=lambda key: 7)
+        reference = {}
+        for i in range(3000):
+            table[str(i)] = i
+            reference[str(i)] = i
+        for i in range(0, 3000, 2):
+            table[str(i)] = -i
+            reference[str(i)] = -i
+        for key in ("0", "1500", "2999", "1"):
+            del table[key]
+            del reference[key]
+        with self.assertRaises(KeyError):
+            del table["0"]
+        self.assertSameContents(table, reference)
+
+    def test_bucket_shrinks_back_to_inline(self):
+        """
+        #name(A bucket emptied down to one entry keeps working)
+        """
+        table = HashTableSeparateChaining(table_size=7, hash_function=lambda key: 3)
+        for key in ("a", "b", "c"):
+            table[key] = key
+        self.assertEqual(table.stats().max_run, 3)
+        del table["a"]
+        del table["c"]
+        self.assertEqual(table.stats().max_run, 1)
+        self.assertSameContents(table, {"b": "b"})
+        table["b"] = "updated"
+        table["d"] = "d"
+        self.assertSameContents(table, {"b": "updated", "d": "d"})
+        del table["b"]
+        del table["d"]
+        self.assertSameContents(table, {})
+        with self.assertRaises(KeyError):
+            del table["b"]
+
+
+class TestBulkOperations(HashTableTestCase):
+    TABLES = (LinearProbeTable, RobinHoodProbeTable, HashTableSeparateChaining)
+
+    def test_from_items_and_update(self):
+        """
+        #name(from_items and update match per-key inserts, later pairs winning)
+        """
+        pairs = [("key" + str(i % 700), i) for i in range(1000)]
+        for table_type in self.TABLES:
+            with self.subTest(table=table_type.__name__):
+                table = table_type.from_items(pairs)
+                self.assertSameContents(table, dict(pairs))
+                # update also takes a generator, whose length is unknown
+                more = [("key" + str(i), -i) for i in range(500, 900)]
+                table.update(pair for pair in more)
+                self.assertSameContents(table, {**dict(pairs), **dict(more)})
+
+    def test_from_items_empty(self):
+        """
+        #name(from_items builds an empty table from no pairs)
+        """
+        for table_type in self.TABLES:
+            with self.subTest(table=table_type.__name__):
+                self.assertSameContents(table_type.from_items([], size_hint=100), {})
+
+    def test_reserve(self):
+        """
+        #name(reserve makes room so that inserts do not resize)
+        """
+        for table_type in self.TABLES:
+            with self.subTest(table=table_type.__name__):
+                table = table_type()
+                table["a"] = 1
+                table.reserve(1000)
+                size = table.table_size
+                for i in range(999):
+                    table[str(i)] = i
+                self.assertEqual(table.table_size, size)
+                self.assertEqual(table["a"], 1)
+
+    def test_get_many_and_contains_many(self):
+        """
+        #name(get_many and contains_many answer each key in order)
+        """
+        for table_type in self.TABLES:
+            with self.subTest(table=table_type.__name__):
+                table = table_type.from_items([(str(i), i) for i in range(0, 200, 2)])
+                keys = [str(i) for i in range(199, -1, -1)]
+                self.assertEqual(table.contains_many(keys).to_list(), [int(key) % 2 == 0 for key in keys])
+                present = [key for key in keys if int(key) % 2 == 0]
+                self.assertEqual(table.get_many(present).to_list(), [int(key) for key in present])
+                self.assertEqual(len(table.get_many([])), 0)
+                self.assertEqual(len(table.contains_many([])), 0)
+                with self.assertRaises(KeyError):
+                    table.get_many(["0", "1"])
+
+    def test_get_many_during_migration(self):
+        """
+        #name(get_many and contains_many see keys not yet migrated)
+        """
+        table = LinearProbeTable(incremental=True)
+        for i in range(100):
+            table[str(i)] = i
+        keys = [str(i) for i in range(110)]
+        self.assertEqual(table.contains_many(keys).to_list(), [i < 100 for i in range(110)])
+        self.assertEqual(table.get_many(keys[:100]).to_list(), list(range(100)))
+
+
+class TestLazyIteration(HashTableTestCase):
+    TABLES = (LinearProbeTable, RobinHoodProbeTable, HashTableSeparateChaining)
+
+    def test_iterators(self):
+        """
+        #name(items, iter_keys and iter_values yield every entry once)
+        """
+        reference = {str(i): i for i in range(100)}
+        for table_type in self.TABLES:
+            with self.subTest(table=table_type.__name__):
+                table = table_type.from_items(list(reference.items()))
+                self.assertEqual(sorted(table.items()), sorted(reference.items()))
+                self.assertEqual(sorted(table.iter_keys()), sorted(reference))
+                self.assertEqual(sorted(table.iter_values()), sorted(reference.values()))
+
+    def test_modified_during_iteration(self):
+        """
+        #name(items raises RuntimeError when keys are inserted or deleted meanwhile)
+        """
+        for table_type in self.TABLES:
+            for change in ("insert", "delete"):
+                with self.subTest(table=table_type.__name__, change=change):
+                    table = table_type.from_items([(str(i), i) for i in range(20)])
+                    with self.assertRaises(RuntimeError):
+                        for key, _ in table.items():
+                            if change == "insert":
+                                table["new"] = 0
+                            else:
+                                del table[key]
+                    with self.assertRaises(RuntimeError):
+                        for _ in table.iter_keys():
+                            table["other"] = 0
+
+    def test_value_updates_allowed(self):
+        """
+        #name(items allows updating values of existing keys while iterating)
+        """
+        for table_type in self.TABLES:
+            with self.subTest(table=table_type.__name__):
+                table = table_type.from_items([(str(i), i) for i in range(20)])
+                for key, value in table.items():
+                    table[key] = value + 1
+                self.assertSameContents(table, {str(i): i + 1 for i in range(20)})
+
+    def test_unchecked_iteration(self):
+        """
+        #name(items with check=False does not raise when the table changes)
+        """
+        for table_type in self.TABLES:
+            with self.subTest(table=table_type.__name__):
+                table = table_type.from_items([(str(i), i) for i in range(20)])
+                # Entries may be moved, so which ones the loop visits is unspecified.
+                added = {}
+                for key, _ in table.items(check=False):
+                    if not key.startswith("new"):
+                        table["new" + key] = 0
+                        added["new" + key] = 0
+                self.assertGreater(len(added), 0)
+                self.assertSameContents(table, {**{str(i): i for i in range(20)}, **added})
+
+
+class TestKeyHash(HashTableTestCase):
+    def test_equal_numbers_hash_equal(self):
+        """
+        #name(key_hash agrees for equal ints, floats and bools)
+        """
+        self.assertEqual(key_hash(1), key_hash(1.0))
+        self.assertEqual(key_hash(1), key_hash(True))
+        self.assertEqual(key_hash(0), key_hash(-0.0))
+        self.assertEqual(key_hash((1, "a")), key_hash((1.0, "a")))
+        self.assertNotEqual(key_hash(1), key_hash(2))
+        self.assertNotEqual(key_hash((1, 2)), key_hash((2, 1)))
+
+    def test_subclasses_and_other_numbers(self):
+        """
+        #name(key_hash agrees for equal keys of different types)
+        """
+        class Name(str):
+            pass
+
+        class Point(tuple):
+            pass
+
+        equal_keys = [
+            ("minecraft", Name("minecraft")),
+            ((1, "a"), Point((1, "a"))),
+            (1, 1.0, True, Fraction(1), Decimal("1.00"), complex(1, 0)),
+            (0.5, Fraction(1, 2), Decimal("0.5")),
+            (2 ** 80, float(2 ** 80), Fraction(2 ** 80)),
+            (-7, -7.0, Fraction(-14, 2)),
+        ]
+        for keys in equal_keys:
+            with self.subTest(keys=keys):
+                for key in keys:
+                    self.assertEqual(key, keys[0])
+                    self.assertEqual(key_hash(key), key_hash(keys[0]))
+
+        table = LinearProbeTable()
+        table[Name("a")] = 1
+        table[Fraction(1, 2)] = 2
+        self.assertEqual(table["a"], 1)
+        self.assertEqual(table[0.5], 2)
+        self.assertEqual(len(table), 2)
+
+    def test_numeric_keys(self):
+        """
+        #name(Linear probe table treats 1, 1.0 and True as one key, like a dict)
+        """
+        table = LinearProbeTable()
+        reference = {}
+        for key, value in ((1, "int"), (1.0, "float"), (True, "bool"), (0.5, "half"),
+                           (-3, "negative"), (2 ** 80, "big"), (float("inf"), "inf")):
+            table[key] = value
+            reference[key] = value
+        self.assertSameContents(table, reference)
+        self.assertEqual(table[1], "bool")
+        del table[1.0]
+        self.assertNotIn(True, table)
+
+    def test_tuple_keys(self):
+        """
+        #name(Linear probe table matches a dict with tuple keys)
+        """
+        keys = [(x, y) for x in range(15) for y in ("a", "b", 2.5)] + [((1, 2), 3), ()]
+        self.check_round_trip(LinearProbeTable(), keys, seed=4)
+
+
+class TestStats(HashTableTestCase):
+    def test_linear_probe_stats(self):
+        """
+        #name(Linear probe stats report probe lengths, clusters and load factor)
+        """
+        table = LinearProbeTable(sizes=[13], hash_function=lambda key: key)
+        for key in (0, 13, 26, 5):
+            table[key] = key
+        stats = table.stats()
+        self.assertEqual(stats.length, 4)
+        self.assertEqual(stats.table_size, 13)
+        self.assertAlmostEqual(stats.load_factor, 4 / 13)
+        self.assertEqual(stats.probe_histogram.to_list(), [2, 1, 1])
+        self.assertAlmostEqual(stats.average_probe_length(), 0.75)
+        self.assertEqual(stats.max_run, 3)
+        self.assertEqual(stats.rehash_count, 0)
+        self.assertIsNone(stats.rehash_time)
+
+    def test_stats_during_migration(self):
+        """
+        #name(Stats during an incremental resize count every entry and migrate nothing)
+        """
+        table = LinearProbeTable(incremental=True, hash_function=lambda key: key)
+        for i in range(100):
+            table[i] = i
+        # The last resize is still being migrated
+        self.assertIsNotNone(table._LinearProbeTable__old_keys)
+        migrate_index = table._LinearProbeTable__migrate_index
+        stats = table.stats()
+        self.assertEqual(table._LinearProbeTable__migrate_index, migrate_index)
+        self.assertIsNotNone(table._LinearProbeTable__old_keys)
+        self.assertEqual(stats.length, 100)
+        self.assertEqual(sum(stats.probe_histogram.to_list()), 100)
+        self.assertEqual(stats.table_size, table.table_size)
+        self.assertSameContents(table, {i: i for i in range(100)})
+
+    def test_separate_chaining_stats(self):
+        """
+        #name(Separate chaining stats report bucket positions and the longest bucket)
+        """
+        table = HashTableSeparateChaining(table_size=5, hash_function=int)
+        for key in ("0", "5", "10", "1"):
+            table[key] = key
+        stats = table.stats()
+        self.assertEqual((stats.length, stats.table_size), (4, 5))
+        self.assertEqual(stats.probe_histogram.to_list(), [2, 1, 1])
+        self.assertEqual(stats.max_run, 3)
+        self.assertIsNone(stats.rehash_time)
+        self.assertIn("rehashes: 0", str(stats))
+
+    def test_empty_stats(self):
+        """
+        #name(Stats of an empty table)
+        """
+        for table in (LinearProbeTable(), HashTableSeparateChaining()):
+            with self.subTest(table=type(table).__name__):
+                stats = table.stats()
+                self.assertEqual(stats.length, 0)
+                self.assertEqual(stats.max_run, 0)
+                self.assertEqual(stats.average_probe_length(), 0.0)
+
+    def test_rehash_tracking(self):
+        """
+        #name(Stats count rehashes and time them only when tracked)
+        """
+        for table_type in (LinearProbeTable, HashTableSeparateChaining):
+            for track_stats in (False, True):
+                with self.subTest(table=table_type.__name__, track_stats=track_stats):
+                    table = table_type(track_stats=track_stats)
+                    for i in range(200):
+                        table[str(i)] = i
+                    stats = table.stats()
+                    self.assertGreater(stats.rehash_count, 0)
+                    if track_stats:
+                        self.assertGreaterEqual(stats.rehash_time, 0.0)
+                        self.assertIn("rehash time", str(stats))
+                    else:
+                        self.assertIsNone(stats.rehash_time)
+
+
+class TestMappedProbeTable(HashTableTestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "table.lpt")
+
+    def test_save_and_open(self):
+        """
+        #name(A saved LinearProbeTable opens as an equal MappedProbeTable)
+        """
+        reference = {"key" + str(i): str(i) * (i % 3) for i in range(500)}
+        reference["\u00e9t\u00e9"] = b"bytes"
+        reference[""] = -1
+        LinearProbeTable.from_items(list(reference.items())).save(self.path)
+        with MappedProbeTable.open(self.path) as table:
+            self.assertSameContents(table, reference)
+            self.assertNotIn("missing", table)
+            with self.assertRaises(KeyError):
+                _ = table["missing"]
+
+    def test_value_encoding(self):
+        """
+        #name(str, bytes and int values round trip, anything else needs allow_pickle)
+        """
+        reference = {"s": "\u00e9t\u00e9", "e": "", "b": b"\x00\xff", "z": 0, "n": -129, "big": 1 << 100}
+        LinearProbeTable.from_items(list(reference.items())).save(self.path)
+        with MappedProbeTable.open(self.path) as table:
+            self.assertSameContents(table, reference)
+            self.assertIs(type(table["z"]), int)
+        for value in (None, 1.5, True, (1, 2), ["a"]):
+            with self.assertRaises(TypeError):
+                LinearProbeTable.from_items([("a", value)]).save(self.path)
+
+    def test_allow_pickle(self):
+        """
+        #name(Pickled values are only read from tables opened with allow_pickle)
+        """
+        reference = {"t": (1, [2]), "none": None, "s": "plain"}
+        LinearProbeTable.from_items(list(reference.items())).save(self.path, allow_pickle=True)
+        with MappedProbeTable.open(self.path, allow_pickle=True) as table:
+            self.assertSameContents(table, reference)
+        with MappedProbeTable.open(self.path) as table:
+            self.assertEqual(table["s"], "plain")
+            self.assertEqual(sorted(table.keys()), sorted(reference))
+            with self.assertRaises(ValueError):
+                _ = table["t"]
+
+    def test_write_counts_keys(self):
+        """
+        #name(write keeps the last value of a repeated key and rejects more keys than length)
+        """
+        MappedProbeTable.write(self.path, [("a", 1), ("b", 2), ("a", 3)], 3)
+        with MappedProbeTable.open(self.path) as table:
+            self.assertSameContents(table, {"a": 3, "b": 2})
+        with self.assertRaises(ValueError):
+            MappedProbeTable.write(self.path, ((str(i), i) for i in range(10)), 3)
+        with self.assertRaises(ValueError):
+            MappedProbeTable.write(self.path, [("a", 1)], 0)
+
+    def test_save_empty(self):
+        """
+        #name(An empty table round trips through a mapped file)
+        """
+        LinearProbeTable().save(self.path)
+        with MappedProbeTable.open(self.path) as table:
+            self.assertSameContents(table, {})
+
+    def test_read_only(self):
+        """
+        #name(MappedProbeTable refuses writes and non-string keys)
+        """
+        LinearProbeTable.from_items([("a", 1)]).save(self.path)
+        with MappedProbeTable.open(self.path) as table:
+            with self.assertRaises(TypeError):
+                table["b"] = 2
+            with self.assertRaises(TypeError):
+                del table["a"]
+        with self.assertRaises(TypeError):
+            LinearProbeTable.from_items([(1, 1)]).save(self.path)
+
+    def test_not_a_table(self):
+        """
+        #name(Opening a file in another format raises ValueError)
+        """
+        with open(self.path, "wb") as file:
+            file.write(b"not a mapped probe table at all")
+        with self.assertRaises(ValueError):
+            MappedProbeTable.open(self.path)
+
+
+class TestShardedHashTable(HashTableTestCase):
+    def test_round_trip(self):
+        """
+        #name(Sharded table matches a dict under random operations)
+        """
+        self.check_round_trip(ShardedHashTable(shard_count=4), list(range(300)) + ["a", (1, 2)])
+
+    def test_shard_index(self):
+        """
+        #name(Each key lives in the shard shard_index picks)
+        """
+        table = ShardedHashTable(shard_count=5)
+        indices = set()
+        for i in range(100):
+            index = table.shard_index(i)
+            self.assertTrue(0 <= index < 5)
+            self.assertEqual(index, table.shard_index(float(i)))
+            indices.add(index)
+        self.assertEqual(len(indices), 5)
+        with self.assertRaises(ValueError):
+            ShardedHashTable(shard_count=0)
+
+    def test_snapshot(self):
+        """
+        #name(A snapshot keeps the contents it was taken with)
+        """
+        table = ShardedHashTable(shard_count=4)
+        table.update((i, i) for i in range(100))
+        snapshot = table.snapshot()
+        table[0] = "changed"
+        table[1000] = 1000
+        del table[50]
+
+        self.assertEqual(len(snapshot), 100)
+        self.assertEqual(snapshot[0], 0)
+        self.assertIn(50, snapshot)
+        self.assertNotIn(1000, snapshot)
+        with self.assertRaises(KeyError):
+            _ = snapshot[1000]
+        self.assertEqual(dict(snapshot.items()), {i: i for i in range(100)})
+
+        later = table.snapshot()
+        self.assertEqual(dict(later.items()), dict(table.items()))
+        # Taking the new snapshot does not change the old one
+        self.assertEqual(snapshot[0], 0)
+
+    def test_threads(self):
+        """
+        #name(Concurrent writers on a sharded table lose no updates)
+        """
+        table = ShardedHashTable(shard_count=8)
+
+        def write(thread: int) -> None:
+            for i in range(2000):
+                table[(thread, i)] = i
+            for i in range(0, 2000, 2):
+                del table[(thread, i)]
+
+        threads = [threading.Thread(target=write, args=(thread,)) for thread in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertSameContents(table, {(thread, i): i for thread in range(4) for i in range(1, 2000, 2)})
+
+
+class TestCuckooHashTable(HashTableTestCase):
+    def test_round_trip(self):
+        """
+        #name(Cuckoo table matches a dict under random operations)
+        """
+        keys = list(range(400)) + ["key" + str(i) for i in range(100)]
+        self.check_round_trip(CuckooHashTable(), keys, steps=4000)
+
+    def test_growth(self):
+        """
+        #name(Cuckoo table grows to hold many keys)
+        """
+        table = CuckooHashTable()
+        for i in range(5000):
+            table[str(i)] = i
+        self.assertLessEqual(len(table), table.table_size * table.MAX_LOAD)
+        self.assertSameContents(table, {str(i): i for i in range(5000)})
+
+    def test_same_hash_overflow(self):
+        """
+        #name(Cuckoo table chains keys that share one hash past what the buckets hold)
+        """
+        for hash_value in (0, 7):
+            with self.subTest(hash_value=hash_value):
+                table = CuckooHashTable(hash_function=lambda key: hash_value)
+                size = table.table_size
+                reference = self.check_round_trip(table, list(range(60)), steps=1000, seed=hash_value)
+                self.assertEqual(table.table_size, size, "Identical hashes should not grow the table")
+                for i in range(60):
+                    table[i] = -i
+                    reference[i] = -i
+                self.assertSameContents(table, reference)
+                for i in range(0, 60, 2):
+                    del table[i]
+                    del reference[i]
+                self.assertSameContents(table, reference)
+                self.assertIn("(1,-1)", str(table))
+
+    def test_few_distinct_hashes(self):
+        """
+        #name(Cuckoo table stays correct and bounded when hashes repeat)
+        """
+        for modulus in (3, 5, 10):
+            with self.subTest(modulus=modulus):
+                # Keys from 300 on hash to themselves
+                table = CuckooHashTable(hash_function=lambda key: key % modulus if key < 300 else key)
+                for key in range(300):
+                    table[key] = key
+                self.assertLessEqual(table.table_size, 4096)
+                self.assertSameContents(table, {key: key for key in range(300)})
+                # Other keys still fit in the buckets, even after a resize
+                for key in range(300, 1300):
+                    table[key] = key
+                self.assertEqual(table[1299], 1299)
+                self.assertEqual(table[299], 299)
+
+
+class TestCompactHashTable(HashTableTestCase):
+    def test_round_trip(self):
+        """
+        #name(Compact table matches a dict, including its order, under random operations)
+        """
+        table = CompactHashTable()
+        reference = self.check_round_trip(table, list(range(300)) + ["a", 2.5, (1, "b")], steps=4000)
+        self.assertEqual(list(table.items()), list(reference.items()))
+        self.assertEqual(table.keys().to_list(), list(reference))
+        self.assertEqual(table.values().to_list(), list(reference.values()))
+
+    def test_insertion_order(self):
+        """
+        #name(Compact table keeps insertion order through updates, deletes and growth)
+        """
+        table = CompactHashTable()
+        for i in range(1000, 0, -1):
+            table[i] = i
+        table[500] = "updated"
+        del table[1000]
+        table[1000] = "again"
+        expected = [i for i in range(999, 0, -1)] + [1000]
+        self.assertEqual(table.keys().to_list(), expected)
+        self.assertEqual(table[500], "updated")
+
+    def test_none_key(self):
+        """
+        #name(Compact table holds None as a key, next to the holes deletes leave)
+        """
+        table = CompactHashTable()
+        table[None] = 1
+        table["a"] = None
+        self.assertSameContents(table, {None: 1, "a": None})
+        self.assertEqual(list(table.items()), [(None, 1), ("a", None)])
+        del table["a"]
+        table["b"] = 2
+        self.assertEqual(table.keys().to_list(), [None, "b"])
+        self.assertEqual(table.values().to_list(), [1, 2])
+        del table[None]
+        self.assertNotIn(None, table)
+        table.reserve(100)
+        self.assertSameContents(table, {"b": 2})
+
+    def test_reserve(self):
+        """
+        #name(Compact table sized with reserve or expected_size does not resize)
+        """
+        for expected_size in (1000, 0):
+            with self.subTest(expected_size=expected_size):
+                table = CompactHashTable(expected_size=expected_size)
+                table.reserve(1000)
+                size = table.table_size
+                for i in range(1000):
+                    table[i] = i
+                self.assertEqual(table.table_size, size)
+
+
+class TestStaticPerfectHashTable(HashTableTestCase):
+    def test_build(self):
+        """
+        #name(Perfect hash table answers every built key and rejects others)
+        """
+        pairs = [("key" + str(i), i) for i in range(2000)] + [(i, -i) for i in range(500)] + [((1, "a"), "tuple")]
+        table = StaticPerfectHashTable.build(pairs)
+        self.assertSameContents(table, dict(pairs))
+        self.assertGreaterEqual(table.table_size, len(table))
+        for key in ("key2000", 500, (1, "b"), 0.5):
+            self.assertNotIn(key, table)
+            with self.assertRaises(KeyError):
+                _ = table[key]
+
+    def test_later_pairs_win(self):
+        """
+        #name(Perfect hash table keeps the last value of a repeated key)
+        """
+        table = StaticPerfectHashTable.build([("a", 1), ("b", 2), ("a", 3), (1, "int"), (1.0, "float")])
+        self.assertSameContents(table, {"a": 3, "b": 2, 1: "float"})
+
+    def test_none_key(self):
+        """
+        #name(Perfect hash table holds None as a key and as a value)
+        """
+        pairs = [(None, "none"), ("a", None)] + [(i, i) for i in range(50)]
+        table = StaticPerfectHashTable.build(pairs)
+        self.assertSameContents(table, dict(pairs))
+        self.assertEqual(table[None], "none")
+        table = StaticPerfectHashTable.build([("a", 1)])
+        self.assertNotIn(None, table)
+        with self.assertRaises(KeyError):
+            _ = table[None]
+
+    def test_small_builds(self):
+        """
+        #name(Perfect hash table builds from zero, one and two keys)
+        """
+        for count in range(3):
+            with self.subTest(count=count):
+                reference = {str(i): i for i in range(count)}
+                table = StaticPerfectHashTable.build(reference.items())
+                self.assertSameContents(table, reference)
+                self.assertNotIn("missing", table)
+
+    def test_read_only(self):
+        """
+        #name(Perfect hash table refuses writes)
+        """
+        table = StaticPerfectHashTable.build([("a", 1)])
+        with self.assertRaises(TypeError):
+            table["b"] = 2
+        with self.assertRaises(TypeError):
+            del table["a"]
+        self.assertEqual(table["a"], 1)
+
+    def test_colliding_hashes(self):
+        """
+        #name(Perfect hash table raises ValueError for keys with the same hash)
+        """
+        with self.assertRaises(ValueError):
+            StaticPerfectHashTable.build([("a", 1), ("b", 2)], hash_function=lambda key: 7)
+        # Hashes equal modulo 2^64 cannot be separated either
+        with self.assertRaises(ValueError):
+            StaticPerfectHashTable.build([(0, 1), (2 ** 64, 2)], hash_function=lambda key: key)
@@ -0,0 +1,249 @@
+import random
+from unittest import TestCase
+
+from data_structures.heap import MaxHeap
+from data_structures.indexed_heap import IndexedMaxHeap
+from data_structures.referential_array import ArrayR
+
+
+class TestMaxHeap(TestCase):
+    def drain(self, heap: MaxHeap) -> list:
+        res = []
+        while len(heap) > 0:
+            res.append(heap.get_max())
+        return res
+
+    def test_matches_sorted(self):
+        """
+        #name(MaxHeap returns elements largest first)
+        """
+        rng = random.Random(0)
+        items = [rng.randrange(100) for _ in range(500)]
+        heap = MaxHeap(len(items))
+        for item in items:
+            heap.add(item)
+        self.assertEqual(self.drain(heap), sorted(items, reverse=True))
+        with self.assertRaises(IndexError):
+            heap.get_max()
+        with self.assertRaises(IndexError):
+            heap.peek()
+
+    def test_growth(self):
+        """
+        #name(MaxHeap grows past its initial capacity)
+        """
+        heap = MaxHeap()
+        for i in range(1000):
+            self.assertEqual(heap.is_full(), len(heap) == len(heap.the_array))
+            heap.add(i)
+            self.assertEqual(heap.peek(), i)
+        self.assertEqual(len(heap), 1000)
+        self.assertEqual(self.drain(heap), list(range(999, -1, -1)))
+
+    def test_interleaved(self):
+        """
+        #name(MaxHeap matches a sorted list under mixed adds and removals)
+        """
+        rng = random.Random(1)
+        heap = MaxHeap()
+        reference = []
+        for _ in range(2000):
+            if reference and rng.random() < 0.4:
+                reference.sort()
+                self.assertEqual(heap.get_max(), reference.pop())
+            else:
+                item = rng.randrange(50)
+                heap.add(item)
+                reference.append(item)
+            self.assertEqual(len(heap), len(reference))
+        self.assertEqual(self.drain(heap), sorted(reference, reverse=True))
+
+    def test_min_heap(self):
+        """
+        #name(MaxHeap with min_heap=True returns elements smallest first)
+        """
+        items = [5, 3, 9, 1, 7, 3, 0]
+        heap = MaxHeap(min_heap=True)
+        for item in items:
+            heap.add(item)
+        self.assertEqual(heap.peek(), 0)
+        res = []
+        while len(heap) > 0:
+            res.append(heap.get_min())
+        self.assertEqual(res, sorted(items))
+
+    def test_key(self):
+        """
+        #name(MaxHeap orders by key and never compares the elements)
+        """
+        # dicts cannot be compared, so any comparison of elements would raise TypeError
+        items = [{"name": str(i), "weight": (i * 7) % 10} for i in range(30)]
+        calls = []
+
+        def weight(item: dict) -> int:
+            calls.append(item)
+            return item["weight"]
+
+        for min_heap in (False, True):
+            with self.subTest(min_heap=min_heap):
+                calls.clear()
+                heap = MaxHeap(key=weight, min_heap=min_heap)
+                for item in items:
+                    heap.add(item)
+                weights = [item["weight"] for item in self.drain(heap)]
+                self.assertEqual(weights, sorted(weights, reverse=not min_heap))
+                # Each key is computed once, when its element is added
+                self.assertEqual(len(calls), len(items))
+
+    def test_heapify_with_key(self):
+        """
+        #name(heapify builds a keyed min heap)
+        """
+        items = ArrayR.from_list(["ccc", "a", "bb", "dddd", ""])
+        heap = MaxHeap.heapify(items, key=len, min_heap=True)
+        self.assertEqual(self.drain(heap), sorted(items.to_list(), key=len))
+
+    def test_pushpop(self):
+        """
+        #name(pushpop returns the root of the heap with the element added)
+        """
+        rng = random.Random(2)
+        heap = MaxHeap(min_heap=True)
+        self.assertEqual(heap.pushpop(5), 5)
+        reference = []
+        for _ in range(20):
+            item = rng.randrange(100)
+            heap.add(item)
+            reference.append(item)
+        for _ in range(200):
+            item = rng.randrange(100)
+            reference.append(item)
+            reference.sort()
+            self.assertEqual(heap.pushpop(item), reference.pop(0))
+        self.assertEqual(self.drain(heap), sorted(reference))
+
+    def test_replace(self):
+        """
+        #name(replace returns the old root even when the element is better)
+        """
+        heap = MaxHeap(key=abs)
+        with self.assertRaises(IndexError):
+            heap.replace(1)
+        for item in (3, -8, 5):
+            heap.add(item)
+        self.assertEqual(heap.replace(-10), -8)
+        self.assertEqual(heap.replace(1), -10)
+        self.assertEqual(self.drain(heap), [5, 3, 1])
+
+    def test_arity(self):
+        """
+        #name(MaxHeap keeps heap order for every arity)
+        """
+        rng = random.Random(3)
+        items = [rng.randrange(1000) for _ in range(300)]
+        for d in (2, 3, 4, 8):
+            with self.subTest(d=d):
+                heap = MaxHeap(d=d)
+                for item in items:
+                    heap.add(item)
+                for k in range(1, len(heap)):
+                    self.assertGreaterEqual(heap.the_array[(k - 1) // d], heap.the_array[k])
+                self.assertEqual(self.drain(heap), sorted(items, reverse=True))
+        with self.assertRaises(ValueError):
+            MaxHeap(d=1)
+
+    def test_heapify_in_place(self):
+        """
+        #name(heapify in place rearranges the given ArrayR without copying it)
+        """
+        items = [5, 1, 9, 3, 7, 2, 8]
+        for d in (2, 3, 4):
+            with self.subTest(d=d):
+                array = ArrayR.from_list(items)
+                heap = MaxHeap.heapify(array, d=d, in_place=True)
+                self.assertIs(heap.the_array, array)
+                self.assertTrue(heap.is_full())
+                self.assertEqual(sorted(array.to_list()), sorted(items))
+                heap.add(6)
+                self.assertEqual(self.drain(heap), sorted(items + [6], reverse=True))
+        with self.assertRaises(TypeError):
+            MaxHeap.heapify(items, in_place=True)
+
+
+class TestIndexedMaxHeap(TestCase):
+    def test_matches_reference(self):
+        """
+        #name(IndexedMaxHeap matches a reference under adds, updates and removals)
+        """
+        for d in (2, 3, 4):
+            with self.subTest(d=d):
+                rng = random.Random(d)
+                heap = IndexedMaxHeap(d=d)
+                # Handle to element, priority and the step it was added at
+                live = {}
+                for step in range(3000):
+                    action = rng.random()
+                    if not live or action < 0.4:
+                        priority = rng.randrange(20)
+                        handle = heap.add("e" + str(step), priority)
+                        self.assertNotIn(handle, live)
+                        live[handle] = ("e" + str(step), priority, step)
+                    elif action < 0.6:
+                        handle = rng.choice(list(live))
+                        priority = rng.randrange(20)
+                        heap.update(handle, priority)
+                        live[handle] = (live[handle][0], priority, live[handle][2])
+                    elif action < 0.8:
+                        handle = rng.choice(list(live))
+                        self.assertEqual(heap.remove(handle), live.pop(handle)[0])
+                        self.assertNotIn(handle, heap)
+                    else:
+                        # Highest priority first, then the earliest added
+                        best = min(live, key=lambda h: (-live[h][1], live[h][2]))
+                        self.assertEqual(heap.peek_handle(), best)
+                        self.assertEqual(heap.get_max(), live.pop(best)[0])
+                    self.assertEqual(len(heap), len(live))
+                for handle, (element, priority, _) in live.items():
+                    self.assertEqual(heap[handle], element)
+                    self.assertEqual(heap.priority(handle), priority)
+
+    def test_handles_are_reused(self):
+        """
+        #name(IndexedMaxHeap reuses removed handles and keeps ties in insertion order)
+        """
+        heap = IndexedMaxHeap()
+        first = heap.add("first", 1)
+        second = heap.add("second", 1)
+        heap.remove(first)
+        third = heap.add("third", 1)
+        self.assertEqual(third, first)
+        # The reused handle is lower, but "second" was added earlier
+        self.assertEqual(heap.get_max(), "second")
+        self.assertEqual(heap.get_max(), "third")
+        for step in range(1000):
+            handle = heap.add(step, step % 7)
+            if len(heap) == 3:
+                heap.get_max()
+                heap.remove(handle if handle in heap else heap.peek_handle())
+        self.assertLessEqual(heap.handle_count, 4)
+        self.assertLessEqual(len(heap.elements), 4)
+        self.assertEqual(heap.handle_count, len(heap) + heap.free_count)
+
+    def test_invalid_handles(self):
+        """
+        #name(IndexedMaxHeap raises KeyError for removed or unknown handles)
+        """
+        heap = IndexedMaxHeap()
+        handle = heap.add("a", 1)
+        heap.remove(handle)
+        for bad in (handle, -1, 5):
+            with self.assertRaises(KeyError):
+                heap.update(bad, 2)
+            with self.assertRaises(KeyError):
+                heap.remove(bad)
+            with self.assertRaises(KeyError):
+                _ = heap[bad]
+        with self.assertRaises(IndexError):
+            heap.get_max()
+        with self.assertRaises(ValueError):
+            IndexedMaxHeap(d=1)
@@ -0,0 +1,132 @@
+from unittest import TestCase
+
+from data_structures.lru_cache import LRUCache
+
+
+class TestLRUCache(TestCase):
+    def test_lru_eviction_order(self):
+        """
+        #name(LRU mode evicts the least recently used entry)
+        """
+        cache = LRUCache(3)
+        for key in "abc":
+            cache.put(key, key.upper())
+        self.assertEqual(cache.get("a"), "A")
+        cache.put("d", "D")
+        self.assertNotIn("b", cache)
+        cache.get("c")
+        cache.put("e", "E")
+        self.assertNotIn("a", cache)
+        self.assertEqual(sorted(key for key in "abcde" if key in cache), ["c", "d", "e"])
+        self.assertEqual(cache.evictions, 2)
+        self.assertEqual(len(cache), 3)
+
+    def test_lfu_eviction(self):
+        """
+        #name(LFU mode evicts the least frequently used entry, the least recent one on ties)
+        """
+        cache = LRUCache(3, lfu=True)
+        for key in "abc":
+            cache.put(key, key)
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+        cache.put("d", "d")
+        self.assertNotIn("c", cache)
+        # d has one use, b two and a three
+        cache.put("e", "e")
+        self.assertNotIn("d", cache)
+        cache.get("e")
+        # b and e both have two uses, b was used less recently
+        cache.put("f", "f")
+        self.assertNotIn("b", cache)
+        self.assertEqual(sorted(key for key in "abcdef" if key in cache), ["a", "e", "f"])
+
+    def test_hits_and_misses(self):
+        """
+        #name(get and cached count hits and misses)
+        """
+        cache = LRUCache(2)
+        self.assertEqual(cache.hit_rate(), 0.0)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("a", 0), 0)
+        cache.put("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        calls = []
+        for _ in range(3):
+            self.assertEqual(cache.cached("b", lambda: calls.append(1) or 2), 2)
+        self.assertEqual(len(calls), 1)
+        # put and __contains__ are not lookups
+        self.assertIn("b", cache)
+        self.assertEqual((cache.hits, cache.misses), (3, 3))
+        self.assertEqual(cache.hit_rate(), 0.5)
+
+    def test_put_existing_key(self):
+        """
+        #name(put on a cached key replaces its value and counts as a use)
+        """
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.put("a", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 0)
+        cache.put("c", 4)
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.get("a"), 3)
+
+    def test_clear(self):
+        """
+        #name(clear removes every entry and keeps the statistics)
+        """
+        for lfu in (False, True):
+            with self.subTest(lfu=lfu):
+                cache = LRUCache(2, lfu=lfu)
+                cache.put("a", 1)
+                cache.get("a")
+                cache.get("b")
+                cache.clear()
+                self.assertTrue(cache.is_empty())
+                self.assertNotIn("a", cache)
+                self.assertEqual((cache.hits, cache.misses), (1, 1))
+                cache.put("b", 2)
+                cache.put("c", 3)
+                cache.put("d", 4)
+                self.assertEqual(sorted(key for key in "abcd" if key in cache), ["c", "d"])
+
+    def test_capacity_one(self):
+        """
+        #name(A cache of capacity 1 keeps only the latest entry)
+        """
+        for lfu in (False, True):
+            with self.subTest(lfu=lfu):
+                cache = LRUCache(1, lfu=lfu)
+                cache.put("a", 1)
+                cache.get("a")
+                cache.put("b", 2)
+                self.assertNotIn("a", cache)
+                self.assertEqual(cache.get("b"), 2)
+                cache.put("b", 3)
+                self.assertEqual(cache.get("b"), 3)
+                self.assertEqual((len(cache), cache.evictions), (1, 1))
+        with self.assertRaises(ValueError):
+            LRUCache(0)
+
+    def test_delete(self):
+        """
+        #name(Deleting entries keeps LFU eviction on the lowest use count)
+        """
+        cache = LRUCache(3, lfu=True)
+        for key in "abc":
+            cache.put(key, key)
+        cache.get("b")
+        cache.get("c")
+        del cache["a"]
+        with self.assertRaises(KeyError):
+            del cache["a"]
+        cache.put("d", "d")
+        cache.get("d")
+        cache.get("d")
+        # b and c have two uses, d three: b is the least recent of the least used
+        cache.put("e", "e")
+        self.assertNotIn("b", cache)
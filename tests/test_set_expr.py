@@ -0,0 +1,139 @@
+import random
+from unittest import TestCase
+
+from data_structures.array_set import ArraySet
+from data_structures.bit_vector_set import BitVectorSet
+from data_structures.set_expr import SetExpr
+
+
+class CountingSet:
+    """ Operand that counts how it is used: iterations, membership tests and len calls. """
+
+    def __init__(self, items) -> None:
+        self.items = list(dict.fromkeys(items))
+        self.iterations = 0
+        self.lookups = 0
+        self.len_calls = 0
+
+    def __iter__(self):
+        self.iterations += 1
+        return iter(self.items)
+
+    def __contains__(self, item) -> bool:
+        self.lookups += 1
+        return item in self.items
+
+    def __len__(self) -> int:
+        self.len_calls += 1
+        return len(self.items)
+
+
+class TestSetExpr(TestCase):
+    def make_sets(self, set_type, rng: random.Random, count: int) -> list:
+        res = []
+        for _ in range(count):
+            items = {rng.randrange(1, 40) for _ in range(rng.randrange(25))}
+            result = ArraySet(64) if set_type is ArraySet else BitVectorSet()
+            for item in items:
+                result.add(item)
+            res.append(result)
+        return res
+
+    def test_matches_eager(self):
+        """
+        #name(Lazy |, & and - match the eager set operations)
+        """
+        rng = random.Random(0)
+        for set_type in (ArraySet, BitVectorSet):
+            for _ in range(20):
+                a, b, c = self.make_sets(set_type, rng, 3)
+                with self.subTest(set_type=set_type.__name__):
+                    for lazy, eager in ((a.lazy() | b, a | b), (a.lazy() & b, a & b), (a.lazy() - b, a - b),
+                                        ((a.lazy() | b) & c, (a | b) & c), (a - b.lazy() & c, (a - b) & c)):
+                        self.assertIsInstance(lazy, SetExpr)
+                        self.assertEqual(sorted(lazy), sorted(eager))
+                        self.assertEqual(len(lazy), len(eager))
+                        self.assertEqual(lazy.is_empty(), eager.is_empty())
+                        self.assertEqual(sorted(lazy.values().to_list()), sorted(eager.values().to_list()))
+                        for item in range(1, 41):
+                            self.assertEqual(item in lazy, item in eager)
+
+    def test_plain_operators_are_eager(self):
+        """
+        #name(Operators between plain sets stay eager, a SetExpr operand makes them lazy)
+        """
+        a, b = BitVectorSet(), BitVectorSet()
+        a.add(1)
+        b.add(2)
+        self.assertIsInstance(a | b, BitVectorSet)
+        self.assertIsInstance(a | b.lazy(), SetExpr)
+        self.assertIsInstance(a.lazy() | b, SetExpr)
+
+    def test_single_pass(self):
+        """
+        #name(Evaluating an expression iterates each operand at most once)
+        """
+        a, b, c = CountingSet(range(0, 50)), CountingSet(range(25, 75)), CountingSet(range(0, 100, 3))
+        expr = (SetExpr.of(a) | b) - c
+        # iter() first, as sorted() on the expression itself would also call len() on it
+        self.assertEqual(sorted(iter(expr)), sorted(set(range(75)) - set(range(0, 100, 3))))
+        self.assertLessEqual(a.iterations, 1)
+        self.assertLessEqual(b.iterations, 1)
+        self.assertEqual(c.iterations, 0)
+
+    def test_smallest_operand_drives_intersection(self):
+        """
+        #name(An intersection iterates its smallest operand and only queries the others)
+        """
+        big, small = CountingSet(range(1000)), CountingSet([5, 500, 5000])
+        for expr in (SetExpr.of(big) & small, SetExpr.of(small) & big):
+            self.assertEqual(sorted(iter(expr)), [5, 500])
+        self.assertEqual(big.iterations, 0)
+        self.assertEqual(big.lookups, 6)
+        self.assertEqual(small.iterations, 2)
+
+    def test_size_bound_computed_once(self):
+        """
+        #name(Size bounds are computed when the expression is built, not on every iteration)
+        """
+        a, b, c = CountingSet(range(10)), CountingSet(range(5, 20)), CountingSet(range(8))
+        expr = (SetExpr.of(a) | b) & c
+        self.assertEqual(expr.size_bound(), 8)
+        self.assertEqual((SetExpr.of(a) | b).size_bound(), 25)
+        calls = a.len_calls + b.len_calls + c.len_calls
+        for _ in range(3):
+            self.assertEqual(sorted(iter(expr)), list(range(8)))
+        self.assertEqual(a.len_calls + b.len_calls + c.len_calls, calls)
+
+    def test_membership_short_circuits(self):
+        """
+        #name(Membership stops querying operands once the answer is known)
+        """
+        a, b = CountingSet([1, 2]), CountingSet([2, 3])
+        self.assertIn(1, SetExpr.of(a) | b)
+        self.assertNotIn(4, SetExpr.of(b) & a)
+        self.assertNotIn(5, SetExpr.of(b) - a)
+        self.assertEqual(a.lookups, 1)
+        self.assertEqual(b.lookups, 2)
+
+    def test_values_single_pass(self):
+        """
+        #name(values evaluates the expression once)
+        """
+        a, b = CountingSet(range(10)), CountingSet(range(5, 15))
+        self.assertEqual(sorted((SetExpr.of(a) - b).values().to_list()), list(range(5)))
+        self.assertEqual(a.iterations, 1)
+        self.assertEqual(len((SetExpr.of(a) & b).values()), 5)
+        self.assertEqual(len((SetExpr.of(a) - a).values()), 0)
+
+    def test_materialise(self):
+        """
+        #name(materialise adds the result to a set)
+        """
+        a, b = ArraySet(8), ArraySet(8)
+        for item in (1, 2, 3):
+            a.add(item)
+        for item in (3, 4):
+            b.add(item)
+        result = (a.lazy() - b).materialise(BitVectorSet())
+        self.assertEqual(sorted(result), [1, 2])
@@ -128,6 +128,80 @@ class TestTask2(TestTask2Setup):
                          f"Expected to have {len(self.SampleMinecraftBlocks) - 1} blocks but got {len(checklist)}")
         self.assertNotIn(block_to_remove, checklist, f"Expected {block_to_remove} to be removed from the checklist")
 
+    def test_bloom_filter_checklist(self):
+        """
+        #name(Test the checklist with a Bloom filter)
+        #score(0)
+        """
+        blocks = ArrayR(len(self.SampleMinecraftBlocks))
+        for i in range(len(self.SampleMinecraftBlocks)):
+            blocks[i] = self.SampleMinecraftBlocks[i]
+        checklist = MinecraftChecklist(blocks, bloom_size=256)
+
+        for block in self.SampleMinecraftBlocks:
+            self.assertIn(block, checklist, f"Expected {block} to be in the checklist")
+
+        new_item = MinecraftItem("New Item", "A new item.", 10)
+        new_block = MinecraftBlock("New Block", "A new block.", 99, new_item)
+        # The filter hashes names with key_hash, so whether "New Block" collides does not
+        # depend on PYTHONHASHSEED and the exact counts below hold on every run.
+        rejections = checklist.bloom_rejections
+        self.assertNotIn(new_block, checklist, f"Expected {new_block} not to be in the checklist")
+        self.assertEqual(checklist.bloom_rejections, rejections + 1,
+                         "Expected the Bloom filter to reject the block without searching the tree")
+        checklist.add_block(new_block)
+        self.assertIn(new_block, checklist, f"Expected {new_block} to be in the checklist")
+        self.assertEqual(checklist.bloom_rejections, rejections + 1,
+                         "Expected the Bloom filter to let an added block through")
+
+        checklist.remove_block(new_block)
+        self.assertNotIn(new_block, checklist, f"Expected {new_block} to be removed from the checklist")
+        self.assertEqual(checklist.bloom_rejections, rejections + 2,
+                         "Expected the Bloom filter to reject a removed block")
+        with self.assertRaises(ValueError):
+            checklist.remove_block(new_block)
+        self.assertEqual(checklist.bloom_rejections, rejections + 3,
+                         "Expected the Bloom filter to reject removing an absent block")
+
+        rate = checklist.bloom_false_positive_rate()
+        self.assertTrue(0 <= rate <= 1, f"Expected a false positive rate between 0 and 1 but got {rate}")
+
+    def test_cached_checklist(self):
+        """
+        #name(Test the checklist with a query cache)
+        #score(0)
+        """
+        blocks = ArrayR(len(self.SampleMinecraftBlocks))
+        for i in range(len(self.SampleMinecraftBlocks)):
+            blocks[i] = self.SampleMinecraftBlocks[i]
+        checklist = MinecraftChecklist(blocks, cache_size=4)
+        reference = MinecraftChecklist(blocks)
+
+        low, high = self.SampleMinecraftBlocks[0], self.SampleMinecraftBlocks[-1]
+        for _ in range(2):
+            self.assertEqual(list(checklist.get_optimal_blocks(low, high)),
+                             list(reference.get_optimal_blocks(low, high)))
+        self.assertEqual(checklist.cache.hits, 1)
+        self.assertEqual(checklist.cache.misses, 1)
+
+        new_item = MinecraftItem("New Item", "A new item.", 10)
+        new_block = MinecraftBlock("New Block", "A new block.", 5, new_item)
+        checklist.add_block(new_block)
+        reference.add_block(new_block)
+        self.assertEqual(list(checklist.get_optimal_blocks(low, high)),
+                         list(reference.get_optimal_blocks(low, high)),
+                         "Expected the cache to be invalidated when a block is added")
+        self.assertEqual(list(checklist.get_sorted_blocks()), list(reference.get_sorted_blocks()))
+
+        # Modifying a returned array leaves the cached result intact
+        for query in (checklist.get_sorted_blocks, lambda: checklist.get_optimal_blocks(low, high)):
+            first = query()
+            expected = list(first)
+            if len(first) > 0:
+                first[0] = None
+            self.assertIsNot(query(), first)
+            self.assertEqual(list(query()), expected)
+
 
     def test_get_sorted_blocks(self):
         """